@@ -1,3 +1,14 @@
 from django.contrib import admin
+from .models import Account
 
-# Register your models here.
+
+@admin.register(Account)
+class AccountAdmin(admin.ModelAdmin):
+    list_display = ('numero_cuenta', 'cliente', 'tipo', 'moneda', 'saldo', 'estado', 'fecha_apertura')
+    list_filter = ('tipo', 'moneda', 'estado')
+    search_fields = ('numero_cuenta', 'cliente__nombres', 'cliente__apellidos')
+    ordering = ('numero_cuenta',)
+    readonly_fields = ('saldo', 'version')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('cliente')
@@ -0,0 +1,78 @@
+from django.db.models import Count, Q, Sum
+
+from core.dashboard import format_money, widget
+from transactions.models import Transaction
+from .models import Account
+
+
+@widget(
+    'cartera_cuentas',
+    'Cartera de cuentas',
+    roles=('administrador', 'ejecutivo_cuentas'),
+    ttl=300,
+    per_user=True,
+    depends_on=('accounts.Account', 'clients.Client'),
+    icon='bi-briefcase',
+)
+def account_portfolio(user):
+    resumen = (
+        Account.scoped.for_user(user)
+        .values('moneda')
+        .annotate(
+            cuentas=Count('id'),
+            activas=Count('id', filter=Q(estado=Account.AccountStatus.ACTIVA)),
+            saldo=Sum('saldo'),
+        )
+        .order_by('moneda')
+    )
+    rows = [[row['moneda'], row['cuentas'], row['activas'], format_money(row['saldo'], row['moneda'])]
+            for row in resumen]
+    return {
+        'stats': [{'label': 'Cuentas', 'value': sum(row[1] for row in rows)}],
+        'table': {'headers': ['Moneda', 'Cuentas', 'Activas', 'Saldo total'], 'rows': rows},
+    }
+
+
+@widget(
+    'mis_cuentas',
+    'Mis cuentas',
+    roles=('cliente',),
+    ttl=30,
+    per_user=True,
+    depends_on=('accounts.Account', 'transactions.Transaction'),
+    icon='bi-wallet2',
+)
+def client_balances(user):
+    if not user.cliente_id:
+        return {'stats': [], 'table': {'headers': [], 'rows': []}}
+
+    cuentas = list(
+        Account.scoped.for_user(user)
+        .order_by('numero_cuenta')
+        .values('pk', 'numero_cuenta', 'tipo', 'moneda', 'saldo')
+    )
+    tipos = dict(Account.AccountType.choices)
+    ids = [cuenta['pk'] for cuenta in cuentas]
+    # Filtra por las cuentas ya resueltas: evita repetir los joins del alcance
+    ultimos = (
+        Transaction.objects
+        .filter(Q(cuenta_origen_id__in=ids) | Q(cuenta_destino_id__in=ids))
+        .order_by('-fecha')
+        .values('fecha', 'tipo', 'monto', 'moneda')[:5]
+    )
+    return {
+        'stats': [
+            {'label': f"{tipos[cuenta['tipo']]} {cuenta['numero_cuenta']}",
+             'value': format_money(cuenta['saldo'], cuenta['moneda'])}
+            for cuenta in cuentas
+        ],
+        'table': {
+            'headers': ['Fecha', 'Tipo', 'Monto'],
+            'rows': [
+                [movimiento['fecha'].strftime('%d/%m/%Y %H:%M'),
+                 Transaction.TransactionType(movimiento['tipo']).label,
+                 format_money(movimiento['monto'], movimiento['moneda'])]
+                for movimiento in ultimos
+            ],
+        },
+    }
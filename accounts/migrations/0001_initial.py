@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:22
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Account',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('numero_cuenta', models.CharField(max_length=20, unique=True, verbose_name='Número de Cuenta')),
+                ('tipo', models.CharField(choices=[('caja_ahorro', 'Caja de Ahorro'), ('cuenta_corriente', 'Cuenta Corriente')], default='caja_ahorro', max_length=20, verbose_name='Tipo de Cuenta')),
+                ('moneda', models.CharField(choices=[('PYG', 'PYG'), ('USD', 'USD')], default='PYG', max_length=3, verbose_name='Moneda')),
+                ('saldo', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='Saldo')),
+                ('estado', models.CharField(choices=[('activa', 'Activa'), ('bloqueada', 'Bloqueada'), ('cerrada', 'Cerrada')], default='activa', max_length=20, verbose_name='Estado')),
+                ('fecha_apertura', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Apertura')),
+                ('version', models.PositiveIntegerField(default=0, editable=False, verbose_name='Versión')),
+                ('cliente', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cuentas', to='clients.client', verbose_name='Cliente')),
+            ],
+            options={
+                'verbose_name': 'Cuenta',
+                'verbose_name_plural': 'Cuentas',
+                'db_table': 'cuentas',
+            },
+        ),
+    ]
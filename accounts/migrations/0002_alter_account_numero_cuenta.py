@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='numero_cuenta',
+            field=models.CharField(blank=True, help_text='Se asigna automáticamente si se deja vacío', max_length=20, unique=True, verbose_name='Número de Cuenta'),
+        ),
+    ]
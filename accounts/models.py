@@ -1,3 +1,96 @@
+import uuid
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from core import numbering
+from users.models import Role
+from users.scoping import ALL, AssignedTo, OwnedBy, ScopedManager
+
+
+class Account(models.Model):
+    """
+    Modelo de Cuentas bancarias
+    """
+
+    class AccountType(models.TextChoices):
+        CAJA_AHORRO = 'caja_ahorro', 'Caja de Ahorro'
+        CUENTA_CORRIENTE = 'cuenta_corriente', 'Cuenta Corriente'
+
+    class AccountStatus(models.TextChoices):
+        ACTIVA = 'activa', 'Activa'
+        BLOQUEADA = 'bloqueada', 'Bloqueada'
+        CERRADA = 'cerrada', 'Cerrada'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    numero_cuenta = models.CharField(
+        max_length=20,
+        unique=True,
+        blank=True,
+        verbose_name='Número de Cuenta',
+        help_text='Se asigna automáticamente si se deja vacío'
+    )
+    cliente = models.ForeignKey(
+        'clients.Client',
+        on_delete=models.PROTECT,
+        related_name='cuentas',
+        verbose_name='Cliente'
+    )
+    tipo = models.CharField(
+        max_length=20,
+        choices=AccountType.choices,
+        default=AccountType.CAJA_AHORRO,
+        verbose_name='Tipo de Cuenta'
+    )
+    moneda = models.CharField(
+        max_length=3,
+        choices=[(moneda, moneda) for moneda in settings.SUPPORTED_CURRENCIES],
+        default=settings.DEFAULT_CURRENCY,
+        verbose_name='Moneda'
+    )
+    saldo = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        verbose_name='Saldo'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=AccountStatus.choices,
+        default=AccountStatus.ACTIVA,
+        verbose_name='Estado'
+    )
+    fecha_apertura = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Fecha de Apertura'
+    )
+
+    # Control de concurrencia optimista: se incrementa en cada cambio de saldo
+    version = models.PositiveIntegerField(default=0, editable=False, verbose_name='Versión')
+
+    objects = models.Manager()
+    scoped = ScopedManager({
+        Role.RoleType.ADMINISTRADOR: ALL,
+        Role.RoleType.CAJERO: ALL,
+        Role.RoleType.AUDITOR: ALL,
+        Role.RoleType.EJECUTIVO_CUENTAS: AssignedTo('cliente__ejecutivo'),
+        Role.RoleType.CLIENTE: OwnedBy('cliente'),
+    })
+
+    class Meta:
+        verbose_name = 'Cuenta'
+        verbose_name_plural = 'Cuentas'
+        db_table = 'cuentas'
+
+    def __str__(self):
+        return f"{self.numero_cuenta} ({self.moneda})"
+
+    def is_activa(self):
+        """Verifica si la cuenta puede operar"""
+        return self.estado == self.AccountStatus.ACTIVA
+
+    def save(self, *args, **kwargs):
+        # Número con dígitos verificadores tomado del bloque reservado por el proceso
+        if not self.numero_cuenta:
+            self.numero_cuenta = numbering.next_account_number()
+        super().save(*args, **kwargs)
@@ -1,3 +1,77 @@
 from django.contrib import admin
+from django.utils.html import format_html
+from .models import ATM, ReconciliationBreak, ReconciliationRun
 
-# Register your models here.
+
+@admin.register(ATM)
+class ATMAdmin(admin.ModelAdmin):
+    list_display = ('codigo', 'tipo', 'ubicacion', 'departamento', 'estado', 'fecha_instalacion')
+    list_filter = ('tipo', 'estado', 'departamento')
+    search_fields = ('codigo', 'ubicacion')
+    ordering = ('codigo',)
+
+
+@admin.register(ReconciliationRun)
+class ReconciliationRunAdmin(admin.ModelAdmin):
+    list_display = (
+        'fecha', 'estado_badge', 'lineas_diario', 'movimientos_libro', 'conciliados',
+        'conciliados_tolerancia', 'quiebres', 'fecha_inicio', 'fecha_fin'
+    )
+    list_filter = ('estado',)
+    ordering = ('-fecha_inicio',)
+    readonly_fields = (
+        'fecha', 'estado', 'archivos', 'lineas_diario', 'movimientos_libro', 'conciliados',
+        'conciliados_tolerancia', 'quiebres', 'ultimo_error', 'fecha_inicio', 'fecha_fin'
+    )
+
+    def estado_badge(self, obj):
+        color_map = {
+            'en_curso': '#0d6efd',
+            'completada': '#198754',
+            'fallida': '#dc3545'
+        }
+        color = color_map.get(obj.estado, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; '
+            'border-radius: 3px; font-size: 11px;">{}</span>',
+            color,
+            obj.get_estado_display()
+        )
+
+    estado_badge.short_description = 'Estado'
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ReconciliationBreak)
+class ReconciliationBreakAdmin(admin.ModelAdmin):
+    list_display = (
+        'corrida', 'tipo_badge', 'terminal', 'fecha', 'referencia', 'monto_diario', 'monto_libro'
+    )
+    list_filter = ('tipo', 'corrida__fecha')
+    search_fields = ('terminal', 'referencia')
+    readonly_fields = (
+        'corrida', 'tipo', 'terminal', 'fecha', 'referencia', 'monto_diario', 'monto_libro',
+        'transaccion_id', 'linea_diario'
+    )
+    list_select_related = ('corrida',)
+
+    def tipo_badge(self, obj):
+        color_map = {
+            'solo_diario': '#fd7e14',
+            'solo_libro': '#6f42c1',
+            'diferencia_monto': '#dc3545'
+        }
+        color = color_map.get(obj.tipo, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; '
+            'border-radius: 3px; font-size: 11px;">{}</span>',
+            color,
+            obj.get_tipo_display()
+        )
+
+    tipo_badge.short_description = 'Tipo'
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,150 @@
+import csv
+import random
+import resource
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from atms.models import ReconciliationBreak
+from atms.reconciliation import JOURNAL_FIELDS, Line, Stats, journal_lines, reconcile
+from core.synthetic import atm_code
+
+BreakType = ReconciliationBreak.BreakType
+
+
+class Command(BaseCommand):
+    help = (
+        'Concilia un diario sintético de varios millones de líneas contra un libro '
+        'generado en memoria con quiebres conocidos, e informa líneas por segundo, '
+        'memoria máxima y si los quiebres encontrados coinciden con los inyectados'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, default=2_000_000, help='Líneas de diario (el libro tiene otras tantas)')
+        parser.add_argument('--terminals', type=int, default=400)
+        parser.add_argument('--break-rate', type=float, default=0.001,
+                            help='Probabilidad de cada tipo de quiebre por línea')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--files', type=int, default=4, help='Archivos de diario (se combinan ordenados)')
+
+    def handle(self, *args, **options):
+        if options['lines'] < 1 or options['terminals'] < 1 or options['files'] < 1:
+            raise CommandError('--lines, --terminals y --files deben ser mayores a cero')
+        tolerance = timedelta(seconds=settings.RECON_TIME_TOLERANCE)
+        day = datetime(2025, 6, 2, 4, 0, tzinfo=dt_timezone.utc)
+        per_terminal = max(1, options['lines'] // options['terminals'])
+        gap = 86400 / per_terminal
+
+        expected = {tipo: 0 for tipo in BreakType.values}
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            paths = self._write_journals(
+                Path(directory), options, day, per_terminal, gap, tolerance, expected
+            )
+            written = time.perf_counter() - start
+            size = sum(path.stat().st_size for path in paths)
+            self.stdout.write(
+                f"  Diario: {options['terminals'] * per_terminal:,} líneas en {len(paths)} archivos "
+                f"({size / 1024 / 1024:,.0f} MiB) generado en {written:.1f} s"
+            )
+
+            stats = Stats()
+            start = time.perf_counter()
+            ledger = _ledger(options, day, per_terminal, gap, tolerance)
+            found = {tipo: 0 for tipo in BreakType.values}
+            for item in reconcile(journal_lines(paths), ledger, stats=stats):
+                found[item.tipo] += 1
+            elapsed = time.perf_counter() - start
+
+        lines = stats.journal + stats.ledger
+        self.stdout.write(
+            f"  {lines:,} líneas conciliadas en {elapsed:.1f} s ({lines / elapsed:,.0f} líneas/s); "
+            f"ventana máxima {stats.max_window:,} líneas; memoria máxima del proceso "
+            f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.0f} MiB"
+        )
+        self.stdout.write(f"  {'':<18}{'inyectados':>12}{'encontrados':>13}")
+        for tipo in BreakType.values:
+            self.stdout.write(f"  {tipo:<18}{expected[tipo]:>12,}{found[tipo]:>13,}")
+        if found != expected:
+            raise CommandError('Los quiebres encontrados no coinciden con los inyectados')
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {stats.matched:,} pares conciliados y todos los quiebres inyectados detectados"
+        ))
+
+    def _write_journals(self, directory, options, day, per_terminal, gap, tolerance, expected):
+        """Diarios por grupos de terminales; registra los quiebres que inyecta el libro"""
+        files = min(options['files'], options['terminals'])
+        paths = [directory / f"diario-{n}.csv" for n in range(files)]
+        handles = [open(path, 'w', newline='', encoding='utf-8') for path in paths]
+        writers = [csv.writer(handle) for handle in handles]
+        for writer in writers:
+            writer.writerow(JOURNAL_FIELDS)
+        try:
+            for terminal, index, fecha, referencia, tipo, monto, fate in _events(options, day, per_terminal, gap):
+                if fate == 'sin_diario':
+                    expected[BreakType.SOLO_LIBRO] += 1
+                    continue
+                if fate == 'sin_libro':
+                    expected[BreakType.SOLO_DIARIO] += 1
+                elif fate == 'monto':
+                    expected[BreakType.DIFERENCIA_MONTO] += 1
+                elif fate == 'fuera_de_ventana':
+                    expected[BreakType.SOLO_DIARIO] += 1
+                    expected[BreakType.SOLO_LIBRO] += 1
+                writers[index % files].writerow([terminal, fecha.isoformat(), referencia, tipo, monto])
+        finally:
+            for handle in handles:
+                handle.close()
+        return paths
+
+
+def _events(options, day, per_terminal, gap):
+    """
+    Eventos de efectivo en orden de terminal y fecha con su destino: conciliable,
+    solo en un lado, con diferencia de monto o registrado fuera de la ventana
+    """
+    rng = random.Random(options['seed'])
+    rate = options['break_rate']
+    fates = ['sin_diario', 'sin_libro', 'monto', 'fuera_de_ventana']
+    for index in range(options['terminals']):
+        terminal = atm_code(index)
+        for k in range(per_terminal):
+            fecha = day + timedelta(seconds=k * gap)
+            roll = rng.random()
+            fate = fates[int(roll / rate)] if roll < rate * len(fates) else None
+            monto = Decimal(rng.randrange(10, 300) * 10000)
+            tipo = 'retiro' if rng.random() < 0.8 else 'deposito'
+            yield terminal, index, fecha, f"{terminal}-{k:07d}", tipo, monto, fate
+
+
+def _ledger(options, day, per_terminal, gap, tolerance):
+    """
+    El mismo flujo de eventos visto desde el libro: con un pequeño desfase de
+    hora dentro de la tolerancia, reordenado por terminal
+    """
+    rng = random.Random(options['seed'] + 1)
+    current, buffer = None, []
+    for terminal, _, fecha, referencia, tipo, monto, fate in _events(options, day, per_terminal, gap):
+        if terminal != current:
+            yield from sorted(buffer, key=lambda line: line.sort_key)
+            current, buffer = terminal, []
+        if fate == 'sin_libro':
+            continue
+        if fate == 'monto':
+            monto += 1000
+        if fate == 'fuera_de_ventana':
+            fecha += tolerance * 3
+        else:
+            fecha += timedelta(seconds=rng.uniform(0, tolerance.total_seconds() / 2))
+        buffer.append(Line(
+            terminal=terminal,
+            fecha=fecha,
+            referencia=referencia,
+            monto=-monto if tipo == 'retiro' else monto,
+        ))
+    yield from sorted(buffer, key=lambda line: line.sort_key)
@@ -0,0 +1,61 @@
+import csv
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from atms.reconciliation import ReconciliationError, run_reconciliation
+
+
+class Command(BaseCommand):
+    help = (
+        'Concilia los diarios de las terminales de efectivo de un día contra los '
+        'depósitos y retiros del libro y guarda los quiebres'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('journals', nargs='+', help='Diarios CSV (o .csv.gz) ordenados por terminal, fecha y referencia')
+        parser.add_argument('--date', type=date.fromisoformat, help='Día AAAA-MM-DD (por defecto, ayer)')
+        parser.add_argument('--report', help='Escribir también los quiebres en este CSV a medida que aparecen')
+
+    def handle(self, *args, **options):
+        fecha = options['date'] or timezone.localdate() - timedelta(days=1)
+        report = open(options['report'], 'w', newline='', encoding='utf-8') if options['report'] else None
+        writer = None
+        if report:
+            writer = csv.writer(report)
+            writer.writerow(['tipo', 'terminal', 'fecha', 'referencia', 'monto_diario', 'monto_libro',
+                             'transaccion', 'linea_diario'])
+
+        def on_break(item):
+            if writer:
+                line = item.line
+                writer.writerow([
+                    item.tipo, line.terminal, line.fecha.isoformat(), line.referencia,
+                    abs(item.diario.monto) if item.diario else '',
+                    abs(item.libro.monto) if item.libro else '',
+                    item.libro.transaccion_id if item.libro else '',
+                    item.diario.linea if item.diario else '',
+                ])
+
+        def on_progress(run):
+            self.stdout.write(
+                f"  {run.lineas_diario:,} líneas de diario, {run.movimientos_libro:,} movimientos, "
+                f"{run.quiebres:,} quiebres"
+            )
+
+        try:
+            run, stats = run_reconciliation(fecha, options['journals'], on_progress=on_progress, on_break=on_break)
+        except (ReconciliationError, OSError) as exc:
+            raise CommandError(str(exc))
+        finally:
+            if report:
+                report.close()
+
+        for tipo, count in sorted(stats.breaks.items()):
+            self.stdout.write(f"  {tipo:<18} {count:>8,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {fecha:%d/%m/%Y}: {run.conciliados:,} conciliados, "
+            f"{run.conciliados_tolerancia:,} con tolerancia, {run.quiebres:,} quiebres "
+            f"(ventana máxima {stats.max_window:,} líneas)"
+        ))
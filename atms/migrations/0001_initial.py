@@ -0,0 +1,79 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:04
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ATM',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('codigo', models.CharField(help_text='Identificador que la terminal escribe en su diario electrónico', max_length=20, unique=True, verbose_name='Código de Terminal')),
+                ('tipo', models.CharField(choices=[('cajero', 'Cajero Automático'), ('caja_sucursal', 'Caja de Sucursal')], default='cajero', max_length=20, verbose_name='Tipo de Terminal')),
+                ('ubicacion', models.CharField(max_length=150, verbose_name='Ubicación')),
+                ('departamento', models.CharField(choices=[('Concepción', 'Concepción'), ('San Pedro', 'San Pedro'), ('Cordillera', 'Cordillera'), ('Guairá', 'Guairá'), ('Caaguazú', 'Caaguazú'), ('Caazapá', 'Caazapá'), ('Itapúa', 'Itapúa'), ('Misiones', 'Misiones'), ('Paraguarí', 'Paraguarí'), ('Alto Paraná', 'Alto Paraná'), ('Central', 'Central'), ('Ñeembucú', 'Ñeembucú'), ('Amambay', 'Amambay'), ('Canindeyú', 'Canindeyú'), ('Presidente Hayes', 'Presidente Hayes'), ('Alto Paraguay', 'Alto Paraguay'), ('Boquerón', 'Boquerón'), ('Capital', 'Capital')], max_length=30, verbose_name='Departamento')),
+                ('estado', models.CharField(choices=[('operativo', 'Operativo'), ('fuera_de_servicio', 'Fuera de Servicio'), ('dado_de_baja', 'Dado de Baja')], default='operativo', max_length=20, verbose_name='Estado')),
+                ('fecha_instalacion', models.DateField(default=django.utils.timezone.localdate, verbose_name='Fecha de Instalación')),
+            ],
+            options={
+                'verbose_name': 'Terminal de Efectivo',
+                'verbose_name_plural': 'Terminales de Efectivo',
+                'db_table': 'cajeros',
+                'ordering': ['codigo'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReconciliationRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('fecha', models.DateField(verbose_name='Día Conciliado')),
+                ('estado', models.CharField(choices=[('en_curso', 'En Curso'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='en_curso', max_length=20, verbose_name='Estado')),
+                ('archivos', models.JSONField(default=list, verbose_name='Diarios Procesados')),
+                ('lineas_diario', models.PositiveIntegerField(default=0, verbose_name='Líneas de Diario')),
+                ('movimientos_libro', models.PositiveIntegerField(default=0, verbose_name='Movimientos del Libro')),
+                ('conciliados', models.PositiveIntegerField(default=0, verbose_name='Conciliados')),
+                ('conciliados_tolerancia', models.PositiveIntegerField(default=0, verbose_name='Conciliados con Tolerancia')),
+                ('quiebres', models.PositiveIntegerField(default=0, verbose_name='Quiebres')),
+                ('ultimo_error', models.TextField(blank=True, verbose_name='Último Error')),
+                ('fecha_inicio', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Inicio')),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+            ],
+            options={
+                'verbose_name': 'Corrida de Conciliación',
+                'verbose_name_plural': 'Corridas de Conciliación',
+                'db_table': 'corridas_conciliacion',
+                'ordering': ['-fecha_inicio'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReconciliationBreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('solo_diario', 'Solo en el Diario'), ('solo_libro', 'Solo en el Libro'), ('diferencia_monto', 'Diferencia de Monto')], db_index=True, max_length=20, verbose_name='Tipo de Quiebre')),
+                ('terminal', models.CharField(max_length=20, verbose_name='Terminal')),
+                ('fecha', models.DateTimeField(verbose_name='Fecha')),
+                ('referencia', models.CharField(blank=True, max_length=64, verbose_name='Referencia')),
+                ('monto_diario', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True, verbose_name='Monto en el Diario')),
+                ('monto_libro', models.DecimalField(blank=True, decimal_places=2, max_digits=18, null=True, verbose_name='Monto en el Libro')),
+                ('transaccion_id', models.UUIDField(blank=True, null=True, verbose_name='Transacción')),
+                ('linea_diario', models.PositiveIntegerField(blank=True, null=True, verbose_name='Línea del Diario')),
+                ('corrida', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='detalle_quiebres', to='atms.reconciliationrun', verbose_name='Corrida')),
+            ],
+            options={
+                'verbose_name': 'Quiebre de Conciliación',
+                'verbose_name_plural': 'Quiebres de Conciliación',
+                'db_table': 'quiebres_conciliacion',
+                'ordering': ['terminal', 'fecha'],
+            },
+        ),
+    ]
@@ -1,3 +1,141 @@
+import uuid
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class ATM(models.Model):
+    """
+    Modelo de Terminales de efectivo (cajeros automáticos y cajas de sucursal)
+    """
+
+    class TerminalType(models.TextChoices):
+        CAJERO = 'cajero', 'Cajero Automático'
+        CAJA_SUCURSAL = 'caja_sucursal', 'Caja de Sucursal'
+
+    class TerminalStatus(models.TextChoices):
+        OPERATIVO = 'operativo', 'Operativo'
+        FUERA_DE_SERVICIO = 'fuera_de_servicio', 'Fuera de Servicio'
+        DADO_DE_BAJA = 'dado_de_baja', 'Dado de Baja'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    codigo = models.CharField(
+        max_length=20,
+        unique=True,
+        verbose_name='Código de Terminal',
+        help_text='Identificador que la terminal escribe en su diario electrónico'
+    )
+    tipo = models.CharField(
+        max_length=20,
+        choices=TerminalType.choices,
+        default=TerminalType.CAJERO,
+        verbose_name='Tipo de Terminal'
+    )
+    ubicacion = models.CharField(max_length=150, verbose_name='Ubicación')
+    departamento = models.CharField(
+        max_length=30,
+        choices=[(departamento, departamento) for departamento in settings.PARAGUAY_DEPARTMENTS],
+        verbose_name='Departamento'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=TerminalStatus.choices,
+        default=TerminalStatus.OPERATIVO,
+        verbose_name='Estado'
+    )
+    fecha_instalacion = models.DateField(default=timezone.localdate, verbose_name='Fecha de Instalación')
+
+    class Meta:
+        verbose_name = 'Terminal de Efectivo'
+        verbose_name_plural = 'Terminales de Efectivo'
+        db_table = 'cajeros'
+        ordering = ['codigo']
+
+    def __str__(self):
+        return f"{self.codigo} - {self.ubicacion}"
+
+
+class ReconciliationRun(models.Model):
+    """
+    Modelo de Corridas de conciliación diaria entre los diarios de las
+    terminales y los movimientos del libro. Los contadores se actualizan a
+    medida que avanza la corrida.
+    """
+
+    class RunStatus(models.TextChoices):
+        EN_CURSO = 'en_curso', 'En Curso'
+        COMPLETADA = 'completada', 'Completada'
+        FALLIDA = 'fallida', 'Fallida'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    fecha = models.DateField(verbose_name='Día Conciliado')
+    estado = models.CharField(
+        max_length=20,
+        choices=RunStatus.choices,
+        default=RunStatus.EN_CURSO,
+        verbose_name='Estado'
+    )
+    archivos = models.JSONField(default=list, verbose_name='Diarios Procesados')
+    lineas_diario = models.PositiveIntegerField(default=0, verbose_name='Líneas de Diario')
+    movimientos_libro = models.PositiveIntegerField(default=0, verbose_name='Movimientos del Libro')
+    conciliados = models.PositiveIntegerField(default=0, verbose_name='Conciliados')
+    conciliados_tolerancia = models.PositiveIntegerField(default=0, verbose_name='Conciliados con Tolerancia')
+    quiebres = models.PositiveIntegerField(default=0, verbose_name='Quiebres')
+    ultimo_error = models.TextField(blank=True, verbose_name='Último Error')
+    fecha_inicio = models.DateTimeField(default=timezone.now, verbose_name='Inicio')
+    fecha_fin = models.DateTimeField(null=True, blank=True, verbose_name='Fin')
+
+    class Meta:
+        verbose_name = 'Corrida de Conciliación'
+        verbose_name_plural = 'Corridas de Conciliación'
+        db_table = 'corridas_conciliacion'
+        ordering = ['-fecha_inicio']
+
+    def __str__(self):
+        return f"Conciliación {self.fecha:%d/%m/%Y} ({self.get_estado_display()})"
+
+
+class ReconciliationBreak(models.Model):
+    """
+    Modelo de Quiebres de conciliación: una línea de diario sin movimiento,
+    un movimiento sin línea de diario o una diferencia de monto
+    """
+
+    class BreakType(models.TextChoices):
+        SOLO_DIARIO = 'solo_diario', 'Solo en el Diario'
+        SOLO_LIBRO = 'solo_libro', 'Solo en el Libro'
+        DIFERENCIA_MONTO = 'diferencia_monto', 'Diferencia de Monto'
+
+    corrida = models.ForeignKey(
+        ReconciliationRun,
+        on_delete=models.CASCADE,
+        related_name='detalle_quiebres',
+        verbose_name='Corrida'
+    )
+    tipo = models.CharField(
+        max_length=20,
+        choices=BreakType.choices,
+        db_index=True,
+        verbose_name='Tipo de Quiebre'
+    )
+    terminal = models.CharField(max_length=20, verbose_name='Terminal')
+    fecha = models.DateTimeField(verbose_name='Fecha')
+    referencia = models.CharField(max_length=64, blank=True, verbose_name='Referencia')
+    monto_diario = models.DecimalField(
+        max_digits=18, decimal_places=2, null=True, blank=True, verbose_name='Monto en el Diario'
+    )
+    monto_libro = models.DecimalField(
+        max_digits=18, decimal_places=2, null=True, blank=True, verbose_name='Monto en el Libro'
+    )
+    # Sin clave foránea: el movimiento puede archivarse después de la conciliación
+    transaccion_id = models.UUIDField(null=True, blank=True, verbose_name='Transacción')
+    linea_diario = models.PositiveIntegerField(null=True, blank=True, verbose_name='Línea del Diario')
+
+    class Meta:
+        verbose_name = 'Quiebre de Conciliación'
+        verbose_name_plural = 'Quiebres de Conciliación'
+        db_table = 'quiebres_conciliacion'
+        ordering = ['terminal', 'fecha']
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.terminal} {self.referencia}"
@@ -0,0 +1,306 @@
+"""
+Conciliación de diarios de terminales de efectivo contra el libro.
+
+- Los dos lados llegan como flujos ordenados por (terminal, fecha, referencia):
+  el diario desde archivos CSV (uno o varios, combinados con heapq.merge) y
+  el libro desde la base con un cursor sobre el índice de transacciones.
+- El motor es un merge-join por terminal y tiempo. Dentro de la ventana de
+  tolerancia mantiene un hash por referencia de las líneas aún sin pareja de
+  cada lado: la memoria queda acotada a las líneas de una terminal dentro de
+  RECON_TIME_TOLERANCE, no al tamaño del día.
+- Una línea que sale de la ventana sin pareja es un quiebre. Los quiebres se
+  emiten a medida que aparecen y la corrida los guarda por lotes.
+
+El formato del diario es CSV con encabezado `terminal,fecha,referencia,tipo,monto`
+(fecha ISO 8601 con zona horaria, tipo `retiro` o `deposito`), opcionalmente gzip.
+"""
+import csv
+import gzip
+import heapq
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
+
+from transactions.models import Transaction
+from .models import ReconciliationBreak, ReconciliationRun
+
+JOURNAL_FIELDS = ['terminal', 'fecha', 'referencia', 'tipo', 'monto']
+CASH_TYPES = (Transaction.TransactionType.RETIRO, Transaction.TransactionType.DEPOSITO)
+
+
+class ReconciliationError(Exception):
+    """Un flujo de entrada no respeta el orden o el formato esperado"""
+
+
+@dataclass(slots=True)
+class Line:
+    """
+    Línea de uno de los lados. `monto` lleva signo: negativo para retiros.
+    """
+    terminal: str
+    fecha: datetime
+    referencia: str
+    monto: Decimal
+    transaccion_id: object = None
+    linea: int = None
+    matched: bool = False
+
+    @property
+    def sort_key(self):
+        return self.terminal, self.fecha, self.referencia
+
+    @property
+    def match_key(self):
+        # Sin referencia solo puede emparejarse por monto exacto
+        return self.referencia or f'monto:{self.monto}'
+
+
+@dataclass(slots=True)
+class Break:
+    """
+    Quiebre: línea del diario sin movimiento, movimiento sin línea o diferencia de monto
+    """
+    tipo: str
+    diario: Line = None
+    libro: Line = None
+
+    @property
+    def line(self):
+        return self.diario or self.libro
+
+
+@dataclass
+class Stats:
+    """
+    Contadores de una conciliación
+    """
+    journal: int = 0
+    ledger: int = 0
+    matched: int = 0
+    tolerated: int = 0
+    breaks: dict = field(default_factory=dict)
+    max_window: int = 0
+
+    @property
+    def total_breaks(self):
+        return sum(self.breaks.values())
+
+
+def reconcile(journal, ledger, time_tolerance=None, amount_tolerance=None, stats=None):
+    """
+    Concilia dos iterables de Line ordenados por (terminal, fecha, referencia)
+    y genera los quiebres en orden de terminal. Dos líneas se emparejan si
+    tienen la misma referencia y sus fechas difieren a lo sumo `time_tolerance`;
+    si los montos difieren en más de `amount_tolerance` el par es un quiebre.
+    """
+    if time_tolerance is None:
+        time_tolerance = timedelta(seconds=settings.RECON_TIME_TOLERANCE)
+    if amount_tolerance is None:
+        amount_tolerance = Decimal(settings.RECON_AMOUNT_TOLERANCE)
+    stats = stats if stats is not None else Stats()
+
+    sources = (_ordered(journal, 'diario'), _ordered(ledger, 'libro'))
+    heads = [next(sources[0], None), next(sources[1], None)]
+    # Por lado: líneas sin pareja por clave y en orden de llegada (para vencerlas)
+    pending = ({}, {})
+    windows = (deque(), deque())
+    terminal = None
+
+    while heads[0] is not None or heads[1] is not None:
+        if heads[1] is None or (heads[0] is not None and heads[0].sort_key <= heads[1].sort_key):
+            side = 0
+        else:
+            side = 1
+        line = heads[side]
+        heads[side] = next(sources[side], None)
+        if side == 0:
+            stats.journal += 1
+        else:
+            stats.ledger += 1
+
+        if line.terminal != terminal:
+            yield from _expire(pending, windows, None, stats)
+            terminal = line.terminal
+        else:
+            yield from _expire(pending, windows, line.fecha - time_tolerance, stats)
+
+        # Todo lo que quedó del otro lado está dentro de la ventana: la primera con la misma clave es la pareja
+        candidates = pending[1 - side].get(line.match_key)
+        if candidates:
+            other = candidates.popleft()
+            if not candidates:
+                del pending[1 - side][line.match_key]
+            other.matched = True
+            diario, libro = (line, other) if side == 0 else (other, line)
+            difference = abs(diario.monto - libro.monto)
+            if not difference:
+                stats.matched += 1
+            elif difference <= amount_tolerance:
+                stats.tolerated += 1
+            else:
+                yield _break(ReconciliationBreak.BreakType.DIFERENCIA_MONTO, stats, diario, libro)
+            continue
+
+        pending[side].setdefault(line.match_key, deque()).append(line)
+        windows[side].append(line)
+        stats.max_window = max(stats.max_window, len(windows[0]) + len(windows[1]))
+
+    yield from _expire(pending, windows, None, stats)
+
+
+def _expire(pending, windows, cutoff, stats):
+    """Quiebres de las líneas sin pareja anteriores a `cutoff` (todas si es None)"""
+    for side, tipo in ((0, ReconciliationBreak.BreakType.SOLO_DIARIO),
+                       (1, ReconciliationBreak.BreakType.SOLO_LIBRO)):
+        window = windows[side]
+        while window and (cutoff is None or window[0].fecha < cutoff):
+            line = window.popleft()
+            if line.matched:
+                continue
+            candidates = pending[side][line.match_key]
+            candidates.popleft()
+            if not candidates:
+                del pending[side][line.match_key]
+            yield _break(tipo, stats, **({'diario': line} if side == 0 else {'libro': line}))
+
+
+def _break(tipo, stats, diario=None, libro=None):
+    stats.breaks[tipo] = stats.breaks.get(tipo, 0) + 1
+    return Break(tipo, diario=diario, libro=libro)
+
+
+def _ordered(lines, name):
+    previous = None
+    for line in lines:
+        key = line.sort_key
+        if previous is not None and key < previous:
+            raise ReconciliationError(
+                f"El {name} no está ordenado por terminal, fecha y referencia: {key} después de {previous}"
+            )
+        previous = key
+        yield line
+
+
+def read_journal(path):
+    """Líneas de un diario CSV (gzip si termina en .gz)"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header != JOURNAL_FIELDS:
+            raise ReconciliationError(f"{path}: se esperaba el encabezado {','.join(JOURNAL_FIELDS)}")
+        for number, row in enumerate(reader, start=2):
+            try:
+                if len(row) != len(JOURNAL_FIELDS):
+                    raise ValueError(f"se esperaban {len(JOURNAL_FIELDS)} columnas y hay {len(row)}")
+                terminal, fecha, referencia, tipo, monto = row
+                if tipo not in CASH_TYPES:
+                    raise ValueError(f"tipo desconocido '{tipo}'")
+                moment = datetime.fromisoformat(fecha)
+                if timezone.is_naive(moment):
+                    raise ValueError(f"la fecha {fecha} no tiene zona horaria")
+                amount = Decimal(monto)
+                yield Line(
+                    terminal=terminal,
+                    fecha=moment,
+                    referencia=referencia,
+                    monto=-amount if tipo == Transaction.TransactionType.RETIRO else amount,
+                    linea=number,
+                )
+            except (ValueError, ArithmeticError) as exc:
+                raise ReconciliationError(f"{path}, línea {number}: {exc}")
+
+
+def journal_lines(paths):
+    """Los diarios de varias terminales o archivos combinados en un solo flujo ordenado"""
+    return heapq.merge(*(read_journal(path) for path in paths), key=lambda line: line.sort_key)
+
+
+def ledger_lines(start, end):
+    """Depósitos y retiros vigentes con terminal entre `start` y `end`, en orden de conciliación"""
+    rows = (
+        Transaction.objects
+        .filter(fecha__gte=start, fecha__lt=end, tipo__in=CASH_TYPES)
+        .exclude(terminal='')
+        .exclude(estado=Transaction.TransactionStatus.REVERTIDA)
+        .order_by('terminal', 'fecha', 'referencia')
+        .values_list('pk', 'terminal', 'fecha', 'referencia', 'tipo', 'monto')
+    )
+    for pk, terminal, fecha, referencia, tipo, monto in rows.iterator(chunk_size=settings.RECON_CHUNK_SIZE):
+        yield Line(
+            terminal=terminal,
+            fecha=fecha,
+            referencia=referencia,
+            monto=-monto if tipo == Transaction.TransactionType.RETIRO else monto,
+            transaccion_id=pk,
+        )
+
+
+def run_reconciliation(fecha, paths, on_progress=None, on_break=None):
+    """
+    Concilia el día `fecha` con los diarios de `paths` y guarda la corrida.
+    Los quiebres se guardan cada RECON_BREAK_BATCH junto con los contadores,
+    así la corrida muestra su avance mientras se ejecuta. `on_break(break_)`
+    recibe cada quiebre al emitirse y `on_progress(run)` se llama tras cada lote.
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(fecha, datetime.min.time()), tz)
+    end = start + timedelta(days=1)
+    tolerance = timedelta(seconds=settings.RECON_TIME_TOLERANCE)
+
+    run = ReconciliationRun.objects.create(fecha=fecha, archivos=[str(path) for path in paths])
+    stats = Stats()
+    pending = []
+
+    def flush():
+        ReconciliationBreak.objects.bulk_create(pending)
+        pending.clear()
+        run.lineas_diario = stats.journal
+        run.movimientos_libro = stats.ledger
+        run.conciliados = stats.matched
+        run.conciliados_tolerancia = stats.tolerated
+        run.quiebres = stats.total_breaks
+        run.save(update_fields=['lineas_diario', 'movimientos_libro', 'conciliados',
+                                'conciliados_tolerancia', 'quiebres'])
+        if on_progress:
+            on_progress(run)
+
+    try:
+        # El libro se lee con margen: un movimiento a segundos de la medianoche puede corresponder al día vecino
+        for item in reconcile(journal_lines(paths), ledger_lines(start - tolerance, end + tolerance), stats=stats):
+            line = item.line
+            if item.tipo == ReconciliationBreak.BreakType.SOLO_LIBRO and not start <= line.fecha < end:
+                stats.breaks[item.tipo] -= 1
+                continue
+            if on_break:
+                on_break(item)
+            pending.append(ReconciliationBreak(
+                corrida=run,
+                tipo=item.tipo,
+                terminal=line.terminal,
+                fecha=line.fecha,
+                referencia=line.referencia,
+                monto_diario=abs(item.diario.monto) if item.diario else None,
+                monto_libro=abs(item.libro.monto) if item.libro else None,
+                transaccion_id=item.libro.transaccion_id if item.libro else None,
+                linea_diario=item.diario.linea if item.diario else None,
+            ))
+            if len(pending) >= settings.RECON_BREAK_BATCH:
+                flush()
+    except Exception as exc:
+        run.estado = ReconciliationRun.RunStatus.FALLIDA
+        run.ultimo_error = f'{type(exc).__name__}: {exc}'
+        flush()
+        run.fecha_fin = timezone.now()
+        run.save(update_fields=['estado', 'ultimo_error', 'fecha_fin'])
+        raise
+
+    flush()
+    run.estado = ReconciliationRun.RunStatus.COMPLETADA
+    run.fecha_fin = timezone.now()
+    run.save(update_fields=['estado', 'fecha_fin'])
+    return run, stats
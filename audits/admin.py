@@ -1,3 +1,20 @@
 from django.contrib import admin
+from .models import AuditEvent
 
-# Register your models here.
+
+@admin.register(AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'tipo', 'usuario', 'descripcion', 'ip')
+    list_filter = ('tipo',)
+    search_fields = ('usuario__username', 'descripcion')
+    date_hierarchy = 'fecha'
+    readonly_fields = ('fecha', 'tipo', 'usuario', 'descripcion', 'detalle', 'ip')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('usuario')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,59 @@
+from datetime import date, datetime, time as dt_time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from audits.models import AuditEvent
+from core import archive
+from users.models import SystemUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Lista la bitácora de auditoría de un rango de fechas, incluidos los '
+        'meses ya movidos al archivo frío'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Usuario (username); por defecto, todos')
+        parser.add_argument('--since', type=date.fromisoformat, help='Desde AAAA-MM-DD (por defecto, hace 30 días)')
+        parser.add_argument('--until', type=date.fromisoformat, help='Hasta AAAA-MM-DD inclusive (por defecto, hoy)')
+        parser.add_argument('--type', choices=AuditEvent.EventType.values, help='Solo eventos de este tipo')
+
+    def handle(self, *args, **options):
+        until = options['until'] or timezone.localdate()
+        since = options['since'] or until - timedelta(days=30)
+        if since > until:
+            raise CommandError('--since debe ser anterior a --until')
+
+        any_of = None
+        if options['user']:
+            user = SystemUser.objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"No existe el usuario {options['user']}")
+            any_of = {'usuario_id': [user.pk]}
+
+        tz = timezone.get_current_timezone()
+        start = timezone.make_aware(datetime.combine(since, dt_time.min), tz)
+        end = timezone.make_aware(datetime.combine(until + timedelta(days=1), dt_time.min), tz)
+        usernames = {}
+        tipos = dict(AuditEvent.EventType.choices)
+        total = 0
+        for row in archive.stream('audits.AuditEvent', start, end, any_of=any_of):
+            if options['type'] and row['tipo'] != options['type']:
+                continue
+            usuario_id = row['usuario_id']
+            if usuario_id is not None and usuario_id not in usernames:
+                usernames[usuario_id] = (
+                    SystemUser.objects.filter(pk=usuario_id).values_list('username', flat=True).first() or '?'
+                )
+            self.stdout.write(
+                f"{timezone.localtime(row['fecha']):%d/%m/%Y %H:%M:%S}  "
+                f"{tipos.get(row['tipo'], row['tipo']):<26} {usernames.get(usuario_id, '-'):<20} "
+                f"{row['ip'] or '':<15} {row['descripcion']}"
+            )
+            total += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {total:,} eventos entre {since:%d/%m/%Y} y {until:%d/%m/%Y}"
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:51
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('fecha', models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Fecha')),
+                ('tipo', models.CharField(choices=[('login_exitoso', 'Inicio de Sesión'), ('login_fallido', 'Inicio de Sesión Fallido'), ('bloqueo', 'Bloqueo de Usuario'), ('cambio_rol', 'Cambio de Rol'), ('transferencia', 'Transferencia')], max_length=30, verbose_name='Tipo de Evento')),
+                ('descripcion', models.CharField(blank=True, max_length=255, verbose_name='Descripción')),
+                ('detalle', models.JSONField(blank=True, default=dict, verbose_name='Detalle')),
+                ('ip', models.GenericIPAddressField(blank=True, null=True, verbose_name='Dirección IP')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='eventos_auditoria', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Evento de Auditoría',
+                'verbose_name_plural': 'Eventos de Auditoría',
+                'db_table': 'eventos_auditoria',
+                'ordering': ['-fecha'],
+                'indexes': [models.Index(fields=['usuario', 'fecha'], name='audit_usuario_fecha_idx')],
+            },
+        ),
+    ]
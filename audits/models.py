@@ -1,3 +1,58 @@
+import uuid
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class AuditEvent(models.Model):
+    """
+    Modelo de Eventos de auditoría (bitácora)
+    """
+
+    class EventType(models.TextChoices):
+        LOGIN_EXITOSO = 'login_exitoso', 'Inicio de Sesión'
+        LOGIN_FALLIDO = 'login_fallido', 'Inicio de Sesión Fallido'
+        BLOQUEO = 'bloqueo', 'Bloqueo de Usuario'
+        CAMBIO_ROL = 'cambio_rol', 'Cambio de Rol'
+        TRANSFERENCIA = 'transferencia', 'Transferencia'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    fecha = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='Fecha')
+    tipo = models.CharField(
+        max_length=30,
+        choices=EventType.choices,
+        verbose_name='Tipo de Evento'
+    )
+    usuario = models.ForeignKey(
+        'users.SystemUser',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='eventos_auditoria',
+        verbose_name='Usuario'
+    )
+    descripcion = models.CharField(max_length=255, blank=True, verbose_name='Descripción')
+    detalle = models.JSONField(default=dict, blank=True, verbose_name='Detalle')
+    ip = models.GenericIPAddressField(null=True, blank=True, verbose_name='Dirección IP')
+
+    class Meta:
+        verbose_name = 'Evento de Auditoría'
+        verbose_name_plural = 'Eventos de Auditoría'
+        db_table = 'eventos_auditoria'
+        ordering = ['-fecha']
+        indexes = [
+            models.Index(fields=['usuario', 'fecha'], name='audit_usuario_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha:%d/%m/%Y %H:%M} {self.get_tipo_display()}"
+
+    @classmethod
+    def record(cls, tipo, usuario=None, descripcion='', request=None, **detalle):
+        """Registra un evento en la bitácora"""
+        return cls.objects.create(
+            tipo=tipo,
+            usuario=usuario,
+            descripcion=descripcion,
+            detalle=detalle,
+            ip=request.META.get('REMOTE_ADDR') if request is not None else None,
+        )
@@ -20,7 +20,7 @@ ALLOWED_HOSTS = []
 
 # Application definition
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    "core.admin_config.LazyAdminConfig",  # django.contrib.admin; los admin.py se cargan con la URLconf
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -36,6 +36,8 @@ INSTALLED_APPS = [
     "atms",            # Cajeros automáticos
     "transactions",    # Transacciones
     "loans",           # Préstamos
+    "notifications",   # Notificaciones por correo (outbox)
+    "reports",         # Reportes y extractos mensuales
     "core",            # App principal
     "audits",          # Auditoría y bitácora
 
@@ -48,6 +50,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.PrecompressedStaticMiddleware',
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.SQLProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -109,6 +114,21 @@ USE_TZ = True
 # Static files
 STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# collectstatic agrega el hash de contenido al nombre y genera variantes .gz/.br
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "core.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Servir STATIC_ROOT desde Django con caché inmutable (en desarrollo lo hace runserver)
+STATIC_SERVE_PRECOMPRESSED = not DEBUG
+STATIC_IMMUTABLE_MAX_AGE = 31536000  # 1 año
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -143,6 +163,7 @@ MESSAGE_TAGS = {
 
 # Email configuration (para desarrollo)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'Banco Familiar <notificaciones@bancofamiliar.com.py>'
 
 # Security settings
 SESSION_COOKIE_AGE = 3600  # 1 hora
@@ -165,4 +186,93 @@ SUPPORTED_CURRENCIES = ['PYG', 'USD']
 
 # Límites por defecto
 DEFAULT_DAILY_TRANSFER_LIMIT = 10000000  # 10M PYG
-DEFAULT_DAILY_ATM_LIMIT = 2000000        # 2M PYG
\ No newline at end of file
+DEFAULT_DAILY_ATM_LIMIT = 2000000        # 2M PYG
+
+# Idempotencia de transferencias y pagos
+IDEMPOTENCY_KEY_TTL = 86400        # 24 horas
+IDEMPOTENCY_WAIT_TIMEOUT = 10      # segundos que un duplicado espera a la solicitud original
+IDEMPOTENCY_LOCK_TIMEOUT = 60      # segundos tras los cuales una clave en proceso se considera colgada
+
+# Ejecución de transferencias
+TRANSFER_MAX_RETRIES = 5           # reintentos ante conflictos de versión o bloqueos de SQLite
+TRANSFER_BATCH_SIZE = 100          # transferencias sobre cuentas disjuntas por transacción de base de datos
+
+# Procesos que atienden solicitudes (p. ej. los workers de gunicorn)
+APP_WORKERS = int(os.environ.get('WEB_CONCURRENCY', '1'))
+
+# Scoring de fraude en streaming
+FRAUD_INLINE_SCORING = True        # puntuar cada transferencia al registrarla (solo con APP_WORKERS = 1)
+FRAUD_VELOCITY_WINDOW = 600        # 10 minutos
+FRAUD_VELOCITY_MAX = 5             # transacciones dentro de la ventana de velocidad
+FRAUD_GEO_WINDOW = 3600            # 1 hora entre departamentos distintos
+FRAUD_MAX_DEVICES = 3              # dispositivos distintos en 24 horas
+FRAUD_AMOUNT_SPIKE_FACTOR = 5      # veces el monto habitual
+FRAUD_MEDIUM_RISK_SCORE = 40
+FRAUD_HIGH_RISK_SCORE = 70
+FRAUD_MAX_TRACKED_ENTITIES = 200000
+
+# Perfilado de SQL por solicitud (histogramas en /__profiling__/sql/)
+SQL_PROFILING_ENABLED = DEBUG
+SQL_PROFILING_DUPLICATE_THRESHOLD = 3  # repeticiones de una misma consulta para sospechar N+1
+SQL_PROFILING_DUMP_PATH = os.environ.get('SQL_PROFILING_DUMP_PATH')  # JSON escrito al terminar el proceso
+
+# Caché (locmem por proceso; en producción usar un backend compartido como Redis)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'banco',
+    }
+}
+
+# Dashboard por rol (stale-while-revalidate)
+DASHBOARD_STALE_TTL = 86400             # segundos que se conserva un widget vencido para servirlo mientras se recalcula
+DASHBOARD_REFRESH_LOCK_TIMEOUT = 60     # segundos que dura el bloqueo de un recálculo en segundo plano
+DASHBOARD_REFRESH_WORKERS = 2           # hilos de recálculo por proceso
+
+# Outbox de notificaciones (comandos dispatch_notifications y enqueue_loan_reminders)
+NOTIFICATION_BATCH_SIZE = 100          # notificaciones reclamadas y enviadas por lote
+NOTIFICATION_LEASE_SECONDS = 300       # tras este tiempo un lote sin confirmar vuelve a la cola
+NOTIFICATION_MAX_ATTEMPTS = 8
+NOTIFICATION_RETRY_BASE_DELAY = 30     # segundos; se duplica en cada intento
+NOTIFICATION_RETRY_MAX_DELAY = 3600    # 1 hora
+NOTIFICATION_POLL_INTERVAL = 5         # segundos de espera con el outbox vacío
+LOAN_REMINDER_DAYS = 3                 # días de anticipación del recordatorio de vencimiento
+
+# Extractos mensuales (comando generate_statements)
+STATEMENTS_ROOT = BASE_DIR / "extractos"   # documentos guardados por hash de contenido
+STATEMENT_GROUP_SIZE = 200                 # cuentas cargadas y renderizadas por unidad de trabajo
+
+# Archivo frío de transacciones y auditoría (comando archive_periods)
+ARCHIVE_ROOT = BASE_DIR / "archivo"     # particiones comprimidas por modelo y mes
+ARCHIVE_HOT_MONTHS = 12                 # meses cerrados que permanecen en la tabla principal
+ARCHIVE_FRAME_ROWS = 5000               # filas por marco comprimido (unidad mínima de lectura)
+ARCHIVE_DELETE_BATCH = 2000             # filas borradas de la tabla por sentencia
+
+# Numeración de cuentas y tarjetas (reserva por bloques, ver core/numbering.py)
+NUMBERING_BLOCK_SIZE = 1000             # números reservados por proceso en cada UPDATE
+ACCOUNT_NUMBER_PREFIX = '10'            # prefijo fijo de los números de cuenta
+ACCOUNT_NUMBER_DIGITS = 10              # dígitos de la secuencia; se agregan 2 verificadores MOD 97-10
+CARD_PAN_LENGTH = 16                    # BIN + secuencia + dígito Luhn
+CARD_BINS = {                           # BIN por tipo de tarjeta
+    'debito': '627180',
+    'credito': '527180',
+}
+
+# Conciliación de diarios de terminales de efectivo (comando reconcile_atms)
+RECON_TIME_TOLERANCE = 120              # segundos de diferencia admitidos entre el diario y el libro
+RECON_AMOUNT_TOLERANCE = '0.00'         # diferencia de monto que aún se considera conciliada
+RECON_CHUNK_SIZE = 5000                 # filas del libro leídas por viaje a la base
+RECON_BREAK_BATCH = 1000                # quiebres guardados por lote (y frecuencia de avance)
+
+# Métricas en formato Prometheus (/__metrics__/, solo administradores; ver core/metrics.py)
+METRICS_ENABLED = True
+METRICS_STORE = os.environ.get('METRICS_STORE', str(BASE_DIR / "metricas.sqlite3"))  # almacén compartido por los workers; vacío = solo el proceso
+METRICS_FLUSH_INTERVAL = 5              # segundos entre volcados de cada proceso al almacén
+PERMISSION_CACHE_TTL = 300              # segundos que se conservan los permisos de un rol en caché
+
+# Scoring de crédito por lotes (comando score_clients, ver loans/scoring.py)
+CREDIT_SCORECARD = 'loans.scoring.DEFAULT_SCORECARD'   # ruta de un objeto con version, features, score() y decide()
+CREDIT_SCORING_BATCH_SIZE = 2000        # clientes por lote de extracción de características
+
+# Arranque (comandos profile_startup y bench_startup, ver core/startup.py)
+STARTUP_BUDGET_MS = 500                 # mediana máxima de django.setup() en un intérprete nuevo
@@ -17,6 +17,9 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+# El admin no se autodescubre en django.setup() (ver core.admin_config.LazyAdminConfig)
+admin.autodiscover()
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'banco.settings')
 
 application = get_wsgi_application()
+
+# Precalienta el scoring de fraude en segundo plano antes de la primera transferencia
+from transactions.fraud import inline_scoring_enabled, start_warm_up  # noqa: E402
+
+if inline_scoring_enabled():
+    start_warm_up()
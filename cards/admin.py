@@ -1,3 +1,12 @@
 from django.contrib import admin
+from .models import Card
 
-# Register your models here.
+
+@admin.register(Card)
+class CardAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'cuenta', 'tipo', 'estado', 'fecha_vencimiento')
+    list_filter = ('tipo', 'estado')
+    search_fields = ('cuenta__numero_cuenta',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('cuenta')
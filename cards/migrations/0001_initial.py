@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:25
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Card',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('numero', models.CharField(max_length=19, unique=True, verbose_name='Número de Tarjeta')),
+                ('tipo', models.CharField(choices=[('debito', 'Débito'), ('credito', 'Crédito')], default='debito', max_length=20, verbose_name='Tipo de Tarjeta')),
+                ('estado', models.CharField(choices=[('activa', 'Activa'), ('bloqueada', 'Bloqueada'), ('vencida', 'Vencida')], default='activa', max_length=20, verbose_name='Estado')),
+                ('fecha_vencimiento', models.DateField(verbose_name='Fecha de Vencimiento')),
+                ('cuenta', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='tarjetas', to='accounts.account', verbose_name='Cuenta')),
+            ],
+            options={
+                'verbose_name': 'Tarjeta',
+                'verbose_name_plural': 'Tarjetas',
+                'db_table': 'tarjetas',
+            },
+        ),
+    ]
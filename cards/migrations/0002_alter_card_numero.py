@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='card',
+            name='numero',
+            field=models.CharField(blank=True, help_text='Se asigna automáticamente (PAN válido por Luhn) si se deja vacío', max_length=19, unique=True, verbose_name='Número de Tarjeta'),
+        ),
+    ]
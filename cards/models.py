@@ -1,3 +1,72 @@
+import uuid
 from django.db import models
 
-# Create your models here.
+from core import numbering
+from users.models import Role
+from users.scoping import ALL, AssignedTo, OwnedBy, ScopedManager
+
+
+class Card(models.Model):
+    """
+    Modelo de Tarjetas asociadas a cuentas
+    """
+
+    class CardType(models.TextChoices):
+        DEBITO = 'debito', 'Débito'
+        CREDITO = 'credito', 'Crédito'
+
+    class CardStatus(models.TextChoices):
+        ACTIVA = 'activa', 'Activa'
+        BLOQUEADA = 'bloqueada', 'Bloqueada'
+        VENCIDA = 'vencida', 'Vencida'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cuenta = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.PROTECT,
+        related_name='tarjetas',
+        verbose_name='Cuenta'
+    )
+    numero = models.CharField(
+        max_length=19,
+        unique=True,
+        blank=True,
+        verbose_name='Número de Tarjeta',
+        help_text='Se asigna automáticamente (PAN válido por Luhn) si se deja vacío'
+    )
+    tipo = models.CharField(
+        max_length=20,
+        choices=CardType.choices,
+        default=CardType.DEBITO,
+        verbose_name='Tipo de Tarjeta'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=CardStatus.choices,
+        default=CardStatus.ACTIVA,
+        verbose_name='Estado'
+    )
+    fecha_vencimiento = models.DateField(verbose_name='Fecha de Vencimiento')
+
+    objects = models.Manager()
+    scoped = ScopedManager({
+        Role.RoleType.ADMINISTRADOR: ALL,
+        Role.RoleType.CAJERO: ALL,
+        Role.RoleType.AUDITOR: ALL,
+        Role.RoleType.EJECUTIVO_CUENTAS: AssignedTo('cuenta__cliente__ejecutivo'),
+        Role.RoleType.CLIENTE: OwnedBy('cuenta__cliente'),
+    })
+
+    class Meta:
+        verbose_name = 'Tarjeta'
+        verbose_name_plural = 'Tarjetas'
+        db_table = 'tarjetas'
+
+    def __str__(self):
+        return f"**** {self.numero[-4:]} ({self.get_tipo_display()})"
+
+    def save(self, *args, **kwargs):
+        # PAN del BIN del tipo de tarjeta, tomado del bloque reservado por el proceso
+        if not self.numero:
+            self.numero = numbering.next_card_number(self.tipo)
+        super().save(*args, **kwargs)
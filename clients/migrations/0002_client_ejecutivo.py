@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='ejecutivo',
+            field=models.ForeignKey(blank=True, limit_choices_to={'role__nombre': 'ejecutivo_cuentas'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cartera', to=settings.AUTH_USER_MODEL, verbose_name='Ejecutivo de Cuentas'),
+        ),
+    ]
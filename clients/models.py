@@ -1,6 +1,9 @@
 import uuid
 from django.db import models
 
+from users.models import Role
+from users.scoping import ALL, AssignedTo, OwnedBy, ScopedManager
+
 
 class Client(models.Model):
     """
@@ -10,6 +13,24 @@ class Client(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     nombres = models.CharField(max_length=200, verbose_name='Nombres')
     apellidos = models.CharField(max_length=200, verbose_name='Apellidos')
+    ejecutivo = models.ForeignKey(
+        'users.SystemUser',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='cartera',
+        limit_choices_to={'role__nombre': Role.RoleType.EJECUTIVO_CUENTAS},
+        verbose_name='Ejecutivo de Cuentas'
+    )
+
+    objects = models.Manager()
+    scoped = ScopedManager({
+        Role.RoleType.ADMINISTRADOR: ALL,
+        Role.RoleType.CAJERO: ALL,
+        Role.RoleType.AUDITOR: ALL,
+        Role.RoleType.EJECUTIVO_CUENTAS: AssignedTo('ejecutivo'),
+        Role.RoleType.CLIENTE: OwnedBy('pk'),
+    })
 
     class Meta:
         verbose_name = 'Cliente'
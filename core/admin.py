@@ -1,3 +1,43 @@
 from django.contrib import admin
+from .models import ArchivePartition, DependencyVersion, NumberSequence
 
-# Register your models here.
+
+@admin.register(ArchivePartition)
+class ArchivePartitionAdmin(admin.ModelAdmin):
+    list_display = ('modelo', 'periodo', 'filas', 'tamano_bytes', 'codec', 'fecha_archivado', 'fecha_verificacion')
+    list_filter = ('modelo', 'codec')
+    ordering = ('modelo', '-periodo')
+    readonly_fields = (
+        'modelo', 'periodo', 'archivo', 'codec', 'filas', 'tamano_bytes', 'huella_archivo',
+        'huella_filas', 'columnas', 'marcos', 'fecha_archivado', 'fecha_verificacion'
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(NumberSequence)
+class NumberSequenceAdmin(admin.ModelAdmin):
+    list_display = ('nombre', 'siguiente', 'fecha_actualizacion')
+    readonly_fields = ('nombre', 'siguiente', 'fecha_actualizacion')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DependencyVersion)
+class DependencyVersionAdmin(admin.ModelAdmin):
+    list_display = ('modelo', 'version')
+    readonly_fields = ('modelo', 'version')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
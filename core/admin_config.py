@@ -0,0 +1,25 @@
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.core import checks
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    """
+    Admin sin autodiscover en el arranque: los admin.py (y lo que importan)
+    se cargan con la URLconf (banco/urls.py), así los comandos y workers que
+    no sirven el admin no pagan su importación
+    """
+
+    def ready(self):
+        from django.contrib.admin.checks import check_dependencies
+
+        checks.register(check_dependencies, checks.Tags.admin)
+        checks.register(check_admin_app, checks.Tags.admin)
+
+
+def check_admin_app(app_configs, **kwargs):
+    from django.contrib import admin
+    from django.contrib.admin.checks import check_admin_app as check_registered
+
+    # Las verificaciones del admin necesitan los ModelAdmin registrados
+    admin.autodiscover()
+    return check_registered(app_configs, **kwargs)
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from .dashboard import connect_dependency_signals
+
+        # Registra los widgets declarados en el dashboard.py de cada app
+        autodiscover_modules('dashboard')
+        connect_dependency_signals()
@@ -0,0 +1,384 @@
+"""
+Archivo frío de tablas históricas (transacciones y bitácora de auditoría).
+
+- Los meses cerrados con más de ARCHIVE_HOT_MONTHS de antigüedad se mueven de
+  la tabla a un archivo JSONL comprimido por modelo y período
+  (ARCHIVE_ROOT/<modelo>/<AAAA-MM>.jsonl.zst o .jsonl.gz). Cada línea es un
+  arreglo con los valores en el orden de `ArchivePartition.columnas`.
+- El archivo es una secuencia de marcos comprimidos por separado (hasta
+  ARCHIVE_FRAME_ROWS filas ordenadas por fecha). ArchivePartition es el índice
+  del período: posición, tamaño, filas y rango de fechas de cada marco, de modo
+  que una lectura descomprime solo los marcos que necesita. Los marcos
+  concatenados siguen siendo un .gz/.zst válido para las herramientas estándar.
+- Antes de borrar las filas de la tabla se relee el archivo y se comparan la
+  cantidad y el hash de los identificadores; `verify_partition()` repite el control.
+  El borrado es un DELETE por lotes sin señales; los puntajes de fraude de las
+  transacciones archivadas se conservan en su tabla.
+- `stream()` lee un rango de fechas combinando particiones archivadas y tabla,
+  con las mismas claves y tipos que `QuerySet.values()`.
+
+zstd requiere el paquete opcional `zstandard`; sin él se usa gzip.
+"""
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.db import OperationalError, connection, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .dashboard import mark_stale
+from .models import ArchivePartition
+from .periods import add_months, first_of_month, month_bounds, months_between
+
+try:
+    import zstandard
+except ImportError:  # zstandard es opcional: sin él los archivos se comprimen con gzip
+    zstandard = None
+
+EXTENSIONS = {'zstd': 'zst', 'gzip': 'gz'}
+
+
+class ArchiveError(Exception):
+    """El archivo no coincide con la tabla o con su índice"""
+
+
+@dataclass(frozen=True)
+class ArchiveSpec:
+    """
+    Modelo archivable y su columna de fecha
+    """
+    label: str
+    date_field: str = 'fecha'
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    def columns(self):
+        return [field.attname for field in self.model._meta.concrete_fields]
+
+
+SPECS = {
+    spec.label: spec
+    for spec in (
+        ArchiveSpec('transactions.Transaction'),
+        ArchiveSpec('audits.AuditEvent'),
+    )
+}
+
+
+def default_codec():
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+def cutoff_period(today=None):
+    """Primer mes que permanece en la tabla principal"""
+    return add_months(first_of_month(today or timezone.localdate()), -settings.ARCHIVE_HOT_MONTHS)
+
+
+def pending_periods(spec, before=None):
+    """Meses con filas en la tabla, anteriores a `before`, que aún no se archivaron"""
+    before = before or cutoff_period()
+    oldest = spec.model.objects.order_by(spec.date_field).values_list(spec.date_field, flat=True).first()
+    if oldest is None:
+        return []
+    archived = set(ArchivePartition.objects.filter(modelo=spec.label).values_list('periodo', flat=True))
+    periods = []
+    periodo = first_of_month(timezone.localtime(oldest))
+    while periodo < before:
+        if periodo not in archived:
+            periods.append(periodo)
+        periodo = add_months(periodo, 1)
+    return periods
+
+
+def archive_period(spec, periodo):
+    """
+    Mueve un mes de la tabla a su archivo y retorna la ArchivePartition creada.
+    Si la verificación falla no se borra nada y se lanza ArchiveError.
+    """
+    model = spec.model
+    columns = spec.columns()
+    pk_index = columns.index(model._meta.pk.attname)
+    date_index = columns.index(spec.date_field)
+    month = _period_filter(spec, periodo)
+
+    codec = default_codec()
+    path = _partition_path(spec, periodo, codec)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+    rows = model.objects.filter(month).order_by(spec.date_field, 'pk').values_list(*columns)
+    frames = []
+    pks = []
+    ids_digest = hashlib.sha256()
+    file_digest = hashlib.sha256()
+    offset = 0
+    with open(tmp, 'wb') as handle:
+        buffer = []
+
+        def write_frame():
+            nonlocal offset
+            data = _compress(codec, ''.join(
+                json.dumps(row, default=str, ensure_ascii=False, separators=(',', ':')) + '\n'
+                for row in buffer
+            ).encode('utf-8'))
+            handle.write(data)
+            file_digest.update(data)
+            frames.append({
+                'offset': offset,
+                'size': len(data),
+                'rows': len(buffer),
+                'desde': str(buffer[0][date_index]),
+                'hasta': str(buffer[-1][date_index]),
+            })
+            offset += len(data)
+            buffer.clear()
+
+        for row in rows.iterator(chunk_size=settings.ARCHIVE_FRAME_ROWS):
+            pks.append(row[pk_index])
+            ids_digest.update(str(row[pk_index]).encode())
+            buffer.append(row)
+            if len(buffer) >= settings.ARCHIVE_FRAME_ROWS:
+                write_frame()
+        if buffer:
+            write_frame()
+
+    partition = ArchivePartition(
+        modelo=spec.label,
+        periodo=periodo,
+        archivo=str(path.relative_to(settings.ARCHIVE_ROOT)),
+        codec=codec,
+        filas=len(pks),
+        tamano_bytes=offset,
+        huella_archivo=file_digest.hexdigest(),
+        huella_filas=ids_digest.hexdigest(),
+        columnas=columns,
+        marcos=frames,
+    )
+
+    # Verificación antes de borrar: el archivo escrito se relee completo
+    problems = _check_file(partition, tmp)
+    if model.objects.filter(month).count() != len(pks):
+        problems.append('la tabla cambió mientras se archivaba el período')
+    if problems:
+        tmp.unlink(missing_ok=True)
+        raise ArchiveError(f"{spec.label} {periodo:%Y-%m}: {'; '.join(problems)}")
+
+    os.replace(tmp, path)
+    with transaction.atomic():
+        partition.fecha_verificacion = timezone.now()
+        partition.save()
+        # Se borra por clave primaria: una fila insertada después de la lectura no se pierde.
+        # DELETE directo, sin recolectar filas ni emitir señales: los puntajes de fraude
+        # no tienen restricción de clave foránea y quedan en su tabla
+        batch_size = settings.ARCHIVE_DELETE_BATCH
+        for i in range(0, len(pks), batch_size):
+            model.objects.filter(pk__in=pks[i:i + batch_size])._raw_delete(connection.alias)
+        # Sin señales: los widgets que dependen del modelo se invalidan una vez por período
+        mark_stale(spec.label)
+    return partition
+
+
+def verify_partition(partition):
+    """
+    Relee el archivo de una partición y retorna la lista de problemas
+    encontrados (vacía si todo coincide con el índice)
+    """
+    path = Path(settings.ARCHIVE_ROOT) / partition.archivo
+    if not path.exists():
+        return [f'no existe el archivo {partition.archivo}']
+    problems = _check_file(partition, path)
+
+    spec = SPECS[partition.modelo]
+    remaining = spec.model.objects.filter(_period_filter(spec, partition.periodo)).count()
+    if remaining:
+        problems.append(f'{remaining} filas del período siguen en la tabla')
+    if not problems:
+        partition.fecha_verificacion = timezone.now()
+        partition.save(update_fields=['fecha_verificacion'])
+    return problems
+
+
+def stream(label, start, end, any_of=None):
+    """
+    Filas del modelo con fecha en [start, end) como dicts con las claves de
+    `values()`, en orden de fecha, leyendo de las particiones archivadas y de
+    la tabla. `any_of` ({columna: valores}) conserva solo las filas en las que
+    alguna de las columnas tiene uno de los valores.
+    """
+    spec = SPECS[label]
+    model = spec.model
+    periods = list(months_between(start, end))
+    partitions = {
+        partition.periodo: partition
+        for partition in ArchivePartition.objects.filter(modelo=label, periodo__in=periods)
+    }
+    hot_filter = Q()
+    if any_of:
+        hot_filter = reduce(or_, (Q(**{f'{column}__in': values}) for column, values in any_of.items()))
+
+    for periodo in periods:
+        month_start, month_end = month_bounds(periodo)
+        lower, upper = max(start, month_start), min(end, month_end)
+        partition = partitions.get(periodo)
+        if partition is None:
+            yield from (
+                model.objects
+                .filter(hot_filter, **{f'{spec.date_field}__gte': lower, f'{spec.date_field}__lt': upper})
+                .order_by(spec.date_field, 'pk')
+                .values(*spec.columns())
+                .iterator(chunk_size=2000)
+            )
+        else:
+            yield from _read_partition(spec, partition, lower, upper, any_of)
+
+
+def table_size(model):
+    """Bytes que ocupan la tabla y sus índices, si el motor permite medirlo"""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+            return cursor.fetchone()[0]
+        if connection.vendor == 'sqlite':
+            try:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_master WHERE tbl_name = %s)",
+                    [table]
+                )
+            except OperationalError:  # SQLite compilado sin la tabla virtual dbstat
+                return None
+            return cursor.fetchone()[0]
+    return None
+
+
+def _read_partition(spec, partition, lower, upper, any_of):
+    columns = partition.columnas
+    converters = _converters(spec.model, columns)
+    date_index = columns.index(spec.date_field)
+    # Los valores crudos del archivo son texto: se compara contra su forma serializada
+    wanted = [
+        (columns.index(column), {str(value) for value in values})
+        for column, values in (any_of or {}).items()
+        if column in columns
+    ]
+    parse_date = datetime.fromisoformat
+    # Columnas agregadas al modelo después de archivar: se completan con su valor por defecto
+    fields = {field.attname: field for field in spec.model._meta.concrete_fields}
+    added = {column: fields[column].get_default() for column in spec.columns() if column not in columns}
+
+    with open(Path(settings.ARCHIVE_ROOT) / partition.archivo, 'rb') as handle:
+        for frame in partition.marcos:
+            if parse_date(frame['hasta']) < lower or parse_date(frame['desde']) >= upper:
+                continue
+            for raw in _iter_frame(handle, partition.codec, frame):
+                if wanted and not any(raw[index] in values for index, values in wanted):
+                    continue
+                fecha = parse_date(raw[date_index])
+                if fecha < lower or fecha >= upper:
+                    continue
+                row = {
+                    column: value if convert is None or value is None else convert(value)
+                    for column, convert, value in zip(columns, converters, raw)
+                }
+                if added:
+                    row.update(added)
+                yield row
+
+
+def _iter_frame(handle, codec, frame):
+    handle.seek(frame['offset'])
+    data = _decompress(codec, handle.read(frame['size']))
+    for line in data.decode('utf-8').splitlines():
+        yield json.loads(line)
+
+
+def _check_file(partition, path):
+    problems = []
+    file_digest = hashlib.sha256()
+    ids_digest = hashlib.sha256()
+    pk_index = partition.columnas.index(SPECS[partition.modelo].model._meta.pk.attname)
+    rows = 0
+    with open(path, 'rb') as handle:
+        for number, frame in enumerate(partition.marcos):
+            handle.seek(frame['offset'])
+            file_digest.update(handle.read(frame['size']))
+            try:
+                frame_rows = list(_iter_frame(handle, partition.codec, frame))
+            except Exception as exc:
+                problems.append(f'marco {number} ilegible: {exc}')
+                continue
+            if len(frame_rows) != frame['rows']:
+                problems.append(f"marco {number}: {len(frame_rows)} filas, el índice dice {frame['rows']}")
+            for row in frame_rows:
+                ids_digest.update(str(row[pk_index]).encode())
+            rows += len(frame_rows)
+
+        handle.seek(0, os.SEEK_END)
+        if handle.tell() != partition.tamano_bytes:
+            problems.append(f'tamaño {handle.tell()} distinto del índice ({partition.tamano_bytes})')
+
+    if rows != partition.filas:
+        problems.append(f'{rows} filas en el archivo, el índice dice {partition.filas}')
+    if file_digest.hexdigest() != partition.huella_archivo:
+        problems.append('el SHA-256 del archivo no coincide')
+    if ids_digest.hexdigest() != partition.huella_filas:
+        problems.append('los identificadores no coinciden con los archivados')
+    return problems
+
+
+def _period_filter(spec, periodo):
+    start, end = month_bounds(periodo)
+    return Q(**{f'{spec.date_field}__gte': start, f'{spec.date_field}__lt': end})
+
+
+def _partition_path(spec, periodo, codec):
+    directory = spec.label.lower().replace('.', '_')
+    return Path(settings.ARCHIVE_ROOT) / directory / f"{periodo:%Y-%m}.jsonl.{EXTENSIONS[codec]}"
+
+
+def _converters(model, columns):
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    converters = []
+    for column in columns:
+        field = fields.get(column)
+        if field is not None and field.is_relation:
+            field = field.target_field
+        if isinstance(field, models.UUIDField):
+            converters.append(uuid.UUID)
+        elif isinstance(field, models.DecimalField):
+            converters.append(Decimal)
+        elif isinstance(field, models.DateTimeField):
+            converters.append(datetime.fromisoformat)
+        elif isinstance(field, models.DateField):
+            converters.append(date.fromisoformat)
+        else:
+            converters.append(None)
+    return converters
+
+
+def _compress(codec, data):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec, data):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ArchiveError('La partición usa zstd y el paquete zstandard no está instalado')
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
@@ -0,0 +1,265 @@
+"""
+Framework de widgets del dashboard con caché stale-while-revalidate.
+
+Cada widget declara qué roles lo ven, su TTL, si su caché es por rol o por
+usuario y de qué modelos dependen sus datos. Al renderizar:
+
+- entrada vigente: se usa tal cual;
+- entrada vencida (TTL cumplido o dependencia modificada): se usa igual y se
+  programa un recálculo en segundo plano;
+- sin entrada: se calcula en la solicitud (solo la primera vez).
+
+Así el tiempo de render del dashboard no depende del volumen de datos.
+Las versiones de las dependencias se guardan en la base (DependencyVersion)
+y no en la caché, que es local a cada proceso. Se incrementan una vez por
+transacción y modelo, al confirmarse, para no retener la fila de versión
+mientras dura la escritura. Un widget sin entrada lo calcula una sola
+solicitud; las concurrentes lo muestran como pendiente.
+Los widgets se registran en módulos `dashboard.py` de cada app.
+"""
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+
+from .models import DependencyVersion
+
+logger = logging.getLogger('banco.dashboard')
+
+ALL_ROLES = ('administrador', 'cajero', 'ejecutivo_cuentas', 'auditor', 'cliente')
+
+
+@dataclass(frozen=True)
+class Widget:
+    """
+    Declaración de un widget del dashboard
+    """
+    key: str
+    title: str
+    loader: object
+    roles: tuple
+    ttl: int = 60
+    per_user: bool = False
+    depends_on: tuple = ()
+    icon: str = 'bi-graph-up'
+
+    def cache_key(self, user):
+        scope = f"u{user.pk}" if self.per_user else f"r{user.role.nombre}"
+        return f"dashboard:{self.key}:{scope}"
+
+
+_registry = {}
+_ignored_updates = {}
+_executor = None
+_executor_lock = threading.Lock()
+# Modelos modificados en la transacción en curso de cada hilo, por confirmar
+_pending = threading.local()
+
+
+def widget(key, title, roles, ttl=60, per_user=False, depends_on=(), icon='bi-graph-up'):
+    """
+    Decorador que registra una función `loader(user) -> dict` como widget.
+
+    El dict puede tener `stats` (lista de {'label', 'value'}) y/o `table`
+    ({'headers': [...], 'rows': [[...], ...]}), y debe poder serializarse en caché.
+    """
+
+    def decorator(loader):
+        _registry[key] = Widget(
+            key=key,
+            title=title,
+            loader=loader,
+            roles=tuple(roles),
+            ttl=ttl,
+            per_user=per_user,
+            depends_on=tuple(depends_on),
+            icon=icon,
+        )
+        return loader
+
+    return decorator
+
+
+def widgets_for(user):
+    """Widgets visibles para el rol del usuario, en orden de registro"""
+    role = user.role.nombre
+    return [item for item in _registry.values() if role in item.roles]
+
+
+def render_data(user):
+    """
+    Retorna [(widget, datos, actualizado_en)] para el usuario, usando la caché.
+    `datos` y `actualizado_en` son None si otra solicitud lo está calculando.
+    """
+    items = widgets_for(user)
+    if not items:
+        return []
+
+    keys = {item.key: item.cache_key(user) for item in items}
+    cached = cache.get_many(list(keys.values()))
+    versions = _dependency_versions({label for item in items for label in item.depends_on})
+
+    result = []
+    now = time.time()
+    for item in items:
+        entry = cached.get(keys[item.key])
+        current = {label: versions[label] for label in item.depends_on}
+        if entry is None:
+            entry = _compute_once(item, user, current)
+            if entry is None:
+                result.append((item, None, None))
+                continue
+        elif now - entry['computed_at'] > item.ttl or entry['versions'] != current:
+            _schedule_refresh(item, user)
+        result.append((item, entry['data'], entry['computed_at']))
+    return result
+
+
+def refresh(item, user):
+    """Recalcula y guarda un widget (usado por el refresco y el precalentado)"""
+    return _compute(item, user, _dependency_versions(item.depends_on))
+
+
+def mark_stale(*model_labels):
+    """
+    Marca como vencidos los widgets que dependen de los modelos indicados.
+    Necesario para escrituras masivas (update/bulk_create) que no emiten señales.
+    Dentro de una transacción las versiones se incrementan al confirmarla, una
+    vez por modelo; si se revierte no se incrementan.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        _bump_versions(set(model_labels))
+        return
+
+    flush = getattr(_pending, 'flush', None)
+    if flush is None or flush() is None:
+        # Primera marca de la transacción: Django retiene el único callback y lo
+        # descarta si la transacción se revierte, con lo que la referencia muere
+        labels = _pending.labels = set()
+
+        def confirm():
+            _bump_versions(labels)
+
+        _pending.flush = weakref.ref(confirm)
+        transaction.on_commit(confirm)
+    _pending.labels.update(model_labels)
+
+
+def ignore_updates(label, *fields):
+    """
+    Los guardados de `label` con update_fields dentro de `fields` no vencen
+    widgets (p. ej. los datos de acceso que se actualizan en cada login)
+    """
+    _ignored_updates[label] = frozenset(fields)
+
+
+def connect_dependency_signals():
+    """Conecta save/delete de los modelos de los que dependen los widgets"""
+    for label in {label for item in _registry.values() for label in item.depends_on}:
+        model = apps.get_model(label)
+        post_save.connect(_on_model_change, sender=model, dispatch_uid=f'dashboard:{label}:save')
+        post_delete.connect(_on_model_change, sender=model, dispatch_uid=f'dashboard:{label}:delete')
+
+
+def format_money(value, moneda=None):
+    """Monto con separador de miles al estilo local: guaraníes sin decimales"""
+    moneda = moneda or settings.DEFAULT_CURRENCY
+    if value is None:
+        value = 0
+    if moneda == 'PYG':
+        text = f"{value:,.0f}"
+    else:
+        text = f"{value:,.2f}"
+    text = text.replace(',', '_').replace('.', ',').replace('_', '.')
+    return f"{text} {moneda}"
+
+
+def _on_model_change(sender, update_fields=None, **kwargs):
+    label = sender._meta.label
+    ignored = _ignored_updates.get(label)
+    if ignored and update_fields and ignored.issuperset(update_fields):
+        return
+    mark_stale(label)
+
+
+def _bump_versions(labels):
+    # Crea las filas que falten y luego incrementa todas con un UPDATE atómico
+    try:
+        with transaction.atomic():
+            DependencyVersion.objects.bulk_create(
+                [DependencyVersion(modelo=label) for label in labels], ignore_conflicts=True
+            )
+            DependencyVersion.objects.filter(modelo__in=labels).update(version=F('version') + 1)
+    except DatabaseError:
+        # Corre después de que la escritura que lo originó ya se confirmó: fallar aquí
+        # haría creer al llamador que la escritura no ocurrió. Los widgets se
+        # actualizan igual al vencer su TTL.
+        logger.warning("No se pudieron vencer los widgets de %s", ', '.join(sorted(labels)), exc_info=True)
+
+
+def _dependency_versions(labels):
+    if not labels:
+        return {}
+    versions = dict(DependencyVersion.objects.filter(modelo__in=labels).values_list('modelo', 'version'))
+    return {label: versions.get(label, 0) for label in labels}
+
+
+def _compute(item, user, versions):
+    entry = {
+        'data': item.loader(user),
+        'computed_at': time.time(),
+        'versions': versions,
+    }
+    cache.set(item.cache_key(user), entry, timeout=settings.DASHBOARD_STALE_TTL)
+    return entry
+
+
+def _compute_once(item, user, versions):
+    # Arranque en frío: solo una solicitud calcula cada entrada faltante
+    lock_key = f"{item.cache_key(user)}:refreshing"
+    if not cache.add(lock_key, 1, timeout=settings.DASHBOARD_REFRESH_LOCK_TIMEOUT):
+        return None
+    try:
+        return _compute(item, user, versions)
+    finally:
+        cache.delete(lock_key)
+
+
+def _schedule_refresh(item, user):
+    # cache.add es atómico: evita que varios procesos recalculen lo mismo a la vez
+    lock_key = f"{item.cache_key(user)}:refreshing"
+    if not cache.add(lock_key, 1, timeout=settings.DASHBOARD_REFRESH_LOCK_TIMEOUT):
+        return
+    _get_executor().submit(_refresh_in_background, item, user, lock_key)
+
+
+def _refresh_in_background(item, user, lock_key):
+    close_old_connections()
+    try:
+        refresh(item, user)
+    except Exception:
+        logger.exception("Error al refrescar el widget %s", item.key)
+    finally:
+        cache.delete(lock_key)
+        connection.close()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.DASHBOARD_REFRESH_WORKERS,
+                    thread_name_prefix='dashboard-refresh'
+                )
+    return _executor
@@ -0,0 +1,125 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import archive
+from core.models import ArchivePartition
+from core.periods import month_bounds, parse_month
+
+
+class Command(BaseCommand):
+    help = (
+        'Mueve los meses cerrados más antiguos de transacciones y auditoría a '
+        'archivos comprimidos e informa tamaño de tabla y latencia antes y después'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', nargs='+', choices=list(archive.SPECS), default=list(archive.SPECS),
+                            help='Modelos a archivar')
+        parser.add_argument('--before', type=parse_month,
+                            help='Archivar los meses anteriores a AAAA-MM (por defecto, según ARCHIVE_HOT_MONTHS)')
+        parser.add_argument('--dry-run', action='store_true', help='Solo listar los meses a archivar')
+        parser.add_argument('--verify', action='store_true',
+                            help='Verificar las particiones ya archivadas en lugar de archivar')
+        parser.add_argument('--probe-repeat', type=int, default=3,
+                            help='Repeticiones de las consultas de prueba; se informa la mejor')
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            return self._verify(options['model'])
+
+        before = options['before'] or archive.cutoff_period()
+        for label in options['model']:
+            spec = archive.SPECS[label]
+            periods = archive.pending_periods(spec, before)
+            self.stdout.write(f"{label}: {len(periods)} meses anteriores a {before:%m/%Y} por archivar")
+            if not periods:
+                continue
+            if options['dry_run']:
+                for periodo in periods:
+                    self.stdout.write(f"  {periodo:%Y-%m}")
+                continue
+
+            probe_month = periods[0]
+            before_stats = self._measure(spec, probe_month, options['probe_repeat'])
+            start = time.perf_counter()
+            rows = compressed = 0
+            for periodo in periods:
+                try:
+                    partition = archive.archive_period(spec, periodo)
+                except archive.ArchiveError as exc:
+                    raise CommandError(str(exc))
+                rows += partition.filas
+                compressed += partition.tamano_bytes
+                self.stdout.write(
+                    f"  {periodo:%Y-%m}: {partition.filas:,} filas → {partition.archivo} "
+                    f"({partition.tamano_bytes / 1024:,.0f} KiB, {len(partition.marcos)} marcos)"
+                )
+            after_stats = self._measure(spec, probe_month, options['probe_repeat'])
+
+            self.stdout.write(f"  {'':<28}{'antes':>14}{'después':>14}")
+            for name, key, unit in (
+                ('Filas en la tabla', 'rows', ''),
+                ('Tamaño tabla + índices', 'size', ' MiB'),
+                ('Últimos 30 días', 'recent', ' ms'),
+                (f'Mes {probe_month:%Y-%m} completo', 'old', ' ms'),
+            ):
+                self.stdout.write(
+                    f"  {name:<28}{_fmt(before_stats[key], unit):>14}{_fmt(after_stats[key], unit):>14}"
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {label}: {rows:,} filas archivadas en {time.perf_counter() - start:.1f} s "
+                f"({compressed / 1024 / 1024:,.1f} MiB comprimidos)"
+            ))
+
+    def _verify(self, labels):
+        problems = 0
+        partitions = ArchivePartition.objects.filter(modelo__in=labels)
+        for partition in partitions:
+            errors = archive.verify_partition(partition)
+            status = '✓' if not errors else '✗'
+            self.stdout.write(f"  {status} {partition} ({partition.filas:,} filas)")
+            for error in errors:
+                self.stderr.write(f"      {error}")
+            problems += bool(errors)
+        if problems:
+            raise CommandError(f"{problems} particiones no coinciden con su índice")
+        self.stdout.write(self.style.SUCCESS(f"✓ {partitions.count()} particiones verificadas"))
+
+    def _measure(self, spec, probe_month, repeat):
+        """Filas, tamaño y latencia de una consulta reciente y de la lectura del mes más antiguo"""
+        model = spec.model
+        size = archive.table_size(model)
+        latest = model.objects.order_by(f'-{spec.date_field}').values_list(spec.date_field, flat=True).first()
+        recent = None
+        if latest is not None:
+            recent = _best(repeat, lambda: list(
+                model.objects.filter(**{f'{spec.date_field}__gte': latest - timedelta(days=30)})
+                .values_list('pk', flat=True)
+            ))
+        start, end = month_bounds(probe_month)
+        return {
+            'rows': f"{model.objects.count():,}",
+            'size': size / 1024 / 1024 if size is not None else None,
+            'recent': recent * 1000 if recent is not None else None,
+            'old': _best(repeat, lambda: sum(1 for _ in archive.stream(spec.label, start, end))) * 1000,
+        }
+
+
+def _best(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _fmt(value, unit):
+    if value is None:
+        return 'n/d'
+    if isinstance(value, str):
+        return value
+    return f"{value:,.1f}{unit}"
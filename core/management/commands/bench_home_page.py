@@ -0,0 +1,102 @@
+import gzip
+import os
+import re
+from statistics import median
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from core.storage import COMPRESSIBLE_EXTENSIONS, brotli
+
+ASSET_RE = re.compile(r'<(?:link|script)\b[^>]*?\b(?:href|src)="([^"]+)"', re.IGNORECASE)
+CSS_URL_RE = re.compile(r'url\(\s*["\']?([^"\')?#]+\.woff2)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el peso de una página (HTML más CSS, JS y fuentes que referencia) '
+        'y el tiempo del servidor hasta el primer byte'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='/', help='Página a medir')
+        parser.add_argument('--requests', type=int, default=50, help='Solicitudes para medir el primer byte')
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST='localhost', HTTP_ACCEPT_ENCODING='br, gzip')
+
+        timings = []
+        for _ in range(options['requests'] + 1):
+            start = perf_counter()
+            response = client.get(options['url'])
+            if response.streaming:
+                next(iter(response.streaming_content), b'')
+            timings.append(perf_counter() - start)
+        # La primera solicitud incluye la carga de plantillas: se descarta
+        timings = sorted(timings[1:])
+        html = response.content
+
+        rows = [('HTML ' + options['url'], html)]
+        external = []
+        for url in ASSET_RE.findall(html.decode('utf-8')):
+            parts = urlsplit(url)
+            if parts.netloc:
+                external.append(url)
+                continue
+            content, name = self._read_static(parts.path)
+            if content is None:
+                self.stderr.write(f"No se encontró {url}")
+                continue
+            rows.append((name, content))
+            if name.endswith('.css'):
+                # Fuentes que el navegador descargará al aplicar el CSS
+                base = os.path.dirname(name)
+                for ref in CSS_URL_RE.findall(content.decode('utf-8', 'ignore')):
+                    ref_content, ref_name = self._read_static(
+                        settings.STATIC_URL + os.path.normpath(os.path.join(base, ref))
+                    )
+                    if ref_content is not None and all(ref_name != row[0] for row in rows):
+                        rows.append((ref_name, ref_content))
+
+        self.stdout.write(f"{'Recurso':<60} {'Bytes':>10} {'gzip':>10} {'brotli':>10}")
+        totals = [0, 0, 0]
+        for name, content in rows:
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) or name.startswith('HTML'):
+                sizes = (len(content), len(gzip.compress(content, 9)),
+                         len(brotli.compress(content)) if brotli is not None else 0)
+            else:
+                # Formatos ya comprimidos (woff2, imágenes) viajan tal cual
+                sizes = (len(content), len(content), len(content) if brotli is not None else 0)
+            totals = [total + size for total, size in zip(totals, sizes)]
+            self.stdout.write(f"{name[-60:]:<60} {sizes[0]:>10,} {sizes[1]:>10,} {sizes[2] or '-':>10}")
+        self.stdout.write(f"{'Total (' + str(len(rows)) + ' solicitudes)':<60} "
+                          f"{totals[0]:>10,} {totals[1]:>10,} {totals[2] or '-':>10}")
+
+        self.stdout.write(f"Orígenes externos: {len({urlsplit(url).netloc for url in external})}")
+        for url in external:
+            self.stdout.write(f"  {url}")
+        self.stdout.write(
+            f"Primer byte (servidor): mediana {median(timings) * 1000:.1f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:.1f} ms"
+        )
+
+    def _read_static(self, path):
+        prefix = urlsplit(settings.STATIC_URL).path
+        if not prefix.startswith('/'):
+            prefix = '/' + prefix
+        if not path.startswith(prefix):
+            return None, path
+        name = path[len(prefix):]
+
+        # Primero el archivo versionado de collectstatic, si no el original
+        candidate = os.path.join(settings.STATIC_ROOT, name) if settings.STATIC_ROOT else None
+        if not candidate or not os.path.isfile(candidate):
+            candidate = finders.find(name)
+        if not candidate:
+            return None, name
+        with open(candidate, 'rb') as handle:
+            return handle.read(), name
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+from functools import partial
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core import metrics
+from core.middleware import DBTimer
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el costo por muestra de contadores e histogramas en la ruta '
+        'caliente, el costo del volcado al almacén compartido y verifica que '
+        'varios procesos sumen exactamente sobre las mismas series'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=1_000_000, help='Muestras por medición')
+        parser.add_argument('--workers', type=int, default=4, help='Procesos que registran a la vez')
+        parser.add_argument('--per-worker', type=int, default=200_000, help='Incrementos por proceso')
+
+    def handle(self, *args, **options):
+        if options['samples'] < 1 or options['workers'] < 1 or options['per_worker'] < 1:
+            raise CommandError('--samples, --workers y --per-worker deben ser mayores a cero')
+        samples = options['samples']
+
+        with tempfile.TemporaryDirectory() as directory:
+            # Almacén temporal: la medición no toca las métricas reales
+            store = os.path.join(directory, 'metricas.sqlite3')
+            settings.METRICS_STORE = store
+            metrics.registry.flush()
+
+            baseline = _timed(samples, lambda: None)
+            cases = [
+                ('Contador con etiqueta', lambda: metrics.LOGINS.inc('bench')),
+                ('Histograma con 2 etiquetas', lambda: metrics.HTTP_LATENCY.observe(0.042, 'bench', 'GET')),
+                ('Temporizador de consultas', partial(DBTimer(), _execute, 'SELECT 1', None, False, None)),
+            ]
+            for label, sample in cases:
+                cost = _timed(samples, sample) - baseline
+                self.stdout.write(f"  {label:<28} {cost * 1e9 / samples:>8,.0f} ns/muestra")
+
+            start = time.perf_counter()
+            rows = metrics.registry.flush()
+            self.stdout.write(f"  Volcado de {rows} series al almacén en {(time.perf_counter() - start) * 1000:,.1f} ms")
+
+            start = time.perf_counter()
+            text = metrics.registry.render()
+            self.stdout.write(
+                f"  Exposición de {text.count(chr(10)):,} líneas en {(time.perf_counter() - start) * 1000:,.1f} ms"
+            )
+
+            # Agregación entre procesos
+            before = _stored(metrics.LOGINS.name, 'bench')
+            connections.close_all()
+            start = time.perf_counter()
+            with get_context().Pool(options['workers'], initializer=_init_worker, initargs=(store,)) as pool:
+                pool.map(_increment, [options['per_worker']] * options['workers'])
+            elapsed = time.perf_counter() - start
+            added = _stored(metrics.LOGINS.name, 'bench') - before
+
+        expected = options['workers'] * options['per_worker']
+        self.stdout.write(
+            f"  {options['workers']} procesos x {options['per_worker']:,} incrementos en {elapsed:.2f} s: "
+            f"{added:,.0f} en el almacén"
+        )
+        if added != expected:
+            raise CommandError(f"Se esperaban {expected:,} incrementos en el almacén y hay {added:,.0f}")
+        self.stdout.write(self.style.SUCCESS("✓ Los procesos suman exactamente sobre las mismas series"))
+
+
+def _timed(samples, sample):
+    start = time.perf_counter()
+    for _ in range(samples):
+        sample()
+    return time.perf_counter() - start
+
+
+def _execute(sql, params, many, context):
+    return None
+
+
+def _stored(name, *labels):
+    totals = metrics.registry.collect()
+    return totals[name].get(labels, {}).get('', 0)
+
+
+def _increment(count):
+    for _ in range(count):
+        metrics.LOGINS.inc('bench')
+    metrics.registry.flush()
+
+
+def _init_worker(store):
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    settings.METRICS_STORE = store
@@ -0,0 +1,78 @@
+import time
+import uuid
+from functools import partial
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core import numbering
+from core.models import NumberSequence
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide números de cuenta y PAN por segundo con varios procesos pidiendo '
+        'números a la vez, para distintos tamaños de bloque, y verifica que no '
+        'haya duplicados ni dígitos verificadores inválidos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 4], help='Procesos concurrentes')
+        parser.add_argument('--count', type=int, default=20000, help='Números pedidos por proceso')
+        parser.add_argument('--block-sizes', type=int, nargs='+', default=[1, 100, settings.NUMBERING_BLOCK_SIZE],
+                            help='Tamaños de bloque a comparar (1 = una reserva en la base por número)')
+        parser.add_argument('--kind', choices=['cuenta', 'tarjeta'], default='cuenta')
+
+    def handle(self, *args, **options):
+        if min(options['workers']) < 1 or options['count'] < 1 or min(options['block_sizes']) < 1:
+            raise CommandError('--workers, --count y --block-sizes deben ser mayores a cero')
+
+        for workers in options['workers']:
+            for block_size in options['block_sizes']:
+                # Secuencia propia por medición: no consume números reales
+                nombre = f"bench:{uuid.uuid4().hex[:12]}"
+                task = partial(_generate, nombre, block_size, options['kind'])
+                try:
+                    start = time.perf_counter()
+                    if workers > 1:
+                        connections.close_all()
+                        with get_context().Pool(workers, initializer=_init_worker) as pool:
+                            chunks = pool.map(task, [options['count']] * workers)
+                    else:
+                        chunks = [task(options['count'])]
+                    elapsed = time.perf_counter() - start
+                finally:
+                    NumberSequence.objects.filter(nombre=nombre).delete()
+
+                numbers = [number for chunk in chunks for number in chunk]
+                duplicates = len(numbers) - len(set(numbers))
+                valid = numbering.is_valid_account_number if options['kind'] == 'cuenta' else numbering.is_valid_pan
+                invalid = sum(1 for number in numbers if not valid(number))
+                if duplicates or invalid:
+                    raise CommandError(f"{duplicates} números duplicados y {invalid} inválidos")
+
+                self.stdout.write(
+                    f"  {workers} procesos, bloque {block_size:>6,}: {len(numbers):>8,} números en "
+                    f"{elapsed:6.2f} s ({len(numbers) / elapsed:>10,.0f} números/s)"
+                )
+
+        self.stdout.write(self.style.SUCCESS("✓ Sin duplicados y con dígitos verificadores válidos"))
+
+
+def _generate(nombre, block_size, kind, count):
+    sequence = numbering.Sequence(nombre, block_size=block_size)
+    # Números de a uno, como los pide Account.save() / Card.save()
+    if kind == 'cuenta':
+        return [numbering.format_account_number(sequence.next()) for _ in range(count)]
+    bin_code = settings.CARD_BINS['debito']
+    return [numbering.format_pan(bin_code, sequence.next()) for _ in range(count)]
+
+
+def _init_worker():
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
@@ -0,0 +1,38 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import lazy_violations, setup_timings
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide django.setup() en intérpretes nuevos y falla si la mediana supera '
+        'el presupuesto o si se importó algún módulo de carga diferida'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10, help='Intérpretes medidos')
+        parser.add_argument('--max-ms', type=float, default=settings.STARTUP_BUDGET_MS,
+                            help='Mediana máxima admitida en milisegundos (0 = sin límite)')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat debe ser mayor a cero')
+        seconds, modules = setup_timings(options['repeat'])
+        timings = sorted(value * 1000 for value in seconds)
+        median = statistics.median(timings)
+        self.stdout.write(
+            f"  django.setup() en {options['repeat']} intérpretes: mínimo {timings[0]:.0f} ms, "
+            f"mediana {median:.0f} ms, máximo {timings[-1]:.0f} ms; {len(modules):,} módulos cargados"
+        )
+
+        violations = lazy_violations(modules)
+        if violations:
+            raise CommandError(f"Módulos de carga diferida importados en el arranque: {', '.join(violations)}")
+        if options['max_ms'] and median > options['max_ms']:
+            raise CommandError(f"La mediana ({median:.0f} ms) supera el presupuesto de {options['max_ms']:.0f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            "✓ Arranque dentro del presupuesto y sin módulos de carga diferida"
+        ))
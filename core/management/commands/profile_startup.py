@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.startup import import_profile, lazy_violations
+
+
+class Command(BaseCommand):
+    help = (
+        'Perfila las importaciones de django.setup() en un intérprete nuevo e '
+        'informa el costo por app o paquete y los módulos más lentos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Filas por tabla')
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative',
+                            help='Orden de la tabla de módulos: tiempo acumulado (con submódulos) o propio')
+        parser.add_argument('--prefix', help='Mostrar solo los módulos que empiezan con este prefijo')
+
+    def handle(self, *args, **options):
+        if options['limit'] < 1:
+            raise CommandError('--limit debe ser mayor a cero')
+        profile = import_profile()
+        total = profile.total_us
+
+        self.stdout.write(f"  {'App o paquete':<34}{'ms':>9}{'%':>7}")
+        groups = sorted(profile.groups.items(), key=lambda item: item[1], reverse=True)
+        for group, micros in groups[:options['limit']]:
+            self.stdout.write(f"  {group:<34}{micros / 1000:>9.1f}{micros / total * 100:>6.1f}%")
+
+        modules = profile.modules
+        if options['prefix']:
+            modules = [module for module in modules if module.name.startswith(options['prefix'])]
+        key = 'cumulative_us' if options['sort'] == 'cumulative' else 'self_us'
+        modules = sorted(modules, key=lambda module: getattr(module, key), reverse=True)[:options['limit']]
+        self.stdout.write(f"\n  {'Módulo':<52}{'propio ms':>10}{'acumulado ms':>14}")
+        for module in modules:
+            self.stdout.write(
+                f"  {module.name:<52}{module.self_us / 1000:>10.1f}{module.cumulative_us / 1000:>14.1f}"
+            )
+
+        violations = lazy_violations(module.name for module in profile.modules)
+        if violations:
+            self.stdout.write(self.style.WARNING(
+                f"\n  Módulos de carga diferida importados en el arranque: {', '.join(violations)}"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {len(profile.modules):,} módulos importados en {total / 1000:,.0f} ms (con -X importtime)"
+        ))
@@ -0,0 +1,50 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from core import dashboard
+from users.models import SystemUser
+
+
+class Command(BaseCommand):
+    help = (
+        'Precalcula los widgets del dashboard de cada rol para que el primer '
+        'ingreso tras un despliegue no pague las consultas de agregación'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--per-user', action='store_true',
+            help='Precalcular también los widgets por usuario de todos los usuarios activos'
+        )
+
+    def handle(self, *args, **options):
+        users = SystemUser.objects.filter(estado=SystemUser.UserStatus.ACTIVO).select_related('role')
+        total = 0
+        start = perf_counter()
+
+        for role in dashboard.ALL_ROLES:
+            # Los widgets por rol solo necesitan un usuario representativo del rol
+            user = users.filter(role__nombre=role).first()
+            if user is None:
+                continue
+            for item in dashboard.widgets_for(user):
+                if not item.per_user:
+                    self._refresh(item, user)
+                    total += 1
+
+        if options['per_user']:
+            for user in users.iterator():
+                for item in dashboard.widgets_for(user):
+                    if item.per_user:
+                        self._refresh(item, user)
+                        total += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {total} widgets precalculados en {(perf_counter() - start) * 1000:.0f} ms"
+        ))
+
+    def _refresh(self, item, user):
+        start = perf_counter()
+        dashboard.refresh(item, user)
+        self.stdout.write(f"  {item.cache_key(user)}: {(perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,314 @@
+"""
+Métricas de operación en formato Prometheus.
+
+- Contadores e histogramas se registran en memoria del proceso: una muestra
+  es un incremento de diccionario bajo un lock, sin E/S.
+- Un hilo de fondo vuelca cada METRICS_FLUSH_INTERVAL segundos los deltas
+  acumulados a un almacén local compartido (SQLite en METRICS_STORE) con un
+  UPSERT que suma: todos los workers de la máquina suman sobre las mismas series.
+- `/__metrics__/` (solo administradores) vuelca el proceso actual y expone el
+  total del almacén. Sin METRICS_STORE se expone solo el proceso actual.
+
+Todas las métricas se declaran en este módulo para que cualquier proceso
+pueda exponerlas aunque no haya importado el código que las registra.
+"""
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+
+from django.conf import settings
+
+from .profiling import Histogram as Buckets
+
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+        registry.register(self)
+
+    def drain(self):
+        """Retorna los valores acumulados desde el último volcado y los reinicia"""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def restore(self, values):
+        """Devuelve a memoria valores drenados que no se pudieron volcar"""
+        with self._lock:
+            for labels, value in values.items():
+                current = self._values.get(labels)
+                self._values[labels] = value if current is None else self.merge(current, value)
+
+    def _reset_after_fork(self):
+        # Lo acumulado antes del fork ya lo vuelca el proceso padre
+        self._lock = threading.Lock()
+        self._values = {}
+
+
+class Counter(Metric):
+    """
+    Contador monotónico: `inc(*valores_de_etiquetas, amount=1)`
+    """
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+        if not _flusher_started:
+            _start_flusher()
+
+    def merge(self, current, value):
+        return current + value
+
+    def series(self, values):
+        for labels, value in values.items():
+            yield labels, '', value
+
+
+class Histogram(Metric):
+    """
+    Histograma de buckets fijos: `observe(valor, *valores_de_etiquetas)`
+    """
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS_S):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        with self._lock:
+            histogram = self._values.get(labels)
+            if histogram is None:
+                histogram = self._values[labels] = Buckets(self.buckets)
+            histogram.observe(value)
+        if not _flusher_started:
+            _start_flusher()
+
+    def merge(self, current, histogram):
+        current.counts = [a + b for a, b in zip(current.counts, histogram.counts)]
+        current.count += histogram.count
+        current.sum += histogram.sum
+        current.max = max(current.max, histogram.max)
+        return current
+
+    def series(self, values):
+        for labels, histogram in values.items():
+            for index, count in enumerate(histogram.counts):
+                if count:
+                    yield labels, f'b{index}', count
+            yield labels, 'sum', histogram.sum
+            yield labels, 'count', histogram.count
+
+
+class Registry:
+    """
+    Métricas declaradas y almacén compartido del proceso
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f'La métrica {metric.name} ya está registrada')
+        self.metrics[metric.name] = metric
+
+    def flush(self):
+        """Suma al almacén lo acumulado por este proceso. Sin almacén no hace nada."""
+        path = settings.METRICS_STORE
+        if not path:
+            return 0
+        drained = [(metric, metric.drain()) for metric in self.metrics.values()]
+        rows = [
+            (metric.name, json.dumps(labels, ensure_ascii=False), serie, value)
+            for metric, values in drained
+            for labels, serie, value in metric.series(values)
+        ]
+        if not rows:
+            return 0
+        try:
+            with closing(_connect(path)) as store:
+                # Una sola transacción: el volcado de un proceso se ve completo o no se ve
+                store.execute('BEGIN IMMEDIATE')
+                store.executemany(
+                    'INSERT INTO metricas (nombre, etiquetas, serie, valor) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (nombre, etiquetas, serie) DO UPDATE SET valor = valor + excluded.valor',
+                    rows
+                )
+                store.execute('COMMIT')
+        except sqlite3.Error:
+            # Sin COMMIT no se escribió nada: lo drenado vuelve a memoria para el próximo volcado
+            for metric, values in drained:
+                metric.restore(values)
+            raise
+        return len(rows)
+
+    def collect(self):
+        """
+        Valores totales por métrica: {nombre: {etiquetas: {serie: valor}}},
+        del almacén o, sin almacén, del proceso actual
+        """
+        totals = {name: {} for name in self.metrics}
+        path = settings.METRICS_STORE
+        if path:
+            self.flush()
+            with closing(_connect(path)) as store:
+                rows = store.execute('SELECT nombre, etiquetas, serie, valor FROM metricas').fetchall()
+            for name, labels, serie, value in rows:
+                if name in totals:
+                    totals[name].setdefault(tuple(json.loads(labels)), {})[serie] = value
+        else:
+            for name, metric in self.metrics.items():
+                for labels, serie, value in metric.series(metric.snapshot()):
+                    totals[name].setdefault(labels, {})[serie] = value
+        return totals
+
+    def render(self):
+        """Exposición en formato de texto de Prometheus (versión 0.0.4)"""
+        lines = []
+        for name, series in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for labels, values in sorted(series.items()):
+                pairs = list(zip(metric.labelnames, labels))
+                if metric.kind == 'counter':
+                    lines.append(f'{name}{_labels(pairs)} {_number(values.get("", 0))}')
+                    continue
+                cumulative = 0
+                for index, bound in enumerate(metric.buckets + (None,)):
+                    cumulative += values.get(f'b{index}', 0)
+                    le = '+Inf' if bound is None else _number(bound)
+                    lines.append(f'{name}_bucket{_labels(pairs + [("le", le)])} {_number(cumulative)}')
+                lines.append(f'{name}_sum{_labels(pairs)} {_number(values.get("sum", 0))}')
+                lines.append(f'{name}_count{_labels(pairs)} {_number(values.get("count", 0))}')
+        return '\n'.join(lines) + '\n'
+
+    def _reset_after_fork(self):
+        for metric in self.metrics.values():
+            metric._reset_after_fork()
+
+
+def _connect(path):
+    store = sqlite3.connect(path, timeout=5, isolation_level=None)
+    store.execute('PRAGMA journal_mode=WAL')
+    store.execute(
+        'CREATE TABLE IF NOT EXISTS metricas ('
+        'nombre TEXT NOT NULL, etiquetas TEXT NOT NULL, serie TEXT NOT NULL, valor REAL NOT NULL, '
+        'PRIMARY KEY (nombre, etiquetas, serie))'
+    )
+    return store
+
+
+def _labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# Volcado periódico: un hilo por proceso, iniciado con la primera muestra.
+# Tras un fork el hijo no hereda el hilo: _after_fork_in_child lo marca sin iniciar.
+_flusher_started = False
+_flusher_lock = threading.Lock()
+
+
+def _start_flusher():
+    global _flusher_started
+    with _flusher_lock:
+        if _flusher_started:
+            return
+        _flusher_started = True
+    if not settings.METRICS_STORE:
+        return
+    threading.Thread(target=_flush_loop, name='metrics-flusher', daemon=True).start()
+
+
+def _flush_loop():
+    stop = threading.Event()
+    while not stop.wait(settings.METRICS_FLUSH_INTERVAL):
+        try:
+            registry.flush()
+        except sqlite3.Error:
+            # Almacén ocupado o inaccesible: flush ya devolvió los valores a memoria
+            # y se reintentan en el próximo intervalo
+            pass
+
+
+def _after_fork_in_child():
+    global _flusher_started, _flusher_lock
+    _flusher_started = False
+    _flusher_lock = threading.Lock()
+    registry._reset_after_fork()
+
+
+def _flush_at_exit():
+    if _flusher_started:
+        try:
+            registry.flush()
+        except sqlite3.Error:
+            pass
+
+
+registry = Registry()
+os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(_flush_at_exit)
+
+
+LOGINS = Counter(
+    'banco_login_total',
+    'Intentos de inicio de sesión por resultado (exitoso, fallido, bloqueo, bloqueado, desconocido)',
+    ['resultado'],
+)
+PERMISSION_CACHE = Counter(
+    'banco_permission_cache_total',
+    'Consultas a la caché de permisos por rol (hit, miss)',
+    ['resultado'],
+)
+HTTP_REQUESTS = Counter(
+    'banco_http_requests_total',
+    'Solicitudes HTTP por vista y clase de código de estado',
+    ['vista', 'estado'],
+)
+HTTP_LATENCY = Histogram(
+    'banco_http_request_duration_seconds',
+    'Latencia de las solicitudes HTTP por vista',
+    ['vista', 'metodo'],
+)
+DB_TIME = Histogram(
+    'banco_http_db_duration_seconds',
+    'Tiempo de base de datos por solicitud HTTP',
+    ['vista'],
+)
+DB_QUERIES = Counter(
+    'banco_db_queries_total',
+    'Consultas SQL ejecutadas por vista',
+    ['vista'],
+)
+LEDGER_POSTINGS = Counter(
+    'banco_ledger_postings_total',
+    'Transferencias procesadas por el libro por resultado (registrada, rechazada)',
+    ['resultado'],
+)
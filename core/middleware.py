@@ -0,0 +1,218 @@
+import atexit
+import logging
+import mimetypes
+import os
+import posixpath
+from contextlib import ExitStack
+from time import perf_counter
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+from .profiling import QueryRecorder, registry
+from .storage import compression_variants
+
+logger = logging.getLogger('banco.profiling')
+
+
+class SQLProfilingMiddleware:
+    """
+    Registra por solicitud la cantidad de consultas, el tiempo de SQL, las
+    consultas repetidas (posibles N+1) y la latencia de la vista, y los
+    acumula en histogramas por vista.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SQL_PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.duplicate_threshold = settings.SQL_PROFILING_DUPLICATE_THRESHOLD
+        if settings.SQL_PROFILING_DUMP_PATH:
+            atexit.register(registry.dump, settings.SQL_PROFILING_DUMP_PATH)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        latency = perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'sin_resolver'
+        registry.record(view_name, latency, recorder, self.duplicate_threshold)
+
+        duplicates = recorder.duplicates(self.duplicate_threshold)
+        if duplicates:
+            logger.warning(
+                "Posible N+1 en %s (%s): %s",
+                view_name, request.path, recorder.report(self.duplicate_threshold, limit=3)
+            )
+
+        response['Server-Timing'] = (
+            f'db;desc="{recorder.count} consultas";dur={recorder.total_time * 1000:.1f}, '
+            f'total;dur={latency * 1000:.1f}'
+        )
+        return response
+
+
+class DBTimer:
+    """
+    execute_wrapper mínimo para métricas: solo cuenta consultas y suma su duración
+    """
+    __slots__ = ('count', 'total_time')
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.total_time += perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    """
+    Registra por solicitud la latencia, el tiempo de base de datos, las
+    consultas y la clase de código de estado, etiquetados por nombre de vista
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = DBTimer()
+        start = perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        latency = perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'sin_resolver'
+        metrics.HTTP_LATENCY.observe(latency, view_name, request.method)
+        metrics.HTTP_REQUESTS.inc(view_name, f'{response.status_code // 100}xx')
+        metrics.DB_TIME.observe(timer.total_time, view_name)
+        if timer.count:
+            metrics.DB_QUERIES.inc(view_name, amount=timer.count)
+        return response
+
+
+def accepted_encodings(header):
+    """
+    Codificaciones de un Accept-Encoding con su peso: {'gzip': 1.0, 'br': 0.0}.
+    q=0 significa "no aceptable"; un peso mal formado descarta la entrada.
+    """
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    quality = 0.0
+        if coding == 'x-gzip':
+            coding = 'gzip'
+        accepted[coding] = quality
+    return accepted
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Sirve los archivos de STATIC_ROOT eligiendo la variante .br/.gz según
+    Accept-Encoding. Los archivos con hash de contenido en el nombre se
+    marcan como inmutables con caché de un año; el resto con caché corta.
+    """
+    ENCODINGS = {'.br': 'br', '.gz': 'gzip'}
+
+    def __init__(self, get_response):
+        if not settings.STATIC_SERVE_PRECOMPRESSED or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.prefix = urlsplit(settings.STATIC_URL).path
+        if not self.prefix.startswith('/'):
+            self.prefix = '/' + self.prefix
+        self.root = os.path.realpath(settings.STATIC_ROOT)
+        self.immutable = self._load_hashed_names()
+        self.variants = compression_variants()
+        # nombre → (ruta, etiqueta base del ETag, {extensión: ruta comprimida}); se llena bajo demanda
+        self._files = {}
+
+    def _load_hashed_names(self):
+        manifest = getattr(staticfiles_storage, 'hashed_files', None)
+        return set(manifest.values()) if manifest else set()
+
+    def __call__(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return self.get_response(request)
+
+        name = posixpath.normpath(unquote(request.path[len(self.prefix):])).lstrip('/')
+        entry = self._lookup(name)
+        if entry is None:
+            return self.get_response(request)
+
+        path, tag, compressed = entry
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        encoding = None
+        best = 0
+        # Mayor q del cliente; a igual q, el orden de preferencia de self.variants (br antes que gzip)
+        for suffix in self.variants:
+            quality = accepted.get(self.ENCODINGS[suffix], accepted.get('*', 0))
+            if suffix in compressed and quality > best:
+                path, encoding, best = compressed[suffix], self.ENCODINGS[suffix], quality
+        # Cada variante es una representación distinta y lleva su propio ETag
+        etag = f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+        if etag in {candidate.strip() for candidate in request.headers.get('If-None-Match', '').split(',')}:
+            response = HttpResponseNotModified()
+        else:
+            content_type, _ = mimetypes.guess_type(name)
+            response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+        response['ETag'] = etag
+        if name in self.immutable:
+            response['Cache-Control'] = f'public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response['Cache-Control'] = 'public, max-age=60'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def _lookup(self, name):
+        entry = self._files.get(name)
+        if entry is not None:
+            return entry
+
+        path = os.path.realpath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        compressed = {
+            suffix: path + suffix
+            for suffix in self.variants
+            if os.path.isfile(path + suffix)
+        }
+        entry = (path, f'{stat.st_size:x}-{int(stat.st_mtime):x}', compressed)
+        self._files[name] = entry
+        return entry
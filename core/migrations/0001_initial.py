@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:51
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivePartition',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('modelo', models.CharField(max_length=100, verbose_name='Modelo')),
+                ('periodo', models.DateField(verbose_name='Período')),
+                ('archivo', models.CharField(max_length=255, verbose_name='Archivo')),
+                ('codec', models.CharField(max_length=10, verbose_name='Compresión')),
+                ('filas', models.PositiveIntegerField(verbose_name='Filas')),
+                ('tamano_bytes', models.PositiveBigIntegerField(verbose_name='Tamaño (bytes)')),
+                ('huella_archivo', models.CharField(max_length=64, verbose_name='SHA-256 del Archivo')),
+                ('huella_filas', models.CharField(max_length=64, verbose_name='SHA-256 de los Identificadores')),
+                ('columnas', models.JSONField(default=list, verbose_name='Columnas')),
+                ('marcos', models.JSONField(default=list, verbose_name='Marcos')),
+                ('fecha_archivado', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Archivado')),
+                ('fecha_verificacion', models.DateTimeField(blank=True, null=True, verbose_name='Última Verificación')),
+            ],
+            options={
+                'verbose_name': 'Partición Archivada',
+                'verbose_name_plural': 'Particiones Archivadas',
+                'db_table': 'particiones_archivadas',
+                'ordering': ['modelo', 'periodo'],
+                'constraints': [models.UniqueConstraint(fields=('modelo', 'periodo'), name='particion_modelo_periodo_uniq')],
+            },
+        ),
+    ]
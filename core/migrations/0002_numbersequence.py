@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NumberSequence',
+            fields=[
+                ('nombre', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Secuencia')),
+                ('siguiente', models.PositiveBigIntegerField(default=1, verbose_name='Próximo Número Libre')),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True, verbose_name='Última Reserva')),
+            ],
+            options={
+                'verbose_name': 'Secuencia de Numeración',
+                'verbose_name_plural': 'Secuencias de Numeración',
+                'db_table': 'secuencias_numeracion',
+            },
+        ),
+    ]
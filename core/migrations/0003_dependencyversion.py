@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_numbersequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DependencyVersion',
+            fields=[
+                ('modelo', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Modelo')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Versión')),
+            ],
+            options={
+                'verbose_name': 'Versión de Dependencia',
+                'verbose_name_plural': 'Versiones de Dependencias',
+                'db_table': 'versiones_dependencias',
+            },
+        ),
+    ]
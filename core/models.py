@@ -1,3 +1,73 @@
+import uuid
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class ArchivePartition(models.Model):
+    """
+    Índice del archivo frío: un registro por modelo y período
+    movido de la tabla principal a un archivo comprimido.
+    `marcos` lista los bloques comprimidos del archivo (posición, tamaño,
+    filas y rango de fechas) para leer solo los necesarios.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    modelo = models.CharField(max_length=100, verbose_name='Modelo')
+    periodo = models.DateField(verbose_name='Período')
+    archivo = models.CharField(max_length=255, verbose_name='Archivo')
+    codec = models.CharField(max_length=10, verbose_name='Compresión')
+    filas = models.PositiveIntegerField(verbose_name='Filas')
+    tamano_bytes = models.PositiveBigIntegerField(verbose_name='Tamaño (bytes)')
+    huella_archivo = models.CharField(max_length=64, verbose_name='SHA-256 del Archivo')
+    huella_filas = models.CharField(max_length=64, verbose_name='SHA-256 de los Identificadores')
+    columnas = models.JSONField(default=list, verbose_name='Columnas')
+    marcos = models.JSONField(default=list, verbose_name='Marcos')
+    fecha_archivado = models.DateTimeField(default=timezone.now, verbose_name='Fecha de Archivado')
+    fecha_verificacion = models.DateTimeField(null=True, blank=True, verbose_name='Última Verificación')
+
+    class Meta:
+        verbose_name = 'Partición Archivada'
+        verbose_name_plural = 'Particiones Archivadas'
+        db_table = 'particiones_archivadas'
+        ordering = ['modelo', 'periodo']
+        constraints = [
+            models.UniqueConstraint(fields=['modelo', 'periodo'], name='particion_modelo_periodo_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} {self.periodo:%m/%Y}"
+
+
+class NumberSequence(models.Model):
+    """
+    Modelo de Secuencias de numeración (cuentas, tarjetas). Cada proceso
+    reserva bloques de números avanzando `siguiente` con un UPDATE atómico.
+    """
+    nombre = models.CharField(max_length=50, primary_key=True, verbose_name='Secuencia')
+    siguiente = models.PositiveBigIntegerField(default=1, verbose_name='Próximo Número Libre')
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name='Última Reserva')
+
+    class Meta:
+        verbose_name = 'Secuencia de Numeración'
+        verbose_name_plural = 'Secuencias de Numeración'
+        db_table = 'secuencias_numeracion'
+
+    def __str__(self):
+        return f"{self.nombre} ({self.siguiente})"
+
+
+class DependencyVersion(models.Model):
+    """
+    Modelo de Versiones de los datos de los que dependen los widgets del
+    dashboard. Cada escritura sobre un modelo incrementa su versión en la
+    base, así todos los procesos ven el cambio aunque la caché sea local.
+    """
+    modelo = models.CharField(max_length=100, primary_key=True, verbose_name='Modelo')
+    version = models.PositiveBigIntegerField(default=0, verbose_name='Versión')
+
+    class Meta:
+        verbose_name = 'Versión de Dependencia'
+        verbose_name_plural = 'Versiones de Dependencias'
+        db_table = 'versiones_dependencias'
+
+    def __str__(self):
+        return f"{self.modelo} (v{self.version})"
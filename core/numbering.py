@@ -0,0 +1,175 @@
+"""
+Numeración de cuentas y tarjetas por bloques.
+
+- Cada secuencia vive en una fila de NumberSequence. Un proceso reserva un
+  bloque de NUMBERING_BLOCK_SIZE números con un único UPDATE atómico
+  (`siguiente = siguiente + n`) y después los entrega desde memoria: la base
+  se consulta una vez por bloque, no una vez por número, y dos procesos nunca
+  reciben el mismo bloque.
+- Los dígitos verificadores se calculan localmente: ISO 7064 MOD 97-10 (el de
+  IBAN) para números de cuenta y Luhn para tarjetas.
+- Los números de un bloque que no se llegan a usar (el proceso termina antes)
+  se pierden: la numeración no tiene huecos garantizados, solo unicidad.
+"""
+import os
+import threading
+import weakref
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import NumberSequence
+
+
+def allocate_block(nombre, size):
+    """Reserva `size` números consecutivos de la secuencia y retorna el rango"""
+    with transaction.atomic():
+        # El UPDATE va primero: toma el bloqueo de escritura antes de leer el valor
+        for _ in range(2):
+            updated = NumberSequence.objects.filter(nombre=nombre).update(
+                siguiente=F('siguiente') + size,
+                fecha_actualizacion=timezone.now(),
+            )
+            if updated:
+                break
+            # Primera reserva: crear la fila (si otro proceso la crea antes, se ignora) y repetir
+            NumberSequence.objects.bulk_create([NumberSequence(nombre=nombre)], ignore_conflicts=True)
+        end = NumberSequence.objects.values_list('siguiente', flat=True).get(nombre=nombre)
+    return range(end - size, end)
+
+
+class Sequence:
+    """
+    Generador de números de una secuencia con un bloque reservado en memoria.
+
+    Si el bloque se reservó dentro de una transacción, solo es válido si esa
+    transacción se confirma: ante un rollback el UPDATE de la reserva se
+    deshace y otro proceso puede recibir los mismos números, así que el bloque
+    se descarta. Tras un fork el proceso hijo descarta el bloque heredado.
+    """
+
+    def __init__(self, nombre, block_size=None):
+        self.nombre = nombre
+        self.block_size = block_size or settings.NUMBERING_BLOCK_SIZE
+        self._block = iter(())
+        self._pid = None
+        self._pending = None
+
+    def next(self):
+        return self.take(1)[0]
+
+    def take(self, count):
+        """Los próximos `count` números, reservando los bloques que hagan falta"""
+        if self._pid != os.getpid() or not self._block_is_safe():
+            self._block = iter(())
+            self._pid = os.getpid()
+            self._pending = None
+
+        numbers = []
+        while len(numbers) < count:
+            number = next(self._block, None)
+            if number is None:
+                self._block = iter(allocate_block(self.nombre, max(self.block_size, count - len(numbers))))
+                self._track_commit()
+                continue
+            numbers.append(number)
+        return numbers
+
+    def _track_commit(self):
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            self._pending = None
+            return
+
+        def confirm():
+            if self._pending is reservation:
+                self._pending = None
+
+        # Solo Django retiene el callback (que no se referencia a sí mismo): si la
+        # transacción o el savepoint de la reserva se revierte, lo descarta sin
+        # ejecutarlo y la referencia débil muere
+        reservation = self._pending = weakref.ref(confirm)
+        transaction.on_commit(confirm)
+
+    def _block_is_safe(self):
+        # Sin marca: bloque reservado fuera de una transacción o ya confirmado.
+        # Con marca viva: la transacción de la reserva sigue abierta y vigente
+        return self._pending is None or self._pending() is not None
+
+
+_local = threading.local()
+
+
+def sequence(nombre):
+    """Secuencia del hilo actual (cada hilo usa su conexión y sus propios bloques)"""
+    sequences = getattr(_local, 'sequences', None)
+    if sequences is None:
+        sequences = _local.sequences = {}
+    if nombre not in sequences:
+        sequences[nombre] = Sequence(nombre)
+    return sequences[nombre]
+
+
+def luhn_check_digit(digits):
+    """Dígito verificador Luhn para una cadena de dígitos"""
+    total = 0
+    for position, char in enumerate(reversed(digits)):
+        value = int(char)
+        if position % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_pan(pan):
+    return pan.isdigit() and luhn_check_digit(pan[:-1]) == pan[-1]
+
+
+def mod97_check_digits(digits):
+    """Dígitos verificadores ISO 7064 MOD 97-10: el número completo cumple n % 97 == 1"""
+    return f"{98 - int(digits) * 100 % 97:02d}"
+
+
+def is_valid_account_number(numero):
+    return numero.isdigit() and int(numero) % 97 == 1
+
+
+def format_account_number(number):
+    _check_capacity('cuenta', number, settings.ACCOUNT_NUMBER_DIGITS)
+    body = f"{settings.ACCOUNT_NUMBER_PREFIX}{number:0{settings.ACCOUNT_NUMBER_DIGITS}d}"
+    return body + mod97_check_digits(body)
+
+
+def format_pan(bin_code, number):
+    digits = settings.CARD_PAN_LENGTH - len(bin_code) - 1
+    _check_capacity(f'tarjeta:{bin_code}', number, digits)
+    body = f"{bin_code}{number:0{digits}d}"
+    return body + luhn_check_digit(body)
+
+
+def _check_capacity(nombre, number, digits):
+    if number >= 10 ** digits:
+        raise OverflowError(f'La secuencia {nombre} superó los {digits} dígitos disponibles')
+
+
+def account_numbers(count):
+    """`count` números de cuenta nuevos, para bulk_create"""
+    return [format_account_number(number) for number in sequence('cuenta').take(count)]
+
+
+def next_account_number():
+    return account_numbers(1)[0]
+
+
+def card_numbers(tipo, count):
+    """`count` PAN nuevos del BIN del tipo de tarjeta, para bulk_create"""
+    bin_code = settings.CARD_BINS[tipo]
+    return [format_pan(bin_code, number) for number in sequence(f'tarjeta:{bin_code}').take(count)]
+
+
+def next_card_number(tipo):
+    return card_numbers(tipo, 1)[0]
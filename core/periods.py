@@ -0,0 +1,41 @@
+"""
+Utilidades de períodos mensuales (extractos, archivo frío)
+"""
+from datetime import date, datetime, time as dt_time
+
+from django.utils import timezone
+
+
+def first_of_month(value):
+    return date(value.year, value.month, 1)
+
+
+def parse_month(value):
+    """Período AAAA-MM (tipo de argumento para los comandos)"""
+    year, month = value.split('-')
+    return date(int(year), int(month), 1)
+
+
+def add_months(periodo, months):
+    """Primer día del mes desplazado `months` meses (puede ser negativo)"""
+    index = periodo.year * 12 + periodo.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(periodo):
+    """Inicio (inclusive) y fin (exclusivo) del mes como datetimes con zona horaria"""
+    start = first_of_month(periodo)
+    end = add_months(start, 1)
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, dt_time.min), tz),
+        timezone.make_aware(datetime.combine(end, dt_time.min), tz),
+    )
+
+
+def months_between(start, end):
+    """Meses que se solapan con el intervalo [start, end) de datetimes"""
+    periodo = first_of_month(timezone.localtime(start))
+    while month_bounds(periodo)[0] < end:
+        yield periodo
+        periodo = add_months(periodo, 1)
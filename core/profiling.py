@@ -0,0 +1,171 @@
+"""
+Perfilado de SQL por solicitud.
+
+`QueryRecorder` se instala con `connection.execute_wrapper()`, por lo que
+funciona aunque DEBUG esté desactivado y sin guardar el texto de cada consulta.
+Las consultas se agrupan por huella (SQL sin literales ni longitudes de IN),
+lo que permite detectar patrones N+1 como consultas repetidas.
+"""
+import json
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from time import perf_counter
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACES_RE = re.compile(r'\s+')
+
+
+def fingerprint_sql(sql):
+    """
+    Normaliza una sentencia para agrupar consultas equivalentes
+    """
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST_RE.sub('(?...)', sql)
+    return _SPACES_RE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """
+    Wrapper de ejecución que cuenta consultas, tiempo de SQL y huellas repetidas
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.total_time += perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def duplicates(self, threshold=2):
+        """Huellas ejecutadas al menos `threshold` veces, de mayor a menor"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+
+    def report(self, threshold=2, limit=10):
+        """Texto legible con el resumen de consultas y las repetidas"""
+        lines = [f"{self.count} consultas en {self.total_time * 1000:.1f} ms"]
+        for sql, count in self.duplicates(threshold)[:limit]:
+            lines.append(f"  {count}x {sql[:200]}")
+        return '\n'.join(lines)
+
+
+class Histogram:
+    """
+    Histograma de buckets acumulables con límites fijos
+    """
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """Límite superior del bucket que contiene el percentil pedido"""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        running = 0
+        for bound, count in zip(self.bounds + (self.max,), self.counts):
+            running += count
+            if running >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self):
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 3),
+            'max': round(self.max, 3),
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+class ViewStats:
+    """
+    Estadísticas acumuladas de una vista
+    """
+
+    def __init__(self):
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.sql_time_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.duplicates = Counter()
+
+    def record(self, latency, recorder, duplicate_threshold):
+        self.latency_ms.observe(latency * 1000)
+        self.sql_time_ms.observe(recorder.total_time * 1000)
+        self.queries.observe(recorder.count)
+        for sql, count in recorder.duplicates(duplicate_threshold):
+            self.duplicates[sql] = max(self.duplicates[sql], count)
+
+    def as_dict(self, top_duplicates=10):
+        return {
+            'requests': self.latency_ms.count,
+            'latency_ms': self.latency_ms.as_dict(),
+            'sql_time_ms': self.sql_time_ms.as_dict(),
+            'queries': self.queries.as_dict(),
+            'duplicate_queries': [
+                {'sql': sql, 'max_repetitions': count}
+                for sql, count in self.duplicates.most_common(top_duplicates)
+            ],
+        }
+
+
+class ProfileRegistry:
+    """
+    Histogramas por vista del proceso actual
+    """
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, latency, recorder, duplicate_threshold):
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = ViewStats()
+            stats.record(latency, recorder, duplicate_threshold)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._views.items())}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def dump(self, path):
+        """Escribe el resumen de todas las vistas como JSON"""
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(self.snapshot(), handle, ensure_ascii=False, indent=2)
+
+
+registry = ProfileRegistry()
@@ -0,0 +1,152 @@
+"""
+Medición del arranque: cuánto cuesta `django.setup()` y qué se importa.
+
+Cada medición corre en un intérprete nuevo, así los módulos que ya cargó el
+proceso que mide no ocultan su costo. `import_profile()` usa `-X importtime`
+y atribuye el tiempo propio de cada módulo a la app instalada que lo contiene
+(o a su paquete de primer nivel), sin contar dos veces los submódulos.
+`setup_timings()` mide el arranque sin instrumentar.
+
+Los subsistemas pesados no se importan en el arranque: los admin.py se cargan
+con la URLconf, DRF, crispy y bootstrap solo cargan su AppConfig (sus vistas y
+template tags se importan al usarse) y los motores opcionales (NumPy,
+WeasyPrint) se importan con `optional_import()` al primer uso.
+`lazy_violations()` lista los módulos de LAZY_MODULES que igual se cargaron.
+"""
+import importlib
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+
+# Patrones de módulos que django.setup() no debe importar
+LAZY_MODULES = (
+    '*.admin',                      # ModelAdmin del proyecto: con la URLconf
+    'loans.scoring',
+    'reports.statements',
+    'core.archive',
+    'numpy', 'numpy.*',
+    'weasyprint', 'weasyprint.*',
+    'rest_framework.*',             # salvo la AppConfig y sus checks
+    'crispy_forms.*',
+    'crispy_bootstrap5.*',
+    'django_bootstrap5.*',          # salvo __about__, que importa su __init__
+)
+LAZY_EXCEPTIONS = (
+    'django.contrib.admin',
+    'rest_framework.apps', 'rest_framework.checks',
+    'crispy_forms.apps', 'crispy_bootstrap5.apps',
+    'django_bootstrap5.__about__', 'django_bootstrap5.apps',
+)
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+SETUP_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+elapsed = time.perf_counter() - start
+print(json.dumps({'segundos': elapsed, 'modulos': sorted(sys.modules)}))
+'''
+
+
+@dataclass
+class ModuleTime:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """
+    Módulos importados por `django.setup()` con su tiempo propio y acumulado
+    en microsegundos, y el tiempo propio sumado por app o paquete
+    """
+    modules: list = field(default_factory=list)
+    groups: dict = field(default_factory=dict)
+
+    @property
+    def total_us(self):
+        return sum(module.self_us for module in self.modules)
+
+    def slowest(self, limit, key='cumulative_us'):
+        return sorted(self.modules, key=lambda module: getattr(module, key), reverse=True)[:limit]
+
+
+def _run(args, env=None):
+    environment = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'banco.settings'))
+    environment.update(env or {})
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True,
+        cwd=settings.BASE_DIR, env=environment,
+    )
+
+
+@lru_cache(maxsize=None)
+def optional_import(name):
+    """
+    Importa un paquete opcional al primer uso y no en el arranque.
+    Retorna None si no está instalado.
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def lazy_violations(modules):
+    """Módulos de `modules` que coinciden con LAZY_MODULES"""
+    return [
+        module for module in modules
+        if module not in LAZY_EXCEPTIONS and any(fnmatchcase(module, pattern) for pattern in LAZY_MODULES)
+    ]
+
+
+def group_for(module, app_modules):
+    """App instalada que contiene al módulo o, si no hay, su paquete de primer nivel"""
+    parts = module.split('.')
+    for size in range(len(parts), 0, -1):
+        prefix = '.'.join(parts[:size])
+        if prefix in app_modules:
+            return prefix
+    return parts[0]
+
+
+def import_profile(env=None):
+    """Perfil de importación de `django.setup()` en un intérprete nuevo"""
+    result = _run(['-X', 'importtime', '-c', 'import django; django.setup()'], env)
+    app_modules = {config.name for config in apps.get_app_configs()}
+    profile = ImportProfile()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        module = ModuleTime(name, int(self_us), int(cumulative_us), len(indent) // 2)
+        profile.modules.append(module)
+        group = group_for(name, app_modules)
+        profile.groups[group] = profile.groups.get(group, 0) + module.self_us
+    return profile
+
+
+def setup_timings(repeat, env=None):
+    """
+    Segundos de `import django; django.setup()` en `repeat` intérpretes nuevos
+    y los módulos cargados en el último
+    """
+    seconds, modules = [], []
+    for _ in range(repeat):
+        data = json.loads(_run(['-c', SETUP_SCRIPT], env).stdout)
+        seconds.append(data['segundos'])
+        modules = data['modulos']
+    return seconds, modules
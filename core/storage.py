@@ -0,0 +1,53 @@
+"""
+Storage de archivos estáticos con nombres versionados por contenido y
+variantes precomprimidas (.gz y, si está instalado el paquete `brotli`, .br).
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se generan variantes gzip
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map', '.ttf', '.eot')
+MIN_COMPRESS_SIZE = 512
+
+
+def compression_variants():
+    """Extensiones de las variantes que se generan, en orden de preferencia"""
+    return ('.br', '.gz') if brotli is not None else ('.gz',)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage que además escribe junto a cada archivo
+    versionado sus variantes comprimidas, para servirlas sin comprimir en
+    cada solicitud.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # hashed_files queda con los nombres finales, sin los intermedios de cada pasada
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._write_compressed(hashed_name)
+
+    def _write_compressed(self, name):
+        with self.open(name) as handle:
+            content = handle.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+
+        variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(content, quality=11)
+
+        for suffix, compressed in variants.items():
+            # Solo vale la pena si ahorra al menos un 5%
+            if len(compressed) < len(content) * 0.95:
+                with open(self.path(name + suffix), 'wb') as handle:
+                    handle.write(compressed)
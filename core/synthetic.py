@@ -0,0 +1,501 @@
+"""
+Generación determinística de datos bancarios sintéticos para benchmarks.
+
+Cada fila se deriva solo de (semilla, tipo, índice): identificadores,
+relaciones y valores son reproducibles, y las filas se generan en bloques de
+tamaño fijo que cualquier proceso puede escribir sin coordinarse con los demás.
+Re-ejecutar con la misma semilla no duplica filas (los INSERT ignoran conflictos).
+"""
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from functools import lru_cache, partial
+from hashlib import blake2b
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections, transaction
+
+# Cantidad de filas por unidad de trabajo. Es parte del algoritmo: cambiarla
+# cambia los datos generados para una misma semilla.
+BLOCK_SIZE = 10000
+
+NOMBRES = [
+    'María', 'José', 'Juan', 'Ana', 'Carlos', 'Rosa', 'Luis', 'Carmen', 'Miguel', 'Liz',
+    'Diego', 'Laura', 'Pedro', 'Sofía', 'Jorge', 'Gabriela', 'Hugo', 'Fátima', 'Ramón', 'Nilda',
+]
+APELLIDOS = [
+    'González', 'Benítez', 'Martínez', 'López', 'Giménez', 'Vera', 'Duarte', 'Ramírez',
+    'Acosta', 'Báez', 'Villalba', 'Ortiz', 'Rojas', 'Cáceres', 'Franco', 'Sosa', 'Ayala',
+    'Britez', 'Núñez', 'Aquino',
+]
+
+PERMISSIONS = {
+    'crear_cliente': 'Registrar nuevos clientes',
+    'editar_cliente': 'Modificar datos de clientes',
+    'abrir_cuenta': 'Abrir cuentas bancarias',
+    'autorizar_transaccion': 'Autorizar transacciones que superan límites',
+    'registrar_deposito': 'Registrar depósitos en ventanilla',
+    'registrar_retiro': 'Registrar retiros en ventanilla',
+    'aprobar_prestamo': 'Aprobar solicitudes de préstamo',
+    'ver_reportes': 'Consultar reportes del banco',
+    'ver_auditoria': 'Consultar la bitácora de auditoría',
+    'realizar_transferencia': 'Transferir entre cuentas propias o de terceros',
+}
+
+ROLE_PERMISSIONS = {
+    'administrador': list(PERMISSIONS),
+    'cajero': ['registrar_deposito', 'registrar_retiro', 'realizar_transferencia'],
+    'ejecutivo_cuentas': ['crear_cliente', 'editar_cliente', 'abrir_cuenta', 'aprobar_prestamo',
+                          'ver_reportes'],
+    'auditor': ['ver_reportes', 'ver_auditoria'],
+    'cliente': ['realizar_transferencia'],
+}
+
+# Distribución de empleados por rol
+EMPLOYEE_ROLES = ['cajero'] * 6 + ['ejecutivo_cuentas'] * 3 + ['auditor'] + ['administrador']
+
+TRANSACTION_TYPES = ['transferencia'] * 10 + ['pago_servicio'] * 4 + ['deposito'] * 3 + ['retiro'] * 3
+
+AUDIT_EVENT_TYPES = ['login_exitoso'] * 17 + ['login_fallido'] * 2 + ['transferencia']
+
+
+@dataclass(frozen=True)
+class Scale:
+    """
+    Tamaño y parámetros del dataset a generar
+    """
+    seed: int = 42
+    clients: int = 1000
+    employees: int = 50
+    accounts_per_client: float = 1.5
+    card_ratio: float = 0.8
+    loan_ratio: float = 0.2
+    transactions: int = 10000
+    audit_events: int = 10000
+    atms: int = 40
+    days: int = 365
+    end_date: date = date(2025, 12, 31)
+    batch_size: int = 2000
+    password_hash: str = ''
+    role_ids: dict = field(default_factory=dict)
+
+    @property
+    def accounts(self):
+        return int(self.clients * self.accounts_per_client)
+
+    @property
+    def cards(self):
+        return int(self.accounts * self.card_ratio)
+
+    @property
+    def loans(self):
+        return int(self.clients * self.loan_ratio)
+
+    @property
+    def users(self):
+        return self.clients + self.employees
+
+    @property
+    def start(self):
+        end = datetime.combine(self.end_date, dt_time.max, tzinfo=dt_timezone.utc)
+        return end - timedelta(days=self.days)
+
+    def total(self, kind):
+        return getattr(self, KIND_SIZES[kind])
+
+
+@lru_cache(maxsize=None)
+def _uuid_prefix(seed, kind):
+    return int.from_bytes(blake2b(f'{seed}:{kind}'.encode(), digest_size=8).digest(), 'big')
+
+
+def synthetic_uuid(seed, kind, index):
+    """UUID reproducible de la fila `index` de un tipo"""
+    return uuid.UUID(int=(_uuid_prefix(seed, kind) << 64) | index)
+
+
+def ensure_roles_and_permissions():
+    """
+    Crea los roles, el catálogo de permisos y la matriz rol-permiso.
+    Retorna un dict nombre de rol → id.
+    """
+    from users.models import Permission, Role, RolePermission
+
+    roles = {}
+    for nombre, label in Role.RoleType.choices:
+        role, _ = Role.objects.get_or_create(nombre=nombre, defaults={'descripcion': label})
+        roles[nombre] = role.pk
+
+    Permission.objects.bulk_create(
+        [Permission(nombre=nombre, descripcion=descripcion) for nombre, descripcion in PERMISSIONS.items()],
+        ignore_conflicts=True
+    )
+    permission_ids = dict(Permission.objects.filter(nombre__in=PERMISSIONS).values_list('nombre', 'pk'))
+    RolePermission.objects.bulk_create(
+        [
+            RolePermission(role_id=roles[role], permission_id=permission_ids[permiso])
+            for role, permisos in ROLE_PERMISSIONS.items()
+            for permiso in permisos
+        ],
+        ignore_conflicts=True
+    )
+    return roles
+
+
+def assign_portfolios(scale):
+    """
+    Reparte los clientes en carteras contiguas entre los ejecutivos de cuentas.
+    Los UUID sintéticos de un tipo son crecientes con el índice, así que cada
+    cartera es un solo UPDATE sobre un rango de claves primarias.
+    Retorna la cantidad de clientes asignados.
+    """
+    from clients.models import Client
+
+    ejecutivos = [
+        scale.clients + i for i in range(scale.employees)
+        if EMPLOYEE_ROLES[i % len(EMPLOYEE_ROLES)] == 'ejecutivo_cuentas'
+    ]
+    assigned = 0
+    with transaction.atomic():
+        for n, usuario in enumerate(ejecutivos):
+            start = n * scale.clients // len(ejecutivos)
+            stop = (n + 1) * scale.clients // len(ejecutivos)
+            if start == stop:
+                continue
+            assigned += Client.objects.filter(
+                pk__gte=synthetic_uuid(scale.seed, 'cliente', start),
+                pk__lte=synthetic_uuid(scale.seed, 'cliente', stop - 1),
+            ).update(ejecutivo_id=synthetic_uuid(scale.seed, 'usuario', usuario))
+    return assigned
+
+
+def _block_rng(scale, kind, block):
+    return random.Random(f'{scale.seed}:{kind}:{block}')
+
+
+def _client_of_account(scale, index):
+    return index * scale.clients // scale.accounts
+
+
+def _first_account_of_client(scale, client):
+    return min(-(-client * scale.accounts // scale.clients), scale.accounts - 1)
+
+
+def _account_currency(index):
+    # Una de cada diez cuentas está en dólares
+    return 'USD' if index % 10 == 9 else 'PYG'
+
+
+def build_clients(scale, block):
+    from clients.models import Client
+
+    rng = _block_rng(scale, 'clientes', block)
+    start, stop = _block_range(scale, 'clientes', block)
+    return [
+        Client(
+            id=synthetic_uuid(scale.seed, 'cliente', i),
+            nombres=f"{rng.choice(NOMBRES)} {rng.choice(NOMBRES)}",
+            apellidos=f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+        )
+        for i in range(start, stop)
+    ]
+
+
+def build_users(scale, block):
+    from users.models import SystemUser
+
+    rng = _block_rng(scale, 'usuarios', block)
+    start, stop = _block_range(scale, 'usuarios', block)
+    span = scale.days * 86400
+    users = []
+    for i in range(start, stop):
+        if i < scale.clients:
+            role = 'cliente'
+            username = f"sim{scale.seed}_cliente{i}"
+            cliente_id = synthetic_uuid(scale.seed, 'cliente', i)
+        else:
+            role = EMPLOYEE_ROLES[(i - scale.clients) % len(EMPLOYEE_ROLES)]
+            username = f"sim{scale.seed}_{role}{i - scale.clients}"
+            cliente_id = None
+
+        # bulk_create no pasa por SystemUser.save(): los flags de staff se fijan acá
+        is_admin = role == 'administrador'
+        users.append(SystemUser(
+            id=synthetic_uuid(scale.seed, 'usuario', i),
+            username=username,
+            email=f"{username}@correo.example",
+            password=scale.password_hash,
+            role_id=scale.role_ids[role],
+            cliente_id=cliente_id,
+            estado=SystemUser.UserStatus.BLOQUEADO if rng.random() < 0.01 else SystemUser.UserStatus.ACTIVO,
+            fecha_creacion=scale.start + timedelta(seconds=rng.randrange(span)),
+            is_staff=is_admin,
+            is_superuser=is_admin,
+        ))
+    return users
+
+
+def build_accounts(scale, block):
+    from accounts.models import Account
+
+    rng = _block_rng(scale, 'cuentas', block)
+    start, stop = _block_range(scale, 'cuentas', block)
+    span = scale.days * 86400
+    accounts = []
+    for i in range(start, stop):
+        moneda = _account_currency(i)
+        saldo = rng.lognormvariate(14, 1.5) if moneda == 'PYG' else rng.lognormvariate(6, 1.5)
+        accounts.append(Account(
+            id=synthetic_uuid(scale.seed, 'cuenta', i),
+            numero_cuenta=f"S{scale.seed % 10000:04d}{i:012d}",
+            cliente_id=synthetic_uuid(scale.seed, 'cliente', _client_of_account(scale, i)),
+            tipo=Account.AccountType.CUENTA_CORRIENTE if rng.random() < 0.3 else Account.AccountType.CAJA_AHORRO,
+            moneda=moneda,
+            saldo=Decimal(f"{saldo:.2f}"),
+            fecha_apertura=scale.start + timedelta(seconds=rng.randrange(span)),
+        ))
+    return accounts
+
+
+def build_cards(scale, block):
+    from cards.models import Card
+    from .numbering import luhn_check_digit
+
+    rng = _block_rng(scale, 'tarjetas', block)
+    start, stop = _block_range(scale, 'tarjetas', block)
+    cards = []
+    for i in range(start, stop):
+        digits = f"4{scale.seed % 1000:03d}{i:011d}"
+        cards.append(Card(
+            id=synthetic_uuid(scale.seed, 'tarjeta', i),
+            cuenta_id=synthetic_uuid(scale.seed, 'cuenta', i * scale.accounts // scale.cards),
+            numero=digits + luhn_check_digit(digits),
+            tipo=Card.CardType.CREDITO if rng.random() < 0.25 else Card.CardType.DEBITO,
+            fecha_vencimiento=scale.end_date + timedelta(days=rng.randrange(30, 5 * 365)),
+        ))
+    return cards
+
+
+def build_loans(scale, block):
+    from loans.models import Loan
+
+    rng = _block_rng(scale, 'prestamos', block)
+    start, stop = _block_range(scale, 'prestamos', block)
+    loans = []
+    for i in range(start, stop):
+        client = i * scale.clients // scale.loans
+        monto = Decimal(rng.randrange(5, 500) * 1000000)
+        plazo = rng.choice([12, 24, 36, 48, 60])
+        otorgamiento = scale.end_date - timedelta(days=rng.randrange(scale.days))
+        estado = rng.choices(
+            [Loan.LoanStatus.VIGENTE, Loan.LoanStatus.EN_MORA, Loan.LoanStatus.CANCELADO],
+            weights=[80, 8, 12]
+        )[0]
+        loans.append(Loan(
+            id=synthetic_uuid(scale.seed, 'prestamo', i),
+            cliente_id=synthetic_uuid(scale.seed, 'cliente', client),
+            cuenta_id=synthetic_uuid(scale.seed, 'cuenta', _first_account_of_client(scale, client)),
+            monto=monto,
+            tasa_interes=Decimal(f"{rng.uniform(12, 32):.2f}"),
+            plazo_meses=plazo,
+            saldo_pendiente=0 if estado == Loan.LoanStatus.CANCELADO else (monto * Decimal(rng.uniform(0.1, 1))).quantize(Decimal('1')),
+            estado=estado,
+            fecha_solicitud=datetime.combine(otorgamiento, dt_time(12), tzinfo=dt_timezone.utc) - timedelta(days=7),
+            fecha_otorgamiento=otorgamiento,
+            fecha_proximo_vencimiento=None if estado == Loan.LoanStatus.CANCELADO else scale.end_date + timedelta(days=rng.randrange(1, 31)),
+        ))
+    return loans
+
+
+def atm_code(index):
+    return f"ATM{index:05d}"
+
+
+def build_atms(scale, block):
+    from atms.models import ATM
+
+    rng = _block_rng(scale, 'cajeros', block)
+    start, stop = _block_range(scale, 'cajeros', block)
+    departments = settings.PARAGUAY_DEPARTMENTS
+    atms = []
+    for i in range(start, stop):
+        departamento = departments[i % len(departments)]
+        sucursal = rng.random() < 0.2
+        atms.append(ATM(
+            id=synthetic_uuid(scale.seed, 'cajero', i),
+            codigo=atm_code(i),
+            tipo=ATM.TerminalType.CAJA_SUCURSAL if sucursal else ATM.TerminalType.CAJERO,
+            ubicacion=f"{'Sucursal' if sucursal else 'Cajero'} {departamento} {i // len(departments) + 1}",
+            departamento=departamento,
+            fecha_instalacion=scale.start.date() - timedelta(days=rng.randrange(2000)),
+        ))
+    return atms
+
+
+def build_transactions(scale, block):
+    from transactions.models import Transaction
+
+    rng = _block_rng(scale, 'transacciones', block)
+    start, stop = _block_range(scale, 'transacciones', block)
+    departments = settings.PARAGUAY_DEPARTMENTS
+    step = scale.days * 86400 / scale.transactions
+    usd_accounts = scale.accounts // 10
+    transactions = []
+    for i in range(start, stop):
+        tipo = rng.choice(TRANSACTION_TYPES)
+        account = rng.randrange(scale.accounts)
+        moneda = _account_currency(account)
+        origen = destino = None
+        if tipo == 'deposito':
+            destino = account
+        else:
+            origen = account
+        if tipo == 'transferencia':
+            if moneda == 'USD' and usd_accounts > 1:
+                destino = rng.randrange(usd_accounts) * 10 + 9
+            else:
+                destino = rng.randrange(scale.accounts)
+                while _account_currency(destino) != moneda:
+                    destino = rng.randrange(scale.accounts)
+            if destino == origen:
+                destino = None
+                tipo = 'retiro'
+
+        client = _client_of_account(scale, account)
+        monto = rng.lognormvariate(12, 1.3) if moneda == 'PYG' else rng.lognormvariate(4, 1.3)
+        transactions.append(Transaction(
+            id=synthetic_uuid(scale.seed, 'transaccion', i),
+            tipo=tipo,
+            cuenta_origen_id=synthetic_uuid(scale.seed, 'cuenta', origen) if origen is not None else None,
+            cuenta_destino_id=synthetic_uuid(scale.seed, 'cuenta', destino) if destino is not None else None,
+            monto=Decimal(f"{monto:.2f}"),
+            moneda=moneda,
+            referencia=f"SIM{i}",
+            fecha=scale.start + timedelta(seconds=(i + rng.random()) * step),
+            # Sin consumir el generador: los demás campos no cambian al agregar terminales
+            terminal=atm_code(i * 7919 % scale.atms) if tipo in ('deposito', 'retiro') and scale.atms else '',
+            dispositivo=f"dev-{client}-{rng.randrange(3)}",
+            departamento=departments[client % len(departments)] if rng.random() < 0.97 else rng.choice(departments),
+        ))
+    return transactions
+
+
+def build_audit_events(scale, block):
+    from audits.models import AuditEvent
+
+    rng = _block_rng(scale, 'auditoria', block)
+    start, stop = _block_range(scale, 'auditoria', block)
+    step = scale.days * 86400 / scale.audit_events
+    events = []
+    for i in range(start, stop):
+        tipo = rng.choice(AUDIT_EVENT_TYPES)
+        usuario = rng.randrange(scale.users)
+        events.append(AuditEvent(
+            id=synthetic_uuid(scale.seed, 'auditoria', i),
+            fecha=scale.start + timedelta(seconds=(i + rng.random()) * step),
+            tipo=tipo,
+            usuario_id=synthetic_uuid(scale.seed, 'usuario', usuario),
+            detalle={'intentos': rng.randint(1, 2)} if tipo == 'login_fallido' else {},
+            ip=f"10.{usuario % 256}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+        ))
+    return events
+
+
+# Orden de generación: cada tipo depende de los anteriores por claves foráneas
+BUILDERS = {
+    'clientes': build_clients,
+    'usuarios': build_users,
+    'cuentas': build_accounts,
+    'tarjetas': build_cards,
+    'prestamos': build_loans,
+    'cajeros': build_atms,
+    'transacciones': build_transactions,
+    'auditoria': build_audit_events,
+}
+
+KIND_SIZES = {
+    'clientes': 'clients',
+    'usuarios': 'users',
+    'cuentas': 'accounts',
+    'tarjetas': 'cards',
+    'prestamos': 'loans',
+    'cajeros': 'atms',
+    'transacciones': 'transactions',
+    'auditoria': 'audit_events',
+}
+
+
+def _block_range(scale, kind, block):
+    start = block * BLOCK_SIZE
+    return start, min(start + BLOCK_SIZE, scale.total(kind))
+
+
+def block_count(scale, kind):
+    return math.ceil(scale.total(kind) / BLOCK_SIZE)
+
+
+def write_block(kind, scale, block):
+    """
+    Genera e inserta un bloque. Retorna la cantidad de filas generadas.
+    """
+    rows = BUILDERS[kind](scale, block)
+    if not rows:
+        return 0
+    model = type(rows[0])
+    for attempt in range(10):
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(rows, batch_size=scale.batch_size, ignore_conflicts=True)
+            break
+        except OperationalError:
+            # SQLite serializa a los escritores: otro proceso tiene el bloqueo
+            if attempt == 9:
+                raise
+            time.sleep(0.1 * (attempt + 1))
+    return len(rows)
+
+
+def _init_worker():
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    _tune_connection()
+
+
+def _tune_connection():
+    if connection.vendor == 'sqlite':
+        # Solo para la conexión de carga: no espera al disco en cada COMMIT
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous=OFF')
+
+
+def generate(scale, workers=1, on_progress=None):
+    """
+    Genera todos los tipos en orden. `on_progress(kind, filas, segundos)` se
+    llama al terminar cada tipo. Retorna un dict tipo → (filas, segundos).
+    """
+    report = {}
+    for kind in BUILDERS:
+        start = time.perf_counter()
+        blocks = range(block_count(scale, kind))
+        task = partial(write_block, kind, scale)
+        if workers > 1 and len(blocks) > 1:
+            # Las conexiones heredadas no pueden compartirse entre procesos
+            connections.close_all()
+            with get_context().Pool(workers, initializer=_init_worker) as pool:
+                rows = sum(pool.imap_unordered(task, blocks))
+        else:
+            _tune_connection()
+            rows = sum(task(block) for block in blocks)
+        elapsed = time.perf_counter() - start
+        report[kind] = (rows, elapsed)
+        if on_progress:
+            on_progress(kind, rows, elapsed)
+    return report
@@ -0,0 +1,34 @@
+import mimetypes
+
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+register = template.Library()
+
+FONT_TYPES = {
+    '.woff2': 'font/woff2',
+    '.woff': 'font/woff',
+    '.ttf': 'font/ttf',
+}
+
+
+@register.simple_tag
+def preload(path, kind):
+    """
+    Emite un <link rel="preload"> para un archivo estático, usando su URL
+    versionada. Uso: {% preload 'vendor/bootstrap-icons/fonts/bootstrap-icons.woff2' 'font' %}
+    """
+    url = static(path)
+    if kind == 'font':
+        # Las fuentes se piden siempre en modo CORS: sin crossorigin el preload se descarta
+        extension = path[path.rfind('.'):]
+        return format_html(
+            '<link rel="preload" href="{}" as="font" type="{}" crossorigin>',
+            url,
+            FONT_TYPES.get(extension, 'font/woff2')
+        )
+    content_type, _ = mimetypes.guess_type(path)
+    if content_type:
+        return format_html('<link rel="preload" href="{}" as="{}" type="{}">', url, kind, content_type)
+    return format_html('<link rel="preload" href="{}" as="{}">', url, kind)
@@ -0,0 +1,41 @@
+"""
+Utilidades de pruebas para controlar el presupuesto de consultas de las vistas
+"""
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+from .profiling import QueryRecorder
+
+
+@contextmanager
+def query_budget(max_queries, using=None):
+    """
+    Falla si el bloque ejecuta más de `max_queries` consultas.
+
+        with query_budget(3):
+            self.client.get('/dashboard/')
+    """
+    recorder = QueryRecorder()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+    if recorder.count > max_queries:
+        raise AssertionError(
+            f"Se esperaban como máximo {max_queries} consultas y se ejecutaron "
+            f"{recorder.count}\n{recorder.report()}"
+        )
+
+
+class QueryBudgetMixin:
+    """
+    Mixin para TestCase con aserciones de presupuesto de consultas por vista
+    """
+
+    def assertViewQueryBudget(self, url, max_queries, method='get', **kwargs):
+        with query_budget(max_queries):
+            response = getattr(self.client, method)(url, **kwargs)
+        return response
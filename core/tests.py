@@ -1,3 +1,114 @@
-from django.test import TestCase
+import os
+import sqlite3
+import tempfile
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from . import metrics
+from .numbering import (
+    allocate_block,
+    format_account_number,
+    format_pan,
+    is_valid_account_number,
+    is_valid_pan,
+    luhn_check_digit,
+    mod97_check_digits,
+)
+
+
+class LuhnTests(SimpleTestCase):
+    def test_known_vectors(self):
+        # Ejemplo clásico de Luhn y PAN de prueba públicos de las marcas
+        vectors = {
+            '7992739871': '3',
+            '411111111111111': '1',      # Visa 4111 1111 1111 1111
+            '401288888888188': '1',      # Visa 4012 8888 8888 1881
+            '555555555555444': '4',      # Mastercard 5555 5555 5555 4444
+            '37828224631000': '5',       # American Express 3782 822463 10005
+        }
+        for body, digit in vectors.items():
+            with self.subTest(body=body):
+                self.assertEqual(luhn_check_digit(body), digit)
+                self.assertTrue(is_valid_pan(body + digit))
+
+    def test_rejects_altered_pan(self):
+        self.assertFalse(is_valid_pan('4111111111111112'))
+        # Transposición de dos dígitos adyacentes
+        self.assertFalse(is_valid_pan('4111111111111161'))
+        self.assertFalse(is_valid_pan('4111-1111-1111-1111'))
+
+    @override_settings(CARD_PAN_LENGTH=16)
+    def test_format_pan(self):
+        pan = format_pan('412345', 7)
+        self.assertEqual(pan, '4123450000000076')
+        self.assertTrue(is_valid_pan(pan))
+
+
+class Mod97Tests(SimpleTestCase):
+    def test_known_vectors(self):
+        vectors = {
+            '794': '44',                                # ejemplo de ISO 7064
+            '32142829123456987654321611': '82',         # IBAN GB82 WEST 1234 5698 7654 32
+            '3704004405320130001314': '89',             # IBAN DE89 3704 0044 0532 0130 00
+        }
+        for body, digits in vectors.items():
+            with self.subTest(body=body):
+                self.assertEqual(mod97_check_digits(body), digits)
+                self.assertTrue(is_valid_account_number(body + digits))
+
+    def test_check_digits_keep_leading_zero(self):
+        # 98 - resto puede ser de un solo dígito: siempre se devuelven dos
+        self.assertEqual(mod97_check_digits('30'), '08')
+        self.assertTrue(is_valid_account_number('3008'))
+
+    def test_rejects_altered_account_number(self):
+        self.assertFalse(is_valid_account_number('79445'))
+        self.assertFalse(is_valid_account_number('74944'))
+        self.assertFalse(is_valid_account_number('10-00000000180'))
+
+    @override_settings(ACCOUNT_NUMBER_PREFIX='10', ACCOUNT_NUMBER_DIGITS=10)
+    def test_format_account_number(self):
+        numero = format_account_number(1)
+        self.assertEqual(numero, '10000000000180')
+        self.assertTrue(is_valid_account_number(numero))
+
+
+class AllocateBlockTests(TestCase):
+    def test_blocks_are_consecutive_and_disjoint(self):
+        first = allocate_block('prueba', 100)
+        second = allocate_block('prueba', 50)
+        self.assertEqual(len(first), 100)
+        self.assertEqual(second.start, first.stop)
+        self.assertEqual(len(second), 50)
+
+    def test_sequences_are_independent(self):
+        allocate_block('prueba', 100)
+        self.assertEqual(allocate_block('otra', 10).start, allocate_block('prueba', 10).start - 100)
+
+
+class MetricsFlushTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = os.path.join(directory.name, 'metricas.sqlite3')
+        # El hilo de volcado también escribe aquí y no en el almacén real
+        self.enterContext(override_settings(METRICS_STORE=self.store))
+        # Lo acumulado por otras pruebas no debe mezclarse con estas
+        for metric in metrics.registry.metrics.values():
+            metric.drain()
+
+    def test_failed_flush_keeps_samples_for_the_next_one(self):
+        metrics.LOGINS.inc('exitoso', amount=3)
+        metrics.HTTP_LATENCY.observe(0.02, 'prueba', 'GET')
+        with override_settings(METRICS_STORE=os.path.join(self.store, 'no-existe', 'x.sqlite3')):
+            with self.assertRaises(sqlite3.Error):
+                metrics.registry.flush()
+
+        metrics.LOGINS.inc('exitoso')
+        metrics.HTTP_LATENCY.observe(0.3, 'prueba', 'GET')
+        totals = metrics.registry.collect()
+
+        self.assertEqual(totals['banco_login_total'][('exitoso',)], {'': 4})
+        latency = totals['banco_http_request_duration_seconds'][('prueba', 'GET')]
+        self.assertEqual(latency['count'], 2)
+        self.assertAlmostEqual(latency['sum'], 0.32)
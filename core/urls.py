@@ -3,4 +3,7 @@ from . import views
 
 urlpatterns = [
     path('', views.home, name='home'),
+    path('dashboard/', views.dashboard, name='dashboard'),
+    path('__profiling__/sql/', views.sql_profile, name='sql_profile'),
+    path('__metrics__/', views.metrics, name='metrics'),
 ]
@@ -1,6 +1,57 @@
-from django.http import HttpResponse
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render
 
+from . import dashboard as dashboard_widgets
+from . import metrics as metrics_registry
+from .profiling import registry
+
 # Create your views here.
 def home(request):
-    return render(request, "core/home.html")
\ No newline at end of file
+    return render(request, "core/home.html")
+
+
+@login_required
+def dashboard(request):
+    """
+    Dashboard con los widgets del rol del usuario, servidos desde la caché
+    """
+    widgets = [
+        {
+            'widget': item,
+            'data': data,
+            'computed_at': datetime.fromtimestamp(computed_at, tz=dt_timezone.utc) if computed_at else None,
+        }
+        for item, data, computed_at in dashboard_widgets.render_data(request.user)
+    ]
+    return render(request, "core/dashboard.html", {'widgets': widgets})
+
+
+@staff_member_required
+def sql_profile(request):
+    """
+    Histogramas de consultas y latencia por vista del proceso actual.
+    Un POST reinicia los contadores.
+    """
+    if not settings.SQL_PROFILING_ENABLED:
+        raise Http404()
+    if request.method == 'POST':
+        registry.reset()
+    return JsonResponse(registry.snapshot(), json_dumps_params={'ensure_ascii': False, 'indent': 2})
+
+
+@staff_member_required
+def metrics(request):
+    """
+    Métricas de todos los workers en el formato de texto de Prometheus
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404()
+    return HttpResponse(
+        metrics_registry.registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -1,3 +1,58 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils.html import format_html
 
-# Register your models here.
+from .models import CreditScore, Loan
+from .scoring import score_clients
+
+
+@admin.register(Loan)
+class LoanAdmin(admin.ModelAdmin):
+    list_display = ('cliente', 'monto', 'tasa_interes', 'plazo_meses', 'saldo_pendiente', 'estado',
+                    'fecha_proximo_vencimiento')
+    list_filter = ('estado',)
+    search_fields = ('cliente__nombres', 'cliente__apellidos', 'cuenta__numero_cuenta')
+    actions = ['score_applicants']
+
+    @admin.action(description='Calcular puntaje de crédito de los solicitantes')
+    def score_applicants(self, request, queryset):
+        client_ids = list(queryset.values_list('cliente_id', flat=True).distinct())
+        report = score_clients(client_ids)
+        self.message_user(
+            request,
+            f"{report.clients} clientes: {report.scored} puntuados, {report.reused} sin cambios desde el último cálculo.",
+            messages.SUCCESS,
+        )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('cliente', 'cuenta')
+
+
+@admin.register(CreditScore)
+class CreditScoreAdmin(admin.ModelAdmin):
+    list_display = ('cliente', 'puntaje', 'decision_badge', 'scorecard', 'fecha_calculo')
+    list_filter = ('decision', 'scorecard')
+    search_fields = ('cliente__nombres', 'cliente__apellidos')
+    ordering = ('-puntaje',)
+    readonly_fields = ('cliente', 'puntaje', 'decision', 'scorecard', 'caracteristicas', 'huella', 'fecha_calculo')
+
+    def decision_badge(self, obj):
+        color_map = {
+            'aprobar': '#198754',
+            'revisar': '#fd7e14',
+            'rechazar': '#dc3545'
+        }
+        color = color_map.get(obj.decision, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; '
+            'border-radius: 3px; font-size: 11px;">{}</span>',
+            color,
+            obj.get_decision_display()
+        )
+
+    decision_badge.short_description = 'Decisión'
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('cliente')
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from core.dashboard import format_money, widget
+from .models import Loan
+
+
+@widget(
+    'cartera_prestamos',
+    'Cartera de préstamos',
+    roles=('administrador', 'ejecutivo_cuentas'),
+    ttl=300,
+    per_user=True,
+    depends_on=('loans.Loan', 'clients.Client'),
+    icon='bi-cash-coin',
+)
+def loan_portfolio(user):
+    cartera = Loan.scoped.for_user(user)
+    resumen = (
+        cartera
+        .values('estado')
+        .annotate(cantidad=Count('id'), saldo=Sum('saldo_pendiente'))
+        .order_by('estado')
+    )
+    hoy = timezone.localdate()
+    por_vencer = cartera.filter(
+        estado__in=[Loan.LoanStatus.VIGENTE, Loan.LoanStatus.EN_MORA],
+        fecha_proximo_vencimiento__range=(hoy, hoy + timedelta(days=7)),
+    ).count()
+    estados = dict(Loan.LoanStatus.choices)
+    return {
+        'stats': [{'label': 'Vencen en 7 días', 'value': por_vencer}],
+        'table': {
+            'headers': ['Estado', 'Préstamos', 'Saldo pendiente'],
+            'rows': [[estados[row['estado']], row['cantidad'], format_money(row['saldo'])] for row in resumen],
+        },
+    }
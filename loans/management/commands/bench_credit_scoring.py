@@ -0,0 +1,142 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Min, Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Account
+from clients.models import Client
+from loans.models import Loan
+from loans.scoring import (
+    ACTIVE_LOANS, DAYS_PER_MONTH, FEATURE_WINDOW_DAYS, FEATURES, FeatureMatrix,
+    as_column, extract_features, get_scorecard, numpy_available,
+)
+from transactions.models import Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el scoring de una solicitud a la vez (consultas ORM por '
+        'característica) con la extracción por conjuntos en columnas, mide la '
+        'evaluación del scorecard con cada motor disponible y verifica que ambas '
+        'extracciones coincidan'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sample', type=int, default=300, help='Clientes puntuados de a uno')
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Filas sintéticas para medir la evaluación')
+        parser.add_argument('--as-of', type=datetime.fromisoformat, help='Fecha de corte (por defecto, ahora)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options['sample'] < 1 or options['rows'] < 1:
+            raise CommandError('--sample y --rows deben ser mayores a cero')
+        as_of = options['as_of'] or timezone.now()
+        if timezone.is_naive(as_of):
+            as_of = timezone.make_aware(as_of)
+        scorecard = get_scorecard()
+        client_ids = list(Client.objects.order_by('pk').values_list('pk', flat=True))
+        if not client_ids:
+            raise CommandError('No hay clientes: generá datos con generate_bank_data')
+        rng = random.Random(options['seed'])
+        sample = rng.sample(client_ids, min(options['sample'], len(client_ids)))
+
+        # Una solicitud a la vez
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            rows = [_client_features(client_id, as_of) for client_id in sample]
+            one_by_one = time.perf_counter() - start
+        self.stdout.write(
+            f"  De a uno:     {len(sample):>7,} clientes en {one_by_one:6.2f} s "
+            f"({len(sample) / one_by_one:>8,.0f} clientes/s, {len(queries) / len(sample):.0f} consultas por cliente)"
+        )
+
+        # Por conjuntos, todos los clientes
+        batch_size = settings.CREDIT_SCORING_BATCH_SIZE
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for offset in range(0, len(client_ids), batch_size):
+                extract_features(client_ids[offset:offset + batch_size], as_of)
+            batched = time.perf_counter() - start
+        self.stdout.write(
+            f"  Por lotes:    {len(client_ids):>7,} clientes en {batched:6.2f} s "
+            f"({len(client_ids) / batched:>8,.0f} clientes/s, {len(queries)} consultas)"
+        )
+
+        matrix = extract_features(sample, as_of)
+        mismatches = sum(
+            1 for index, row in enumerate(rows)
+            if any(abs(row[name] - matrix.columns[name][index]) > 1e-6 for name in FEATURES)
+        )
+        if mismatches:
+            raise CommandError(f"{mismatches} clientes con características distintas entre ambas extracciones")
+
+        # Evaluación del scorecard sobre una matriz grande
+        synthetic = _synthetic_matrix(options['rows'], rng)
+        engines = ['python'] + (['numpy'] if numpy_available() else [])
+        results = {}
+        for engine in engines:
+            start = time.perf_counter()
+            results[engine] = scorecard.score(synthetic, engine=engine)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"  Scorecard {engine:<7} {options['rows']:>9,} filas en {elapsed:6.3f} s "
+                f"({options['rows'] / elapsed:>12,.0f} filas/s)"
+            )
+        if not numpy_available():
+            self.stdout.write("  NumPy no está instalado: se midió solo el motor Python")
+        elif results['numpy'] != results['python']:
+            raise CommandError('Los motores numpy y python no dan los mismos puntajes')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Extracción por lotes {one_by_one / len(sample) * len(client_ids) / batched:,.0f}x más rápida "
+            f"y con las mismas características"
+        ))
+
+
+def _client_features(client_id, as_of):
+    """Características de un cliente con una consulta por característica (línea de base)"""
+    since = as_of - timedelta(days=FEATURE_WINDOW_DAYS)
+    local = settings.DEFAULT_CURRENCY
+    accounts = Account.objects.filter(cliente_id=client_id, fecha_apertura__lt=as_of).exclude(
+        estado=Account.AccountStatus.CERRADA
+    )
+    window = Transaction.objects.filter(
+        fecha__gte=since, fecha__lt=as_of, moneda=local, estado=Transaction.TransactionStatus.COMPLETADA
+    )
+    incoming = window.filter(cuenta_destino__cliente_id=client_id)
+    outgoing = window.filter(cuenta_origen__cliente_id=client_id)
+    loans = Loan.objects.filter(cliente_id=client_id)
+
+    opened = accounts.aggregate(apertura=Min('fecha_apertura'))['apertura']
+    ingresos = float(incoming.aggregate(total=Sum('monto'))['total'] or 0)
+    deuda = float(loans.filter(estado__in=ACTIVE_LOANS).aggregate(total=Sum('saldo_pendiente'))['total'] or 0)
+    monthly_income = ingresos * DAYS_PER_MONTH / FEATURE_WINDOW_DAYS
+    return {
+        'cuentas_activas': accounts.count(),
+        'antiguedad_meses': int((as_of - opened).days / DAYS_PER_MONTH) if opened else 0,
+        'saldo_total': float(accounts.filter(moneda=local).aggregate(total=Sum('saldo'))['total'] or 0),
+        'ingresos_periodo': ingresos,
+        'egresos_periodo': float(outgoing.aggregate(total=Sum('monto'))['total'] or 0),
+        'movimientos_periodo': incoming.count() + outgoing.count(),
+        'prestamos_vigentes': loans.filter(estado__in=ACTIVE_LOANS).count(),
+        'prestamos_en_mora': loans.filter(estado=Loan.LoanStatus.EN_MORA).count(),
+        'prestamos_cancelados': loans.filter(estado=Loan.LoanStatus.CANCELADO).count(),
+        'deuda_pendiente': deuda,
+        'deuda_ingreso_mensual': round(deuda / max(monthly_income, 1.0), 4),
+    }
+
+
+def _synthetic_matrix(rows, rng):
+    scales = {
+        'cuentas_activas': 4, 'antiguedad_meses': 120, 'saldo_total': 2e8, 'ingresos_periodo': 5e7,
+        'egresos_periodo': 5e7, 'movimientos_periodo': 60, 'prestamos_vigentes': 3, 'prestamos_en_mora': 2,
+        'prestamos_cancelados': 4, 'deuda_pendiente': 5e8, 'deuda_ingreso_mensual': 20,
+    }
+    columns = {name: as_column([int(rng.random() * scales[name]) for _ in range(rows)]) for name in FEATURES}
+    return FeatureMatrix(list(range(rows)), columns)
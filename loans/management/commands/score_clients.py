@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from clients.models import Client
+from loans.scoring import get_scorecard, numpy_available, score_clients
+
+
+class Command(BaseCommand):
+    help = (
+        'Calcula el puntaje de crédito de los clientes por lotes. Solo se '
+        'evalúan los clientes cuyas características cambiaron desde el último cálculo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('clients', nargs='*', help='IDs de clientes (por defecto, todos)')
+        parser.add_argument('--as-of', type=datetime.fromisoformat,
+                            help='Fecha AAAA-MM-DD[THH:MM] de corte de las características (por defecto, ahora)')
+        parser.add_argument('--batch-size', type=int, help='Clientes por lote (por defecto CREDIT_SCORING_BATCH_SIZE)')
+        parser.add_argument('--force', action='store_true', help='Recalcular aunque las características no hayan cambiado')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size debe ser mayor a cero')
+        client_ids = options['clients'] or list(Client.objects.order_by('pk').values_list('pk', flat=True))
+        as_of = options['as_of']
+        if as_of is not None and timezone.is_naive(as_of):
+            as_of = timezone.make_aware(as_of)
+
+        scorecard = get_scorecard()
+        self.stdout.write(
+            f"  Scorecard {scorecard.version} con {'NumPy' if numpy_available() else 'Python (sin NumPy)'}"
+        )
+
+        def on_progress(report):
+            self.stdout.write(
+                f"  {report.clients:,}/{len(client_ids):,} clientes: "
+                f"{report.scored:,} puntuados, {report.reused:,} sin cambios"
+            )
+
+        report = score_clients(
+            client_ids, as_of=as_of, force=options['force'],
+            batch_size=options['batch_size'], on_progress=on_progress
+        )
+        for decision, count in sorted(report.decisions.items()):
+            self.stdout.write(f"  {decision:<10} {count:>8,}")
+        self.stdout.write(
+            f"  Extracción {report.extraction:.2f} s, evaluación {report.evaluation:.3f} s, "
+            f"guardado {report.persistence:.2f} s"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {report.clients:,} clientes en {report.elapsed:.2f} s "
+            f"({report.clients / report.elapsed if report.elapsed else 0:,.0f} clientes/s)"
+        ))
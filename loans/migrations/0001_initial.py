@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:27
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('clients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Loan',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Monto')),
+                ('tasa_interes', models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Tasa de Interés Anual (%)')),
+                ('plazo_meses', models.PositiveSmallIntegerField(verbose_name='Plazo (meses)')),
+                ('saldo_pendiente', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='Saldo Pendiente')),
+                ('estado', models.CharField(choices=[('solicitado', 'Solicitado'), ('vigente', 'Vigente'), ('en_mora', 'En Mora'), ('cancelado', 'Cancelado'), ('rechazado', 'Rechazado')], default='solicitado', max_length=20, verbose_name='Estado')),
+                ('fecha_solicitud', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Solicitud')),
+                ('fecha_otorgamiento', models.DateField(blank=True, null=True, verbose_name='Fecha de Otorgamiento')),
+                ('fecha_proximo_vencimiento', models.DateField(blank=True, db_index=True, null=True, verbose_name='Próximo Vencimiento')),
+                ('cliente', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='prestamos', to='clients.client', verbose_name='Cliente')),
+                ('cuenta', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='prestamos', to='accounts.account', verbose_name='Cuenta de Desembolso')),
+            ],
+            options={
+                'verbose_name': 'Préstamo',
+                'verbose_name_plural': 'Préstamos',
+                'db_table': 'prestamos',
+            },
+        ),
+    ]
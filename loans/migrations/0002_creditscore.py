@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_client_ejecutivo'),
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('puntaje', models.SmallIntegerField(verbose_name='Puntaje')),
+                ('decision', models.CharField(choices=[('aprobar', 'Aprobar'), ('revisar', 'Revisar'), ('rechazar', 'Rechazar')], db_index=True, max_length=10, verbose_name='Decisión Sugerida')),
+                ('scorecard', models.CharField(max_length=50, verbose_name='Versión del Scorecard')),
+                ('caracteristicas', models.JSONField(default=dict, verbose_name='Características')),
+                ('huella', models.CharField(max_length=64, verbose_name='Huella de Características')),
+                ('fecha_calculo', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Cálculo')),
+                ('cliente', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='puntaje_credito', to='clients.client', verbose_name='Cliente')),
+            ],
+            options={
+                'verbose_name': 'Puntaje de Crédito',
+                'verbose_name_plural': 'Puntajes de Crédito',
+                'db_table': 'puntajes_credito',
+            },
+        ),
+    ]
@@ -1,3 +1,116 @@
+import uuid
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from users.models import Role
+from users.scoping import ALL, AssignedTo, OwnedBy, ScopedManager
+
+
+class Loan(models.Model):
+    """
+    Modelo de Préstamos otorgados a clientes
+    """
+
+    class LoanStatus(models.TextChoices):
+        SOLICITADO = 'solicitado', 'Solicitado'
+        VIGENTE = 'vigente', 'Vigente'
+        EN_MORA = 'en_mora', 'En Mora'
+        CANCELADO = 'cancelado', 'Cancelado'
+        RECHAZADO = 'rechazado', 'Rechazado'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cliente = models.ForeignKey(
+        'clients.Client',
+        on_delete=models.PROTECT,
+        related_name='prestamos',
+        verbose_name='Cliente'
+    )
+    cuenta = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.PROTECT,
+        related_name='prestamos',
+        verbose_name='Cuenta de Desembolso'
+    )
+    monto = models.DecimalField(max_digits=18, decimal_places=2, verbose_name='Monto')
+    tasa_interes = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        verbose_name='Tasa de Interés Anual (%)'
+    )
+    plazo_meses = models.PositiveSmallIntegerField(verbose_name='Plazo (meses)')
+    saldo_pendiente = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        verbose_name='Saldo Pendiente'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=LoanStatus.choices,
+        default=LoanStatus.SOLICITADO,
+        verbose_name='Estado'
+    )
+    fecha_solicitud = models.DateTimeField(default=timezone.now, verbose_name='Fecha de Solicitud')
+    fecha_otorgamiento = models.DateField(null=True, blank=True, verbose_name='Fecha de Otorgamiento')
+    fecha_proximo_vencimiento = models.DateField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='Próximo Vencimiento'
+    )
+
+    objects = models.Manager()
+    scoped = ScopedManager({
+        Role.RoleType.ADMINISTRADOR: ALL,
+        Role.RoleType.CAJERO: ALL,
+        Role.RoleType.AUDITOR: ALL,
+        Role.RoleType.EJECUTIVO_CUENTAS: AssignedTo('cliente__ejecutivo'),
+        Role.RoleType.CLIENTE: OwnedBy('cliente'),
+    })
+
+    class Meta:
+        verbose_name = 'Préstamo'
+        verbose_name_plural = 'Préstamos'
+        db_table = 'prestamos'
+
+    def __str__(self):
+        return f"{self.cliente} - {self.monto} ({self.get_estado_display()})"
+
+
+class CreditScore(models.Model):
+    """
+    Puntaje de crédito vigente de un cliente. `huella` resume las
+    características y la versión del scorecard con que se calculó: mientras
+    no cambien, el puntaje se reutiliza sin volver a evaluarlo.
+    """
+
+    class Decision(models.TextChoices):
+        APROBAR = 'aprobar', 'Aprobar'
+        REVISAR = 'revisar', 'Revisar'
+        RECHAZAR = 'rechazar', 'Rechazar'
+
+    cliente = models.OneToOneField(
+        'clients.Client',
+        on_delete=models.CASCADE,
+        related_name='puntaje_credito',
+        verbose_name='Cliente'
+    )
+    puntaje = models.SmallIntegerField(verbose_name='Puntaje')
+    decision = models.CharField(
+        max_length=10,
+        choices=Decision.choices,
+        db_index=True,
+        verbose_name='Decisión Sugerida'
+    )
+    scorecard = models.CharField(max_length=50, verbose_name='Versión del Scorecard')
+    caracteristicas = models.JSONField(default=dict, verbose_name='Características')
+    huella = models.CharField(max_length=64, verbose_name='Huella de Características')
+    fecha_calculo = models.DateTimeField(default=timezone.now, verbose_name='Fecha de Cálculo')
+
+    class Meta:
+        verbose_name = 'Puntaje de Crédito'
+        verbose_name_plural = 'Puntajes de Crédito'
+        db_table = 'puntajes_credito'
+
+    def __str__(self):
+        return f"{self.cliente} - {self.puntaje} ({self.get_decision_display()})"
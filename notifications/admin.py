@@ -0,0 +1,47 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.html import format_html
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('destinatario', 'tipo', 'estado_badge', 'intentos', 'proximo_intento', 'fecha_creacion',
+                    'fecha_envio')
+    list_filter = ('estado', 'tipo')
+    search_fields = ('destinatario', 'asunto')
+    ordering = ('-fecha_creacion',)
+    readonly_fields = (
+        'tipo', 'destinatario', 'asunto', 'cuerpo', 'clave_deduplicacion', 'estado', 'intentos',
+        'proximo_intento', 'lote', 'ultimo_error', 'fecha_creacion', 'fecha_envio'
+    )
+    actions = ['reintentar']
+
+    def estado_badge(self, obj):
+        color_map = {
+            'pendiente': '#fd7e14',
+            'enviada': '#198754',
+            'fallida': '#dc3545'
+        }
+        color = color_map.get(obj.estado, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; '
+            'border-radius: 3px; font-size: 11px;">{}</span>',
+            color,
+            obj.get_estado_display()
+        )
+
+    estado_badge.short_description = 'Estado'
+
+    @admin.action(description='Reintentar ahora las notificaciones seleccionadas')
+    def reintentar(self, request, queryset):
+        updated = queryset.exclude(estado=Notification.NotificationStatus.ENVIADA).update(
+            estado=Notification.NotificationStatus.PENDIENTE,
+            intentos=0,
+            proximo_intento=timezone.now(),
+            lote=None,
+        )
+        self.message_user(request, f"{updated} notificaciones vuelven a la cola")
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,142 @@
+"""
+Despacho por lotes del outbox de notificaciones.
+
+- Cada lote se reclama con un UPDATE que asigna un id de lote y corre
+  `proximo_intento` hacia adelante (lease): dos despachadores nunca toman la
+  misma notificación y, si uno muere, sus notificaciones vuelven a quedar
+  disponibles al vencer el lease.
+- Todo el lote se envía por la misma conexión de correo.
+- Los fallos se reintentan con espera exponencial con jitter hasta
+  NOTIFICATION_MAX_ATTEMPTS; después quedan como fallidas.
+
+La entrega es al menos una vez: un corte entre el envío y la marca de enviada
+repite el correo. El encabezado X-Notificacion-Id permite deduplicar.
+"""
+import logging
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification
+
+logger = logging.getLogger('banco.notifications')
+
+
+@dataclass
+class DispatchResult:
+    """
+    Resultado de un lote: enviadas, a reintentar y descartadas
+    """
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def claimed(self):
+        return self.sent + self.retried + self.failed
+
+
+def claim_batch(batch_size=None):
+    """Reclama hasta `batch_size` notificaciones vencidas y las retorna"""
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    now = timezone.now()
+    due = Notification.objects.filter(
+        estado=Notification.NotificationStatus.PENDIENTE,
+        proximo_intento__lte=now,
+    )
+    ids = list(due.order_by('proximo_intento').values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return []
+
+    # Repetir el filtro en el UPDATE descarta las que otro despachador ya reclamó
+    lote = uuid.uuid4()
+    due.filter(pk__in=ids).update(
+        lote=lote,
+        proximo_intento=now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS),
+    )
+    return list(Notification.objects.filter(lote=lote).order_by('proximo_intento'))
+
+
+def dispatch_batch(connection, batch_size=None):
+    """
+    Envía un lote por `connection` (backend de correo abierto por el llamador)
+    y registra el resultado de cada notificación
+    """
+    notifications = claim_batch(batch_size)
+    result = DispatchResult()
+    if not notifications:
+        return result
+
+    sent = []
+    failed = []
+    for notification in notifications:
+        message = EmailMessage(
+            subject=notification.asunto,
+            body=notification.cuerpo,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[notification.destinatario],
+            headers={'X-Notificacion-Id': str(notification.pk)},
+            connection=connection,
+        )
+        try:
+            # open() no hace nada si la conexión sigue abierta
+            connection.open()
+            connection.send_messages([message])
+        except Exception as exc:
+            notification.ultimo_error = f'{type(exc).__name__}: {exc}'[:1000]
+            failed.append(notification)
+            # La conexión puede haber quedado inutilizable: se reabre en el próximo envío
+            _close_quietly(connection)
+        else:
+            sent.append(notification.pk)
+
+    now = timezone.now()
+    if sent:
+        Notification.objects.filter(pk__in=sent).update(
+            estado=Notification.NotificationStatus.ENVIADA,
+            fecha_envio=now,
+            intentos=F('intentos') + 1,
+            lote=None,
+            ultimo_error='',
+        )
+        result.sent = len(sent)
+
+    for notification in failed:
+        notification.intentos += 1
+        notification.lote = None
+        if notification.intentos >= settings.NOTIFICATION_MAX_ATTEMPTS:
+            notification.estado = Notification.NotificationStatus.FALLIDA
+            result.failed += 1
+            logger.error("Notificación %s descartada tras %s intentos: %s",
+                         notification.pk, notification.intentos, notification.ultimo_error)
+        else:
+            notification.proximo_intento = now + timedelta(seconds=retry_delay(notification.intentos))
+            result.retried += 1
+    if failed:
+        Notification.objects.bulk_update(
+            failed, ['intentos', 'lote', 'estado', 'proximo_intento', 'ultimo_error']
+        )
+
+    return result
+
+
+def retry_delay(attempts):
+    """Segundos hasta el próximo intento: exponencial, acotado y con jitter"""
+    delay = min(
+        settings.NOTIFICATION_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+        settings.NOTIFICATION_RETRY_MAX_DELAY,
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
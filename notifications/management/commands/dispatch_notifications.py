@@ -0,0 +1,57 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.dispatcher import dispatch_batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Envía las notificaciones pendientes del outbox por lotes, reutilizando '
+        'la conexión de correo. Sin --once queda procesando hasta interrumpirlo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Vaciar el outbox una vez y terminar')
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_BATCH_SIZE)
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.NOTIFICATION_POLL_INTERVAL,
+            help='Segundos de espera cuando no hay notificaciones pendientes'
+        )
+
+    def handle(self, *args, **options):
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        start = time.perf_counter()
+        connection = get_connection()
+        try:
+            while True:
+                result = dispatch_batch(connection, batch_size=options['batch_size'])
+                totals['sent'] += result.sent
+                totals['retried'] += result.retried
+                totals['failed'] += result.failed
+                if result.claimed:
+                    self.stdout.write(
+                        f"  lote: {result.sent} enviadas, {result.retried} a reintentar, "
+                        f"{result.failed} descartadas"
+                    )
+                    continue
+                if options['once']:
+                    break
+                connection.close()
+                close_old_connections()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {totals['sent']} enviadas, {totals['retried']} a reintentar, "
+            f"{totals['failed']} descartadas en {elapsed:.1f} s"
+        ))
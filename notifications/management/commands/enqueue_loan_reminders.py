@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from loans.models import Loan
+from notifications.models import Notification
+from notifications.outbox import enqueue, loan_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        'Encola recordatorios para los préstamos que vencen en los próximos días. '
+        'Puede ejecutarse varias veces al día: cada cuota se avisa una sola vez.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.LOAN_REMINDER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        hoy = timezone.localdate()
+        loans = (
+            Loan.objects
+            .filter(
+                estado__in=[Loan.LoanStatus.VIGENTE, Loan.LoanStatus.EN_MORA],
+                fecha_proximo_vencimiento__range=(hoy, hoy + timedelta(days=options['days'])),
+            )
+            .select_related('cliente', 'cuenta')
+            .order_by('pk')
+        )
+
+        total = 0
+        batch = []
+        for loan in loans.iterator(chunk_size=options['batch_size']):
+            batch.append(loan)
+            if len(batch) >= options['batch_size']:
+                total += self._enqueue(batch)
+                batch = []
+        if batch:
+            total += self._enqueue(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"✓ {total} recordatorios de vencimiento encolados"))
+
+    def _enqueue(self, loans):
+        """Encola los recordatorios del lote y retorna cuántos se insertaron de verdad"""
+        with transaction.atomic():
+            notifications = enqueue(loan_reminders(loans))
+            # Los ya avisados se descartan por su clave y conservan un id que no llegó a guardarse
+            return Notification.objects.filter(pk__in=[notification.pk for notification in notifications]).count()
@@ -0,0 +1,65 @@
+import uuid
+from django.db import models
+from django.utils import timezone
+
+
+class Notification(models.Model):
+    """
+    Modelo de Notificaciones por correo (outbox transaccional).
+    Se escribe en la misma transacción que el evento que la origina y un
+    proceso aparte la envía, por lo que el SMTP no agrega latencia a la solicitud.
+    """
+
+    class NotificationType(models.TextChoices):
+        COMPROBANTE_TRANSFERENCIA = 'comprobante_transferencia', 'Comprobante de Transferencia'
+        ALERTA_BLOQUEO = 'alerta_bloqueo', 'Alerta de Bloqueo'
+        RECORDATORIO_VENCIMIENTO = 'recordatorio_vencimiento', 'Recordatorio de Vencimiento'
+
+    class NotificationStatus(models.TextChoices):
+        PENDIENTE = 'pendiente', 'Pendiente'
+        ENVIADA = 'enviada', 'Enviada'
+        FALLIDA = 'fallida', 'Fallida'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tipo = models.CharField(
+        max_length=30,
+        choices=NotificationType.choices,
+        verbose_name='Tipo'
+    )
+    destinatario = models.EmailField(verbose_name='Destinatario')
+    asunto = models.CharField(max_length=255, verbose_name='Asunto')
+    cuerpo = models.TextField(verbose_name='Cuerpo')
+    # Evita encolar dos veces el mismo aviso (p. ej. un recordatorio por vencimiento)
+    clave_deduplicacion = models.CharField(
+        max_length=150,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='Clave de Deduplicación'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=NotificationStatus.choices,
+        default=NotificationStatus.PENDIENTE,
+        verbose_name='Estado'
+    )
+    intentos = models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')
+    proximo_intento = models.DateTimeField(default=timezone.now, verbose_name='Próximo Intento')
+    # Lote del despachador que reclamó la notificación; vence con proximo_intento
+    lote = models.UUIDField(null=True, blank=True, editable=False, verbose_name='Lote')
+    ultimo_error = models.TextField(blank=True, verbose_name='Último Error')
+    fecha_creacion = models.DateTimeField(default=timezone.now, verbose_name='Fecha de Creación')
+    fecha_envio = models.DateTimeField(null=True, blank=True, verbose_name='Fecha de Envío')
+
+    class Meta:
+        verbose_name = 'Notificación'
+        verbose_name_plural = 'Notificaciones'
+        db_table = 'notificaciones'
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'proximo_intento'], name='notif_pendientes_idx'),
+            models.Index(fields=['lote'], name='notif_lote_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} a {self.destinatario} ({self.get_estado_display()})"
@@ -0,0 +1,103 @@
+"""
+Escritura de notificaciones en el outbox.
+
+Las funciones de este módulo deben llamarse dentro del `transaction.atomic()`
+del evento de negocio: la notificación se confirma junto con el evento o se
+descarta con él. El envío lo hace `dispatcher.dispatch_batch()`.
+"""
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from users.models import SystemUser
+from .models import Notification
+
+SUBJECTS = {
+    Notification.NotificationType.COMPROBANTE_TRANSFERENCIA: 'Comprobante de transferencia',
+    Notification.NotificationType.ALERTA_BLOQUEO: 'Alerta de seguridad: usuario bloqueado',
+    Notification.NotificationType.RECORDATORIO_VENCIMIENTO: 'Recordatorio de vencimiento de préstamo',
+}
+
+
+def build(tipo, destinatario, context, clave=None):
+    """Notificación sin guardar con el cuerpo ya renderizado"""
+    return Notification(
+        tipo=tipo,
+        destinatario=destinatario,
+        asunto=SUBJECTS[tipo],
+        cuerpo=render_to_string(f'notifications/{tipo}.txt', context),
+        clave_deduplicacion=clave,
+    )
+
+
+def enqueue(notifications):
+    """
+    Guarda notificaciones en el outbox con un solo INSERT.
+    Las que repiten una clave de deduplicación se ignoran.
+    """
+    if notifications:
+        Notification.objects.bulk_create(notifications, ignore_conflicts=True)
+    return notifications
+
+
+def transfer_receipts(movements):
+    """
+    Comprobantes para los usuarios de los clientes de ambas cuentas de cada
+    transferencia. Resuelve los destinatarios con una sola consulta.
+    """
+    recipients = _recipients_by_client({
+        cuenta.cliente_id
+        for movement in movements
+        for cuenta in (movement.cuenta_origen, movement.cuenta_destino)
+    })
+    notifications = []
+    for movement in movements:
+        for cuenta, enviada in ((movement.cuenta_origen, True), (movement.cuenta_destino, False)):
+            for _, email in recipients.get(cuenta.cliente_id, ()):
+                notifications.append(build(
+                    Notification.NotificationType.COMPROBANTE_TRANSFERENCIA,
+                    email,
+                    {'movimiento': movement, 'cuenta': cuenta, 'enviada': enviada},
+                ))
+    return notifications
+
+
+def lockout_alert(user):
+    """Aviso al usuario de que su acceso fue bloqueado por intentos fallidos"""
+    if not user.email:
+        return []
+    return [build(
+        Notification.NotificationType.ALERTA_BLOQUEO,
+        user.email,
+        {'usuario': user, 'fecha': timezone.now()},
+    )]
+
+
+def loan_reminders(loans):
+    """
+    Recordatorios para los préstamos dados (con `cliente` y `cuenta` cargados).
+    La clave incluye la fecha de vencimiento: un aviso por cuota y destinatario.
+    """
+    recipients = _recipients_by_client({loan.cliente_id for loan in loans})
+    return [
+        build(
+            Notification.NotificationType.RECORDATORIO_VENCIMIENTO,
+            email,
+            {'prestamo': loan},
+            clave=f'vencimiento:{loan.pk}:{loan.fecha_proximo_vencimiento}:{user_id}',
+        )
+        for loan in loans
+        for user_id, email in recipients.get(loan.cliente_id, ())
+    ]
+
+
+def _recipients_by_client(cliente_ids):
+    """Usuarios activos con correo de cada cliente: {cliente_id: [(id, email)]}"""
+    recipients = {}
+    for cliente_id, user_id, email in (
+        SystemUser.objects
+        .filter(cliente_id__in=cliente_ids, estado=SystemUser.UserStatus.ACTIVO)
+        .exclude(email='')
+        .values_list('cliente_id', 'pk', 'email')
+    ):
+        recipients.setdefault(cliente_id, []).append((user_id, email))
+    return recipients
@@ -0,0 +1,168 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Account
+from clients.models import Client
+from loans.models import Loan
+from users.models import Role, SystemUser
+
+from .dispatcher import claim_batch, dispatch_batch, retry_delay
+from .models import Notification
+from .outbox import build, enqueue
+
+
+def pending(destinatario='ana@example.com', **fields):
+    return build(
+        Notification.NotificationType.ALERTA_BLOQUEO,
+        destinatario,
+        {'usuario': 'ana', 'fecha': timezone.now()},
+        **fields,
+    )
+
+
+class RejectingBackend(EmailBackend):
+    """Backend en memoria que rechaza los envíos a ciertos destinatarios"""
+
+    def __init__(self, rejected=(), **kwargs):
+        super().__init__(**kwargs)
+        self.rejected = set(rejected)
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.rejected.intersection(message.to):
+                raise ConnectionError('buzón no disponible')
+        return super().send_messages(messages)
+
+
+class ClaimBatchTests(TestCase):
+    def test_claims_due_notifications_under_a_lease(self):
+        enqueue([pending(), pending('beto@example.com')])
+        claimed = claim_batch()
+
+        self.assertEqual(len(claimed), 2)
+        self.assertEqual(len({notification.lote for notification in claimed}), 1)
+        lease = timezone.now() + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+        for notification in claimed:
+            self.assertAlmostEqual(notification.proximo_intento, lease, delta=timedelta(seconds=5))
+        # Mientras dura el lease ningún otro despachador las toma
+        self.assertEqual(claim_batch(), [])
+
+    def test_expired_lease_returns_notifications_to_the_queue(self):
+        enqueue([pending()])
+        first = claim_batch()[0]
+        # El despachador murió sin confirmar: el lease vence
+        Notification.objects.filter(pk=first.pk).update(proximo_intento=timezone.now() - timedelta(seconds=1))
+
+        second = claim_batch()
+        self.assertEqual([notification.pk for notification in second], [first.pk])
+        self.assertNotEqual(second[0].lote, first.lote)
+
+    def test_respects_batch_size_and_schedule(self):
+        enqueue([pending(f'cliente{i}@example.com') for i in range(3)])
+        later = pending('despues@example.com')
+        later.proximo_intento = timezone.now() + timedelta(hours=1)
+        enqueue([later])
+
+        self.assertEqual(len(claim_batch(batch_size=2)), 2)
+        self.assertEqual(len(claim_batch(batch_size=2)), 1)
+        self.assertEqual(claim_batch(batch_size=2), [])
+
+
+class DispatchBatchTests(TestCase):
+    def test_sends_batch_over_one_connection(self):
+        enqueue([pending(), pending('beto@example.com')])
+        result = dispatch_batch(get_connection())
+
+        self.assertEqual((result.sent, result.retried, result.failed), (2, 0, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        sent = Notification.objects.filter(estado=Notification.NotificationStatus.ENVIADA)
+        self.assertEqual(sent.count(), 2)
+        self.assertEqual(
+            {message.extra_headers['X-Notificacion-Id'] for message in mail.outbox},
+            {str(pk) for pk in sent.values_list('pk', flat=True)},
+        )
+        self.assertFalse(sent.exclude(lote=None).exists())
+
+    def test_failures_are_rescheduled_with_backoff(self):
+        enqueue([pending(), pending('caido@example.com')])
+        before = timezone.now()
+        result = dispatch_batch(RejectingBackend(rejected={'caido@example.com'}))
+
+        self.assertEqual((result.sent, result.retried, result.failed), (1, 1, 0))
+        failed = Notification.objects.get(destinatario='caido@example.com')
+        self.assertEqual(failed.estado, Notification.NotificationStatus.PENDIENTE)
+        self.assertEqual(failed.intentos, 1)
+        self.assertIsNone(failed.lote)
+        self.assertIn('ConnectionError', failed.ultimo_error)
+        delay = (failed.proximo_intento - before).total_seconds()
+        self.assertGreaterEqual(delay, settings.NOTIFICATION_RETRY_BASE_DELAY * 0.5)
+        self.assertLessEqual(delay, settings.NOTIFICATION_RETRY_BASE_DELAY + 5)
+        # Hasta que vence la espera no se vuelve a intentar
+        self.assertEqual(dispatch_batch(get_connection()).claimed, 0)
+
+    @override_settings(NOTIFICATION_MAX_ATTEMPTS=2)
+    def test_gives_up_after_max_attempts(self):
+        enqueue([pending('caido@example.com')])
+        backend = RejectingBackend(rejected={'caido@example.com'})
+
+        self.assertEqual(dispatch_batch(backend).retried, 1)
+        Notification.objects.update(proximo_intento=timezone.now())
+        with self.assertLogs('banco.notifications', level='ERROR'):
+            self.assertEqual(dispatch_batch(backend).failed, 1)
+
+        notification = Notification.objects.get()
+        self.assertEqual((notification.estado, notification.intentos), (Notification.NotificationStatus.FALLIDA, 2))
+        self.assertEqual(claim_batch(), [])
+
+    @override_settings(NOTIFICATION_RETRY_BASE_DELAY=30, NOTIFICATION_RETRY_MAX_DELAY=3600)
+    def test_retry_delay_is_exponential_and_capped(self):
+        for attempts, ceiling in [(1, 30), (2, 60), (5, 480), (20, 3600)]:
+            with self.subTest(attempts=attempts):
+                delay = retry_delay(attempts)
+                self.assertGreaterEqual(delay, ceiling * 0.5)
+                self.assertLessEqual(delay, ceiling)
+
+
+class LoanRemindersTests(TestCase):
+    def setUp(self):
+        cliente = Client.objects.create(nombres='Ana', apellidos='Benítez')
+        role, _ = Role.objects.get_or_create(nombre=Role.RoleType.CLIENTE)
+        SystemUser.objects.create_user('ana', 'clave-segura', cliente=cliente, role=role, email='ana@example.com')
+        cuenta = Account.objects.create(cliente=cliente)
+        Loan.objects.create(
+            cliente=cliente,
+            cuenta=cuenta,
+            monto=Decimal(1000000),
+            tasa_interes=Decimal(12),
+            plazo_meses=12,
+            saldo_pendiente=Decimal(1000000),
+            estado=Loan.LoanStatus.VIGENTE,
+            fecha_proximo_vencimiento=timezone.localdate() + timedelta(days=1),
+        )
+
+    def enqueue_reminders(self):
+        out = StringIO()
+        call_command('enqueue_loan_reminders', stdout=out)
+        return out.getvalue()
+
+    def test_each_installment_is_reminded_once(self):
+        self.assertIn('✓ 1 recordatorios', self.enqueue_reminders())
+        # Una segunda corrida el mismo día no encola ni cuenta duplicados
+        self.assertIn('✓ 0 recordatorios', self.enqueue_reminders())
+        self.assertEqual(
+            Notification.objects.filter(tipo=Notification.NotificationType.RECORDATORIO_VENCIMIENTO).count(), 1
+        )
+
+    def test_duplicate_keys_are_ignored(self):
+        enqueue([pending(clave='aviso:1')])
+        enqueue([pending(clave='aviso:1'), pending(clave='aviso:2')])
+        self.assertEqual(Notification.objects.count(), 2)
@@ -1,3 +1,51 @@
 from django.contrib import admin
+from django.utils.html import format_html
+from .models import Statement, StatementRun
 
-# Register your models here.
+
+@admin.register(Statement)
+class StatementAdmin(admin.ModelAdmin):
+    list_display = ('cuenta', 'periodo', 'saldo_inicial', 'saldo_final', 'movimientos', 'fecha_generacion')
+    list_filter = ('periodo',)
+    search_fields = ('cuenta__numero_cuenta',)
+    ordering = ('-periodo',)
+    readonly_fields = (
+        'cuenta', 'periodo', 'huella', 'saldo_inicial', 'saldo_final', 'movimientos',
+        'archivo_html', 'archivo_pdf', 'fecha_generacion'
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('cuenta')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(StatementRun)
+class StatementRunAdmin(admin.ModelAdmin):
+    list_display = ('periodo', 'estado_badge', 'generados', 'reutilizados', 'errores', 'fecha_inicio', 'fecha_fin')
+    list_filter = ('estado',)
+    ordering = ('-fecha_inicio',)
+    readonly_fields = (
+        'periodo', 'estado', 'cursor', 'generados', 'reutilizados', 'errores', 'ultimo_error',
+        'fecha_inicio', 'fecha_fin'
+    )
+
+    def estado_badge(self, obj):
+        color_map = {
+            'en_curso': '#0d6efd',
+            'completada': '#198754',
+            'fallida': '#dc3545'
+        }
+        color = color_map.get(obj.estado, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; '
+            'border-radius: 3px; font-size: 11px;">{}</span>',
+            color,
+            obj.get_estado_display()
+        )
+
+    estado_badge.short_description = 'Estado'
+
+    def has_add_permission(self, request):
+        return False
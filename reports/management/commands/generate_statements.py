@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.periods import first_of_month, parse_month
+from reports.statements import generate_statements
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera los extractos mensuales de todas las cuentas (HTML y opcionalmente PDF) '
+        'en un pool de procesos, reutilizando los que no cambiaron'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', type=parse_month, help='Mes AAAA-MM (por defecto, el mes anterior)')
+        parser.add_argument('--workers', type=int, default=1, help='Procesos de renderizado')
+        parser.add_argument('--group-size', type=int, default=settings.STATEMENT_GROUP_SIZE,
+                            help='Cuentas por grupo de carga')
+        parser.add_argument('--pdf', action='store_true', help='Generar también PDF (requiere weasyprint)')
+        parser.add_argument('--resume', action='store_true',
+                            help='Retomar la última corrida interrumpida o fallida del período')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['group_size'] < 1:
+            raise CommandError('--workers y --group-size deben ser mayores a cero')
+        periodo = options['period'] or first_of_month(first_of_month(timezone.localdate()) - timedelta(days=1))
+
+        def on_progress(report):
+            self.stdout.write(
+                f"  {report.groups} grupos, {report.accounts:,} cuentas "
+                f"({report.rendered:,} generadas, {report.cached:,} reutilizadas) "
+                f"{report.throughput:,.0f} cuentas/s"
+            )
+
+        try:
+            report = generate_statements(
+                periodo,
+                workers=options['workers'],
+                group_size=options['group_size'],
+                pdf=options['pdf'],
+                resume=options['resume'],
+                on_progress=on_progress,
+            )
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+
+        for error in report.errors:
+            self.stderr.write(f"  ✗ {error}")
+        summary = (
+            f"{periodo:%m/%Y}: {report.accounts:,} extractos en {report.elapsed:.1f} s "
+            f"({report.throughput:,.0f} cuentas/s) — {report.rendered:,} generados, "
+            f"{report.cached:,} reutilizados"
+        )
+        if report.failed_groups:
+            raise CommandError(f"{summary}; {report.failed_groups} grupos fallaron, reintentar con --resume")
+        self.stdout.write(self.style.SUCCESS(f"✓ {summary}"))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:46
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatementRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('periodo', models.DateField(verbose_name='Período')),
+                ('estado', models.CharField(choices=[('en_curso', 'En Curso'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='en_curso', max_length=20, verbose_name='Estado')),
+                ('cursor', models.UUIDField(blank=True, null=True, verbose_name='Última Cuenta Completada')),
+                ('generados', models.PositiveIntegerField(default=0, verbose_name='Generados')),
+                ('reutilizados', models.PositiveIntegerField(default=0, verbose_name='Reutilizados')),
+                ('errores', models.PositiveIntegerField(default=0, verbose_name='Errores')),
+                ('ultimo_error', models.TextField(blank=True, verbose_name='Último Error')),
+                ('fecha_inicio', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Inicio')),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Fin')),
+            ],
+            options={
+                'verbose_name': 'Corrida de Extractos',
+                'verbose_name_plural': 'Corridas de Extractos',
+                'db_table': 'corridas_extractos',
+                'ordering': ['-fecha_inicio'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Statement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('periodo', models.DateField(verbose_name='Período')),
+                ('huella', models.CharField(max_length=64, verbose_name='Huella del Contenido')),
+                ('saldo_inicial', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Saldo Inicial')),
+                ('saldo_final', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Saldo Final')),
+                ('movimientos', models.PositiveIntegerField(default=0, verbose_name='Movimientos')),
+                ('archivo_html', models.CharField(max_length=255, verbose_name='Archivo HTML')),
+                ('archivo_pdf', models.CharField(blank=True, max_length=255, verbose_name='Archivo PDF')),
+                ('fecha_generacion', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Generación')),
+                ('cuenta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='extractos', to='accounts.account', verbose_name='Cuenta')),
+            ],
+            options={
+                'verbose_name': 'Extracto',
+                'verbose_name_plural': 'Extractos',
+                'db_table': 'extractos',
+                'ordering': ['-periodo'],
+                'constraints': [models.UniqueConstraint(fields=('cuenta', 'periodo'), name='extracto_cuenta_periodo_uniq')],
+            },
+        ),
+    ]
@@ -1,3 +1,76 @@
+import uuid
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class Statement(models.Model):
+    """
+    Modelo de Extractos mensuales de cuenta.
+    `huella` es el hash del contenido: si los datos del período no cambian,
+    el documento ya generado se reutiliza.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cuenta = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.CASCADE,
+        related_name='extractos',
+        verbose_name='Cuenta'
+    )
+    periodo = models.DateField(verbose_name='Período')
+    huella = models.CharField(max_length=64, verbose_name='Huella del Contenido')
+    saldo_inicial = models.DecimalField(max_digits=18, decimal_places=2, verbose_name='Saldo Inicial')
+    saldo_final = models.DecimalField(max_digits=18, decimal_places=2, verbose_name='Saldo Final')
+    movimientos = models.PositiveIntegerField(default=0, verbose_name='Movimientos')
+    archivo_html = models.CharField(max_length=255, verbose_name='Archivo HTML')
+    archivo_pdf = models.CharField(max_length=255, blank=True, verbose_name='Archivo PDF')
+    fecha_generacion = models.DateTimeField(default=timezone.now, verbose_name='Fecha de Generación')
+
+    class Meta:
+        verbose_name = 'Extracto'
+        verbose_name_plural = 'Extractos'
+        db_table = 'extractos'
+        ordering = ['-periodo']
+        constraints = [
+            models.UniqueConstraint(fields=['cuenta', 'periodo'], name='extracto_cuenta_periodo_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.cuenta} - {self.periodo:%m/%Y}"
+
+
+class StatementRun(models.Model):
+    """
+    Corrida de generación de extractos de un período.
+    `cursor` es la última cuenta hasta la cual todos los grupos terminaron:
+    una corrida interrumpida se retoma desde ahí.
+    """
+
+    class RunStatus(models.TextChoices):
+        EN_CURSO = 'en_curso', 'En Curso'
+        COMPLETADA = 'completada', 'Completada'
+        FALLIDA = 'fallida', 'Fallida'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    periodo = models.DateField(verbose_name='Período')
+    estado = models.CharField(
+        max_length=20,
+        choices=RunStatus.choices,
+        default=RunStatus.EN_CURSO,
+        verbose_name='Estado'
+    )
+    cursor = models.UUIDField(null=True, blank=True, verbose_name='Última Cuenta Completada')
+    generados = models.PositiveIntegerField(default=0, verbose_name='Generados')
+    reutilizados = models.PositiveIntegerField(default=0, verbose_name='Reutilizados')
+    errores = models.PositiveIntegerField(default=0, verbose_name='Errores')
+    ultimo_error = models.TextField(blank=True, verbose_name='Último Error')
+    fecha_inicio = models.DateTimeField(default=timezone.now, verbose_name='Fecha de Inicio')
+    fecha_fin = models.DateTimeField(null=True, blank=True, verbose_name='Fecha de Fin')
+
+    class Meta:
+        verbose_name = 'Corrida de Extractos'
+        verbose_name_plural = 'Corridas de Extractos'
+        db_table = 'corridas_extractos'
+        ordering = ['-fecha_inicio']
+
+    def __str__(self):
+        return f"{self.periodo:%m/%Y} ({self.get_estado_display()})"
@@ -0,0 +1,410 @@
+"""
+Generación de extractos mensuales de cuenta.
+
+- Las cuentas se procesan en grupos de STATEMENT_GROUP_SIZE: cada grupo carga
+  cuentas, clientes, movimientos y saldos con una consulta por tipo de dato,
+  nunca una por cuenta.
+- Los grupos se reparten entre un pool de procesos.
+- Cada documento se guarda bajo el hash de su contenido (datos del período y
+  plantilla): si ya existe un archivo con esa huella no se vuelve a renderizar.
+- La corrida (StatementRun) guarda un cursor con la última cuenta hasta la que
+  todos los grupos terminaron; `resume=True` retoma una corrida interrumpida
+  o fallida desde ese punto.
+
+Si el mes está archivado, la corrida lo descomprime una sola vez y guarda sus
+movimientos indexados por cuenta en un SQLite temporal; cada grupo consulta
+ahí solo sus cuentas, sin retener el mes en la memoria de los procesos.
+
+El PDF es opcional y usa WeasyPrint (motor local, sin servicios externos).
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache, partial
+from multiprocessing import get_context
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import Sum
+from django.template.loader import get_template
+from django.utils import timezone
+
+from accounts.models import Account
+from core import archive
+from core.models import ArchivePartition
+from core.periods import first_of_month, month_bounds
+from core.startup import optional_import
+from transactions.models import Transaction
+from .models import Statement, StatementRun
+
+TEMPLATE_NAME = 'reports/statement.html'
+CENTAVOS = Decimal('0.01')
+
+
+@dataclass
+class GroupResult:
+    """
+    Resultado de un grupo de cuentas
+    """
+    last_pk: object = None
+    rendered: int = 0
+    cached: int = 0
+    error: str = ''
+
+
+@dataclass
+class RunReport:
+    """
+    Totales de una corrida, para informar throughput
+    """
+    run: StatementRun
+    accounts: int = 0
+    groups: int = 0
+    rendered: int = 0
+    cached: int = 0
+    failed_groups: int = 0
+    elapsed: float = 0.0
+    errors: list = field(default_factory=list)
+
+    @property
+    def throughput(self):
+        return self.accounts / self.elapsed if self.elapsed else 0
+
+
+def _weasyprint():
+    # WeasyPrint es opcional y se importa al primer PDF: sin él solo se generan extractos HTML
+    return optional_import('weasyprint')
+
+
+def pdf_available():
+    return _weasyprint() is not None
+
+
+def generate_statements(periodo, workers=1, group_size=None, pdf=False, resume=False, on_progress=None):
+    """
+    Genera los extractos del mes de `periodo` para todas las cuentas abiertas
+    antes del fin del mes. `on_progress(report)` se llama tras cada grupo.
+    Retorna un RunReport.
+    """
+    if pdf and not pdf_available():
+        raise ImproperlyConfigured('Para generar PDF se necesita el paquete opcional weasyprint')
+    periodo = first_of_month(periodo)
+    group_size = group_size or settings.STATEMENT_GROUP_SIZE
+    _, end = month_bounds(periodo)
+
+    run = None
+    if resume:
+        run = (
+            StatementRun.objects
+            .filter(periodo=periodo)
+            .exclude(estado=StatementRun.RunStatus.COMPLETADA)
+            .order_by('-fecha_inicio')
+            .first()
+        )
+    if run is None:
+        run = StatementRun.objects.create(periodo=periodo)
+    else:
+        run.estado = StatementRun.RunStatus.EN_CURSO
+        run.fecha_fin = None
+        run.save(update_fields=['estado', 'fecha_fin'])
+
+    accounts = Account.objects.filter(fecha_apertura__lt=end).order_by('pk')
+    if run.cursor is not None:
+        accounts = accounts.filter(pk__gt=run.cursor)
+    ids = list(accounts.values_list('pk', flat=True))
+    groups = [ids[i:i + group_size] for i in range(0, len(ids), group_size)]
+
+    report = RunReport(run=run)
+    # En disco junto a los extractos y no en /tmp, que puede estar en memoria
+    Path(settings.STATEMENTS_ROOT).mkdir(parents=True, exist_ok=True)
+    index_dir = tempfile.TemporaryDirectory(prefix='.indice-', dir=settings.STATEMENTS_ROOT)
+    archived_index = _index_archived_month(periodo, Path(index_dir.name) / 'movimientos.sqlite3') if ids else None
+    task = partial(render_group, periodo, pdf, archived_index=archived_index)
+    start = time.perf_counter()
+    contiguous = True
+
+    def record(result):
+        nonlocal contiguous
+        report.groups += 1
+        report.rendered += result.rendered
+        report.cached += result.cached
+        report.accounts += result.rendered + result.cached
+        run.generados += result.rendered
+        run.reutilizados += result.cached
+        if result.error:
+            # El cursor queda en el último grupo contiguo terminado; los grupos
+            # posteriores igual se guardan y al retomar se reutilizan por huella
+            contiguous = False
+            report.failed_groups += 1
+            report.errors.append(result.error)
+            run.errores += 1
+            run.ultimo_error = result.error
+        elif contiguous:
+            run.cursor = result.last_pk
+        run.save(update_fields=['cursor', 'generados', 'reutilizados', 'errores', 'ultimo_error'])
+        report.elapsed = time.perf_counter() - start
+        if on_progress:
+            on_progress(report)
+
+    with index_dir:
+        if workers > 1 and len(groups) > 1:
+            # Las conexiones heredadas no pueden compartirse entre procesos
+            connections.close_all()
+            with get_context().Pool(workers, initializer=_init_worker) as pool:
+                # imap conserva el orden de los grupos: el cursor avanza en orden de pk
+                for result in pool.imap(task, groups):
+                    record(result)
+        else:
+            for group in groups:
+                record(task(group))
+
+    run.estado = StatementRun.RunStatus.FALLIDA if report.failed_groups else StatementRun.RunStatus.COMPLETADA
+    run.fecha_fin = timezone.now()
+    run.save(update_fields=['estado', 'fecha_fin'])
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def render_group(periodo, pdf, ids, archived_index=None):
+    """
+    Genera los extractos de un grupo de cuentas. Se ejecuta en los procesos
+    del pool, por lo que nunca lanza excepciones: las informa en el resultado.
+    """
+    result = GroupResult(last_pk=ids[-1])
+    try:
+        documents = build_documents(periodo, ids, archived_index)
+        existing = dict(
+            Statement.objects.filter(cuenta_id__in=ids, periodo=periodo).values_list('cuenta_id', 'huella')
+        )
+        directory = Path(settings.STATEMENTS_ROOT) / f"{periodo:%Y-%m}"
+        directory.mkdir(parents=True, exist_ok=True)
+
+        statements = []
+        for document in documents:
+            html_path = directory / f"{document['huella']}.html"
+            pdf_path = directory / f"{document['huella']}.pdf" if pdf else None
+            up_to_date = html_path.exists() and (pdf_path is None or pdf_path.exists())
+            if up_to_date and existing.get(document['cuenta_id']) == document['huella']:
+                result.cached += 1
+                continue
+
+            if up_to_date:
+                # El archivo existe (otra cuenta idéntica o una corrida cortada): solo falta registrarlo
+                result.cached += 1
+            else:
+                html = get_template(TEMPLATE_NAME).render(document['context'])
+                _write_atomic(html_path, html.encode('utf-8'))
+                if pdf_path is not None:
+                    _write_atomic(pdf_path, _weasyprint().HTML(string=html).write_pdf())
+                result.rendered += 1
+
+            statements.append(Statement(
+                cuenta_id=document['cuenta_id'],
+                periodo=periodo,
+                huella=document['huella'],
+                saldo_inicial=document['context']['saldo_inicial'],
+                saldo_final=document['context']['saldo_final'],
+                movimientos=len(document['context']['movimientos']),
+                archivo_html=str(html_path.relative_to(settings.STATEMENTS_ROOT)),
+                archivo_pdf=str(pdf_path.relative_to(settings.STATEMENTS_ROOT)) if pdf_path else '',
+                fecha_generacion=timezone.now(),
+            ))
+
+        if statements:
+            Statement.objects.bulk_create(
+                statements,
+                update_conflicts=True,
+                unique_fields=['cuenta', 'periodo'],
+                update_fields=['huella', 'saldo_inicial', 'saldo_final', 'movimientos',
+                               'archivo_html', 'archivo_pdf', 'fecha_generacion'],
+            )
+    except Exception as exc:
+        result.error = f"Grupo hasta {ids[-1]}: {type(exc).__name__}: {exc}"
+    return result
+
+
+def build_documents(periodo, ids, archived_index=None):
+    """
+    Datos y huella de los extractos de un grupo de cuentas con consultas en bloque:
+    cuentas con su cliente, movimientos del mes y movimientos posteriores
+    (para reconstruir el saldo al cierre a partir del saldo actual), tanto de
+    la tabla como del archivo frío. `archived_index` es el índice por cuenta
+    del mes archivado armado por la corrida; sin él se lee el archivo.
+    """
+    start, end = month_bounds(periodo)
+    accounts = Account.objects.filter(pk__in=ids).select_related('cliente').order_by('pk')
+    revertida = Transaction.TransactionStatus.REVERTIDA
+
+    # Los meses archivados se leen del archivo frío de forma transparente
+    if archived_index is not None:
+        movimientos = _indexed_movements(archived_index, ids)
+    else:
+        movimientos = {pk: [] for pk in ids}
+        for row in archive.stream(
+            'transactions.Transaction', start, end,
+            any_of={'cuenta_origen_id': ids, 'cuenta_destino_id': ids},
+        ):
+            for cuenta_id, importe in _movements(row):
+                if cuenta_id in movimientos:
+                    movimientos[cuenta_id].append((row, importe))
+
+    posteriores = Transaction.objects.exclude(estado=revertida).filter(fecha__gte=end)
+    debitos = dict(
+        posteriores.filter(cuenta_origen_id__in=ids)
+        .values_list('cuenta_origen_id').annotate(total=Sum('monto')).order_by()
+    )
+    creditos = dict(
+        posteriores.filter(cuenta_destino_id__in=ids)
+        .values_list('cuenta_destino_id').annotate(total=Sum('monto')).order_by()
+    )
+    for partition_id in ArchivePartition.objects.filter(
+        modelo='transactions.Transaction', periodo__gte=first_of_month(end)
+    ).values_list('pk', flat=True):
+        archived_debitos, archived_creditos = _archived_totals(partition_id)
+        for pk in ids:
+            debitos[pk] = debitos.get(pk, 0) + archived_debitos.get(pk, 0)
+            creditos[pk] = creditos.get(pk, 0) + archived_creditos.get(pk, 0)
+
+    tipos = dict(Transaction.TransactionType.choices)
+    documents = []
+    for account in accounts:
+        # Cuantizado: la huella no debe depender de la escala con la que el motor devuelve SUM()
+        saldo_final = (account.saldo + debitos.get(account.pk, 0) - creditos.get(account.pk, 0)).quantize(CENTAVOS)
+        saldo_inicial = saldo_final - sum((importe for _, importe in movimientos[account.pk]), Decimal(0))
+
+        saldo = saldo_inicial
+        lineas = []
+        for row, importe in movimientos[account.pk]:
+            saldo += importe
+            lineas.append({
+                'fecha': row['fecha'],
+                'tipo': tipos.get(row['tipo'], row['tipo']),
+                'referencia': row['referencia'],
+                'descripcion': row['descripcion'],
+                'debito': -importe if importe < 0 else None,
+                'credito': importe if importe > 0 else None,
+                'saldo': saldo,
+            })
+
+        context = {
+            'periodo': periodo,
+            'cuenta': {
+                'numero': account.numero_cuenta,
+                'tipo': account.get_tipo_display(),
+                'moneda': account.moneda,
+            },
+            'cliente': str(account.cliente),
+            'saldo_inicial': saldo_inicial,
+            'saldo_final': saldo_final,
+            'movimientos': lineas,
+        }
+        documents.append({
+            'cuenta_id': account.pk,
+            'huella': content_hash(context),
+            'context': context,
+        })
+    return documents
+
+
+def content_hash(context):
+    """Hash del contenido del extracto y de la plantilla con la que se renderiza"""
+    digest = hashlib.sha256(_template_fingerprint().encode())
+    digest.update(json.dumps(context, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _movements(row):
+    """(cuenta, importe) de una fila: débito en origen y crédito en destino; nada si fue revertida"""
+    if row['estado'] == Transaction.TransactionStatus.REVERTIDA:
+        return ()
+    return (row['cuenta_origen_id'], -row['monto']), (row['cuenta_destino_id'], row['monto'])
+
+
+def _index_archived_month(periodo, path):
+    """
+    Si el mes está archivado, recorre su partición una vez y guarda en `path`
+    cada movimiento vigente bajo su cuenta, en orden de fecha. Retorna la ruta
+    o None si el mes sigue en la tabla.
+    """
+    if not ArchivePartition.objects.filter(modelo='transactions.Transaction', periodo=periodo).exists():
+        return None
+    start, end = month_bounds(periodo)
+    rows = (
+        (str(cuenta_id), pickle.dumps((row, importe), protocol=pickle.HIGHEST_PROTOCOL))
+        for row in archive.stream('transactions.Transaction', start, end)
+        for cuenta_id, importe in _movements(row)
+        if cuenta_id is not None
+    )
+    db = sqlite3.connect(path)
+    try:
+        db.execute('CREATE TABLE movimientos (cuenta TEXT NOT NULL, fila BLOB NOT NULL)')
+        with db:
+            db.executemany('INSERT INTO movimientos VALUES (?, ?)', rows)
+        # El índice se crea al final: la carga es más rápida sin mantenerlo
+        db.execute('CREATE INDEX movimientos_cuenta ON movimientos (cuenta)')
+    finally:
+        db.close()
+    return str(path)
+
+
+def _indexed_movements(path, ids):
+    """Movimientos de las cuentas `ids` desde el índice del mes archivado"""
+    movimientos = {pk: [] for pk in ids}
+    by_key = {str(pk): movimientos[pk] for pk in ids}
+    keys = list(by_key)
+    db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        # rowid conserva el orden de fecha en que se cargaron
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset:offset + 500]
+            query = f"SELECT cuenta, fila FROM movimientos WHERE cuenta IN ({', '.join('?' * len(chunk))}) ORDER BY rowid"
+            for cuenta, fila in db.execute(query, chunk):
+                by_key[cuenta].append(pickle.loads(fila))
+    finally:
+        db.close()
+    return movimientos
+
+
+@lru_cache(maxsize=None)
+def _archived_totals(partition_id):
+    """
+    Débitos y créditos vigentes por cuenta de una partición archivada. Las
+    particiones no cambian: cada proceso las recorre una sola vez.
+    """
+    partition = ArchivePartition.objects.get(pk=partition_id)
+    start, end = month_bounds(partition.periodo)
+    debitos, creditos = {}, {}
+    for row in archive.stream(partition.modelo, start, end):
+        if row['estado'] == Transaction.TransactionStatus.REVERTIDA:
+            continue
+        debitos[row['cuenta_origen_id']] = debitos.get(row['cuenta_origen_id'], 0) + row['monto']
+        creditos[row['cuenta_destino_id']] = creditos.get(row['cuenta_destino_id'], 0) + row['monto']
+    return debitos, creditos
+
+
+@lru_cache(maxsize=None)
+def _template_fingerprint():
+    return hashlib.sha256(get_template(TEMPLATE_NAME).template.source.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path, data):
+    # Un corte a mitad de escritura no debe dejar un archivo que parezca válido
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _init_worker():
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
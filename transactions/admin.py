@@ -1,3 +1,61 @@
 from django.contrib import admin
+from django.utils.html import format_html
+from .models import FraudScore, IdempotencyKey
 
-# Register your models here.
+
+@admin.register(FraudScore)
+class FraudScoreAdmin(admin.ModelAdmin):
+    list_display = ('transaccion', 'puntaje', 'nivel_badge', 'fecha_calculo')
+    list_filter = ('nivel',)
+    ordering = ('-puntaje',)
+    readonly_fields = ('transaccion', 'puntaje', 'nivel', 'motivos', 'fecha_calculo')
+
+    def nivel_badge(self, obj):
+        color_map = {
+            'bajo': '#198754',
+            'medio': '#fd7e14',
+            'alto': '#dc3545'
+        }
+        color = color_map.get(obj.nivel, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; '
+            'border-radius: 3px; font-size: 11px;">{}</span>',
+            color,
+            obj.get_nivel_display()
+        )
+
+    nivel_badge.short_description = 'Nivel'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('transaccion')
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('clave', 'estado_badge', 'codigo_respuesta', 'fecha_creacion', 'fecha_expiracion')
+    list_filter = ('estado',)
+    search_fields = ('clave',)
+    ordering = ('-fecha_creacion',)
+    readonly_fields = (
+        'clave', 'huella_solicitud', 'estado', 'codigo_respuesta', 'tipo_contenido',
+        'cuerpo_respuesta', 'huella_respuesta', 'fecha_creacion', 'fecha_bloqueo',
+        'fecha_expiracion'
+    )
+
+    def estado_badge(self, obj):
+        color_map = {
+            'en_proceso': '#fd7e14',
+            'completada': '#198754'
+        }
+        color = color_map.get(obj.estado, '#6c757d')
+        return format_html(
+            '<span style="background-color: {}; color: white; padding: 3px 10px; '
+            'border-radius: 3px; font-size: 11px;">{}</span>',
+            color,
+            obj.get_estado_display()
+        )
+
+    estado_badge.short_description = 'Estado'
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from core.dashboard import format_money, widget
+from .models import FraudScore, Transaction
+
+
+@widget(
+    'movimientos_del_dia',
+    'Movimientos del día',
+    roles=('administrador', 'cajero'),
+    ttl=60,
+    depends_on=('transactions.Transaction',),
+    icon='bi-arrow-left-right',
+)
+def daily_movements(user):
+    inicio = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    resumen = (
+        Transaction.objects
+        .filter(fecha__gte=inicio)
+        .values('tipo', 'moneda')
+        .annotate(cantidad=Count('id'), total=Sum('monto'))
+        .order_by('tipo', 'moneda')
+    )
+    pendientes = Transaction.objects.filter(estado=Transaction.TransactionStatus.PENDIENTE).count()
+    tipos = dict(Transaction.TransactionType.choices)
+    rows = [[tipos.get(row['tipo'], row['tipo']), row['cantidad'], format_money(row['total'], row['moneda'])]
+            for row in resumen]
+    return {
+        'stats': [
+            {'label': 'Pendientes en cola', 'value': pendientes},
+            {'label': 'Movimientos de hoy', 'value': sum(row[1] for row in rows)},
+        ],
+        'table': {'headers': ['Tipo', 'Cantidad', 'Total'], 'rows': rows},
+    }
+
+
+@widget(
+    'alertas_fraude',
+    'Alertas de fraude (24 h)',
+    roles=('administrador', 'auditor'),
+    ttl=120,
+    depends_on=('transactions.FraudScore',),
+    icon='bi-shield-exclamation',
+)
+def fraud_alerts(user):
+    recientes = FraudScore.objects.filter(fecha_calculo__gte=timezone.now() - timedelta(hours=24))
+    por_nivel = dict(recientes.values_list('nivel').annotate(cantidad=Count('id')))
+    altos = (
+        recientes
+        .filter(nivel=FraudScore.RiskLevel.ALTO)
+        .select_related('transaccion')
+        .order_by('-puntaje', '-fecha_calculo')[:5]
+    )
+    return {
+        'stats': [
+            {'label': 'Riesgo alto', 'value': por_nivel.get(FraudScore.RiskLevel.ALTO, 0)},
+            {'label': 'Riesgo medio', 'value': por_nivel.get(FraudScore.RiskLevel.MEDIO, 0)},
+        ],
+        'table': {
+            'headers': ['Puntaje', 'Monto', 'Motivo'],
+            'rows': [
+                [score.puntaje, format_money(score.transaccion.monto, score.transaccion.moneda),
+                 score.motivos[0] if score.motivos else '']
+                for score in altos
+            ],
+        },
+    }
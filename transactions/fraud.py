@@ -0,0 +1,413 @@
+"""
+Scoring de fraude y anomalías en streaming sobre las transacciones.
+
+Cada cuenta y cada tarjeta mantiene ventanas deslizantes incrementales
+(cantidad, suma, dispositivos y departamentos distintos), por lo que puntuar
+una transacción cuesta O(1) amortizado y nunca recorre el historial.
+
+- Scoring inline: `score_transactions()` puntúa y persiste al registrar movimientos.
+- Re-scoring por lotes: `rescore()` (comando `rescore_fraud`) reconstruye las
+  ventanas recorriendo el historial en orden cronológico.
+
+Las ventanas del scoring inline viven en la memoria del proceso. Al arrancar
+(banco/wsgi.py, o con la primera transferencia si nadie lo hizo antes) un hilo
+de fondo precalienta el scorer del proceso con las transacciones de las
+últimas 24 horas (la ventana más larga), así un reinicio no lo deja en blanco.
+Mientras tanto las transferencias se puntúan contra la ventana fría, sin
+esperar la carga ni alargar su transacción. Con
+varios procesos (APP_WORKERS > 1) cada uno vería solo una parte de los
+movimientos de una cuenta y subestimaría velocidad, dispositivos y
+departamentos, por lo que el scoring inline se desactiva y los puntajes
+quedan a cargo de `rescore_fraud`, que recorre el historial completo.
+"""
+import logging
+import threading
+from datetime import timedelta
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import FraudScore, Transaction
+
+DAY_SECONDS = 86400
+
+logger = logging.getLogger('banco.fraud')
+
+
+class RollingWindow:
+    """
+    Cantidad y suma de montos en una ventana deslizante de buckets fijos.
+    Avanzar la ventana descarta buckets vencidos restando sus totales.
+    """
+    __slots__ = ('bucket_seconds', 'counts', 'sums', 'head', 'count', 'total')
+
+    def __init__(self, window_seconds, buckets):
+        self.bucket_seconds = window_seconds / buckets
+        self.counts = [0] * buckets
+        self.sums = [0.0] * buckets
+        self.head = None
+        self.count = 0
+        self.total = 0.0
+
+    def _advance(self, timestamp):
+        index = int(timestamp // self.bucket_seconds)
+        if self.head is None:
+            self.head = index
+        elif index > self.head:
+            size = len(self.counts)
+            for step in range(1, min(index - self.head, size) + 1):
+                slot = (self.head + step) % size
+                self.count -= self.counts[slot]
+                self.total -= self.sums[slot]
+                self.counts[slot] = 0
+                self.sums[slot] = 0.0
+            self.head = index
+        return index
+
+    def add(self, timestamp, amount):
+        index = self._advance(timestamp)
+        if index <= self.head - len(self.counts):
+            # Evento más viejo que la ventana (llegó fuera de orden)
+            return
+        slot = index % len(self.counts)
+        self.counts[slot] += 1
+        self.sums[slot] += amount
+        self.count += 1
+        self.total += amount
+
+    def totals(self, timestamp):
+        self._advance(timestamp)
+        return self.count, self.total
+
+
+class DistinctWindow:
+    """
+    Valores distintos vistos en una ventana deslizante, ordenados por última
+    aparición para poder descartar los vencidos desde el frente.
+    """
+    __slots__ = ('window_seconds', 'max_values', 'last_seen')
+
+    def __init__(self, window_seconds, max_values=32):
+        self.window_seconds = window_seconds
+        self.max_values = max_values
+        self.last_seen = OrderedDict()
+
+    def _prune(self, timestamp):
+        cutoff = timestamp - self.window_seconds
+        last_seen = self.last_seen
+        while last_seen:
+            value, seen = next(iter(last_seen.items()))
+            if seen > cutoff:
+                break
+            last_seen.popitem(last=False)
+
+    def add(self, timestamp, value):
+        if not value:
+            return
+        previous = self.last_seen.get(value)
+        self.last_seen[value] = timestamp if previous is None else max(previous, timestamp)
+        self.last_seen.move_to_end(value)
+        self._prune(timestamp)
+        if len(self.last_seen) > self.max_values:
+            self.last_seen.popitem(last=False)
+
+    def count(self, timestamp):
+        self._prune(timestamp)
+        return len(self.last_seen)
+
+    def __contains__(self, value):
+        return value in self.last_seen
+
+
+class EntityFeatures:
+    """
+    Features incrementales de una cuenta o tarjeta
+    """
+    __slots__ = ('burst', 'daily', 'devices', 'departments', 'mean_amount', 'observations')
+
+    def __init__(self):
+        self.burst = RollingWindow(settings.FRAUD_VELOCITY_WINDOW, 10)
+        self.daily = RollingWindow(DAY_SECONDS, 24)
+        self.devices = DistinctWindow(DAY_SECONDS)
+        self.departments = DistinctWindow(settings.FRAUD_GEO_WINDOW, len(settings.PARAGUAY_DEPARTMENTS))
+        self.mean_amount = 0.0
+        self.observations = 0
+
+    def update(self, event):
+        self.burst.add(event.timestamp, event.monto)
+        self.daily.add(event.timestamp, event.monto)
+        self.devices.add(event.timestamp, event.dispositivo)
+        self.departments.add(event.timestamp, event.departamento)
+        # Media móvil exponencial del monto habitual
+        self.observations += 1
+        alpha = max(1.0 / self.observations, 0.05)
+        self.mean_amount += alpha * (event.monto - self.mean_amount)
+
+
+@dataclass(frozen=True)
+class TransactionEvent:
+    """
+    Vista mínima de una transacción para el scoring
+    """
+    cuenta_id: object
+    monto: float
+    timestamp: float
+    tarjeta_id: object = None
+    dispositivo: str = ''
+    departamento: str = ''
+    transaccion_id: object = None
+
+    @classmethod
+    def from_transaction(cls, transaccion):
+        return cls(
+            cuenta_id=transaccion.cuenta_origen_id or transaccion.cuenta_destino_id,
+            monto=float(transaccion.monto),
+            timestamp=transaccion.fecha.timestamp(),
+            tarjeta_id=transaccion.tarjeta_id,
+            dispositivo=transaccion.dispositivo,
+            departamento=transaccion.departamento,
+            transaccion_id=transaccion.pk,
+        )
+
+
+@dataclass
+class ScoreResult:
+    """
+    Puntaje (0-100), nivel de riesgo y motivos que lo explican
+    """
+    puntaje: int = 0
+    motivos: list = field(default_factory=list)
+
+    @property
+    def nivel(self):
+        if self.puntaje >= settings.FRAUD_HIGH_RISK_SCORE:
+            return FraudScore.RiskLevel.ALTO
+        if self.puntaje >= settings.FRAUD_MEDIUM_RISK_SCORE:
+            return FraudScore.RiskLevel.MEDIO
+        return FraudScore.RiskLevel.BAJO
+
+    def add(self, points, motivo):
+        self.puntaje = min(100, self.puntaje + points)
+        self.motivos.append(motivo)
+
+
+class FraudScorer:
+    """
+    Mantiene las features de cada cuenta y tarjeta y puntúa eventos en O(1).
+    Las entidades inactivas se descartan en orden LRU para acotar la memoria.
+    """
+
+    def __init__(self, max_entities=None):
+        self.max_entities = max_entities or settings.FRAUD_MAX_TRACKED_ENTITIES
+        self._entities = OrderedDict()
+        self._lock = threading.Lock()
+        # Transacciones ya vistas mientras se precalienta, en vivo o desde el
+        # historial, para no contarlas dos veces (None: sin precalentar)
+        self._seen = None
+
+    def __len__(self):
+        return len(self._entities)
+
+    def score(self, event):
+        """Puntúa el evento contra las features previas y luego las actualiza"""
+        result = ScoreResult()
+        with self._lock:
+            update = self._first_sighting(event)
+            self._evaluate(result, 'cuenta', self._features(('cuenta', event.cuenta_id)), event,
+                           settings.DEFAULT_DAILY_TRANSFER_LIMIT, update)
+            if event.tarjeta_id is not None:
+                self._evaluate(result, 'tarjeta', self._features(('tarjeta', event.tarjeta_id)), event,
+                               settings.DEFAULT_DAILY_ATM_LIMIT, update)
+        return result
+
+    def begin_warm_up(self):
+        with self._lock:
+            self._seen = set()
+
+    def end_warm_up(self):
+        with self._lock:
+            self._seen = None
+
+    def load(self, event):
+        """
+        Incorpora un evento del historial sin puntuarlo. Durante el
+        precalentamiento se omite si ya se puntuó en vivo.
+        """
+        with self._lock:
+            if not self._first_sighting(event):
+                return
+            self._features(('cuenta', event.cuenta_id)).update(event)
+            if event.tarjeta_id is not None:
+                self._features(('tarjeta', event.tarjeta_id)).update(event)
+
+    def _first_sighting(self, event):
+        if self._seen is None or event.transaccion_id is None:
+            return True
+        if event.transaccion_id in self._seen:
+            return False
+        self._seen.add(event.transaccion_id)
+        return True
+
+    def _features(self, key):
+        features = self._entities.get(key)
+        if features is None:
+            features = self._entities[key] = EntityFeatures()
+            if len(self._entities) > self.max_entities:
+                self._entities.popitem(last=False)
+        else:
+            self._entities.move_to_end(key)
+        return features
+
+    def _evaluate(self, result, entidad, features, event, daily_limit, update=True):
+        now = event.timestamp
+
+        burst_count, _ = features.burst.totals(now)
+        if burst_count >= settings.FRAUD_VELOCITY_MAX:
+            result.add(30, f'{entidad}: {burst_count + 1} transacciones en '
+                           f'{settings.FRAUD_VELOCITY_WINDOW // 60} minutos')
+
+        _, daily_total = features.daily.totals(now)
+        if daily_total + event.monto > daily_limit:
+            result.add(25, f'{entidad}: supera el límite diario de {daily_limit:,}')
+
+        if event.dispositivo and event.dispositivo not in features.devices:
+            if features.devices.count(now) >= settings.FRAUD_MAX_DEVICES:
+                result.add(20, f'{entidad}: dispositivo nuevo tras '
+                               f'{settings.FRAUD_MAX_DEVICES} dispositivos en 24 horas')
+
+        if event.departamento and event.departamento not in features.departments:
+            if features.departments.count(now) >= 1:
+                result.add(35, f'{entidad}: operación desde {event.departamento} poco después '
+                               f'de otro departamento')
+
+        if (features.observations >= 5
+                and event.monto > features.mean_amount * settings.FRAUD_AMOUNT_SPIKE_FACTOR):
+            result.add(20, f'{entidad}: monto {settings.FRAUD_AMOUNT_SPIKE_FACTOR}x superior al habitual')
+
+        if update:
+            features.update(event)
+
+
+_default_scorer = None
+_default_scorer_lock = threading.Lock()
+
+EVENT_FIELDS = (
+    'id', 'cuenta_origen_id', 'cuenta_destino_id', 'monto', 'fecha',
+    'tarjeta_id', 'dispositivo', 'departamento',
+)
+
+
+def inline_scoring_enabled():
+    """El scoring inline solo es confiable si un único proceso ve todos los movimientos"""
+    return settings.FRAUD_INLINE_SCORING and settings.APP_WORKERS == 1
+
+
+def warm_up(scorer, since, exclude=(), batch_size=2000):
+    """
+    Carga en `scorer` las transacciones desde `since` en orden cronológico,
+    sin persistir puntajes. Retorna la cantidad de transacciones cargadas.
+    """
+    queryset = Transaction.objects.filter(fecha__gte=since).exclude(pk__in=list(exclude))
+    total = 0
+    for transaccion in queryset.only(*EVENT_FIELDS).order_by('fecha').iterator(chunk_size=batch_size):
+        scorer.load(TransactionEvent.from_transaction(transaccion))
+        total += 1
+    return total
+
+
+def start_warm_up():
+    """
+    Crea el scorer del proceso y lo precalienta en un hilo de fondo con el
+    último día de historial. Retorna el scorer de inmediato; si ya existía,
+    no hace nada más.
+    """
+    global _default_scorer
+    with _default_scorer_lock:
+        if _default_scorer is not None:
+            return _default_scorer
+        scorer = _default_scorer = FraudScorer()
+        scorer.begin_warm_up()
+    threading.Thread(target=_warm_up_default, args=(scorer,), name='fraud-warm-up', daemon=True).start()
+    return scorer
+
+
+def _warm_up_default(scorer):
+    window = max(DAY_SECONDS, settings.FRAUD_GEO_WINDOW, settings.FRAUD_VELOCITY_WINDOW)
+    try:
+        total = warm_up(scorer, timezone.now() - timedelta(seconds=window))
+        logger.info("Scorer de fraude precalentado con %s transacciones", total)
+    except Exception:
+        # Sin historial el scorer sigue funcionando con la ventana fría
+        logger.exception("Error al precalentar el scorer de fraude")
+    finally:
+        scorer.end_warm_up()
+        connection.close()
+
+
+def default_scorer():
+    """
+    Scorer compartido por el proceso para el scoring inline. Nunca espera el
+    precalentamiento: hasta que termina, puntúa contra la ventana fría.
+    """
+    if _default_scorer is not None:
+        return _default_scorer
+    return start_warm_up()
+
+
+def score_transactions(transacciones, scorer=None):
+    """
+    Puntúa transacciones recién registradas y persiste sus puntajes.
+    Retorna la lista de FraudScore creados.
+    """
+    if scorer is None:
+        scorer = default_scorer()
+    scores = []
+    for transaccion in transacciones:
+        result = scorer.score(TransactionEvent.from_transaction(transaccion))
+        scores.append(FraudScore(
+            transaccion=transaccion,
+            puntaje=result.puntaje,
+            nivel=result.nivel,
+            motivos=result.motivos,
+        ))
+    return _save_scores(scores)
+
+
+def rescore(queryset, batch_size=2000):
+    """
+    Reconstruye las features desde cero recorriendo `queryset` en orden
+    cronológico y reemplaza los puntajes almacenados. Retorna la cantidad
+    de transacciones puntuadas.
+    """
+    scorer = FraudScorer()
+    pending = []
+    total = 0
+    for transaccion in queryset.order_by('fecha').iterator(chunk_size=batch_size):
+        result = scorer.score(TransactionEvent.from_transaction(transaccion))
+        pending.append(FraudScore(
+            transaccion_id=transaccion.pk,
+            puntaje=result.puntaje,
+            nivel=result.nivel,
+            motivos=result.motivos,
+        ))
+        if len(pending) >= batch_size:
+            total += len(_save_scores(pending))
+            pending = []
+    if pending:
+        total += len(_save_scores(pending))
+    return total
+
+
+def _save_scores(scores):
+    fecha = timezone.now()
+    for score in scores:
+        score.fecha_calculo = fecha
+    return FraudScore.objects.bulk_create(
+        scores,
+        update_conflicts=True,
+        unique_fields=['transaccion'],
+        update_fields=['puntaje', 'nivel', 'motivos', 'fecha_calculo'],
+    )
@@ -0,0 +1,316 @@
+"""
+Almacén de idempotencia para solicitudes de transferencias y pagos.
+
+Flujo de una solicitud con clave de idempotencia:
+1. Se busca la clave por su índice único (es la única consulta de un reintento).
+2. Si no existe, se inserta en estado EN_PROCESO y se ejecuta la operación.
+3. Si existe y está completada, se devuelve la respuesta almacenada.
+4. Si existe y sigue en proceso, se espera a que la primera solicitud termine
+   en lugar de volver a ejecutar la operación.
+
+La operación corre fuera de cualquier transacción del almacén (así conserva su
+propio manejo de transacciones y reintentos) y la respuesta se guarda después
+con un único UPDATE. Ese guardado está condicionado a `fecha_bloqueo`: si
+la clave quedó colgada más de IDEMPOTENCY_LOCK_TIMEOUT y otra solicitud la
+tomó, la original ya no es dueña y no pisa el resultado. El plazo debe superar
+con holgura la duración de la operación más lenta.
+"""
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_CLIENT_KEY_LENGTH = 128
+
+# Solicitudes en curso dentro de este proceso: los duplicados concurrentes
+# esperan el evento en lugar de consultar la base de datos en un bucle.
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+class IdempotencyError(Exception):
+    """Error base del almacén de idempotencia"""
+
+
+class IdempotencyKeyReused(IdempotencyError):
+    """La clave ya se usó con una solicitud distinta"""
+
+
+class IdempotencyTimeout(IdempotencyError):
+    """La solicitud original no terminó dentro del tiempo de espera"""
+
+
+class IdempotencyOwnershipLost(IdempotencyError):
+    """Otra solicitud tomó la clave por vencimiento del bloqueo antes de guardar la respuesta"""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """
+    Respuesta serializable que se guarda junto a la clave
+    """
+    status_code: int
+    body: str
+    content_type: str = 'application/json'
+
+    @classmethod
+    def from_http_response(cls, response):
+        return cls(
+            status_code=response.status_code,
+            body=response.content.decode(response.charset),
+            content_type=response.get('Content-Type', 'application/json'),
+        )
+
+    def to_http_response(self):
+        return HttpResponse(self.body, status=self.status_code, content_type=self.content_type)
+
+
+def fingerprint(data):
+    """
+    Retorna el SHA-256 de bytes, texto o de cualquier estructura serializable a JSON
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    elif not isinstance(data, bytes):
+        data = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def execute_once(clave, huella, operation, ttl=None, wait_timeout=None):
+    """
+    Ejecuta `operation` una sola vez por clave y retorna (respuesta, reutilizada).
+
+    `operation` debe retornar un StoredResponse. Se ejecuta fuera de la
+    transacción que guarda la respuesta; si mientras tanto otra solicitud tomó
+    la clave se lanza IdempotencyOwnershipLost y prevalece el resultado de esa.
+    """
+    if wait_timeout is None:
+        wait_timeout = settings.IDEMPOTENCY_WAIT_TIMEOUT
+    deadline = time.monotonic() + wait_timeout
+    delay = 0.01
+
+    while True:
+        record = _lookup(clave)
+
+        if record is None:
+            record = _claim_new(clave, huella, ttl)
+            if record is None:
+                # Otra solicitud insertó la clave entre la búsqueda y la inserción
+                continue
+            return _run(record, operation), False
+
+        if record.huella_solicitud != huella:
+            raise IdempotencyKeyReused(
+                f"La clave '{clave}' ya fue utilizada con una solicitud diferente"
+            )
+
+        if record.is_expired():
+            IdempotencyKey.objects.filter(
+                pk=record.pk,
+                fecha_expiracion__lte=timezone.now()
+            ).delete()
+            continue
+
+        if record.estado == IdempotencyKey.KeyStatus.COMPLETADA:
+            return _to_stored_response(record), True
+
+        if _claim_stale(record):
+            return _run(record, operation), False
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise IdempotencyTimeout(
+                f"La solicitud original con clave '{clave}' sigue en proceso"
+            )
+        _wait_for(clave, min(delay, remaining), remaining)
+        delay = min(delay * 2, 0.5)
+
+
+def purge_expired(batch_size=1000):
+    """
+    Elimina las claves vencidas en lotes para no bloquear la tabla.
+    Retorna la cantidad de claves eliminadas.
+    """
+    total = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects
+            .filter(fecha_expiracion__lte=timezone.now())
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        deleted, _ = IdempotencyKey.objects.filter(pk__in=ids).delete()
+        total += deleted
+
+
+def idempotent(scope):
+    """
+    Decorador de vistas que deduplica reintentos usando el header Idempotency-Key.
+
+    La clave se acota por `scope` y por usuario, por lo que dos clientes nunca
+    comparten respuestas aunque generen la misma clave. Las solicitudes sin
+    header se ejecutan normalmente.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            client_key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not client_key:
+                return view_func(request, *args, **kwargs)
+
+            if len(client_key) > MAX_CLIENT_KEY_LENGTH:
+                return JsonResponse(
+                    {'error': f'{IDEMPOTENCY_HEADER} supera los {MAX_CLIENT_KEY_LENGTH} caracteres'},
+                    status=400
+                )
+
+            user = getattr(request, 'user', None)
+            owner = user.pk if user is not None and user.is_authenticated else 'anonimo'
+            clave = f"{scope}:{owner}:{client_key}"
+            # La ruta completa incluye la query string: otros parámetros son otra solicitud
+            huella = fingerprint(
+                request.method.encode() + b' ' + request.get_full_path().encode() + b'\n' + request.body
+            )
+
+            try:
+                stored, replayed = execute_once(
+                    clave,
+                    huella,
+                    lambda: StoredResponse.from_http_response(view_func(request, *args, **kwargs))
+                )
+            except IdempotencyKeyReused as exc:
+                return JsonResponse({'error': str(exc)}, status=422)
+            except (IdempotencyTimeout, IdempotencyOwnershipLost) as exc:
+                return JsonResponse({'error': str(exc)}, status=409)
+
+            response = stored.to_http_response()
+            if replayed:
+                response[REPLAYED_HEADER] = 'true'
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _lookup(clave):
+    try:
+        return IdempotencyKey.objects.get(clave=clave)
+    except IdempotencyKey.DoesNotExist:
+        return None
+
+
+def _claim_new(clave, huella, ttl):
+    if ttl is None:
+        ttl = settings.IDEMPOTENCY_KEY_TTL
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                clave=clave,
+                huella_solicitud=huella,
+                fecha_creacion=now,
+                fecha_bloqueo=now,
+                fecha_expiracion=now + timedelta(seconds=ttl),
+            )
+    except IntegrityError:
+        return None
+
+
+def _claim_stale(record):
+    """
+    Toma una clave cuyo dueño original quedó colgado (p.ej. el proceso murió)
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+    if record.fecha_bloqueo > cutoff:
+        return False
+    claimed = IdempotencyKey.objects.filter(
+        pk=record.pk,
+        estado=IdempotencyKey.KeyStatus.EN_PROCESO,
+        fecha_bloqueo=record.fecha_bloqueo,
+    ).update(fecha_bloqueo=now) == 1
+    if claimed:
+        # El nuevo valor identifica al dueño: los guardados se condicionan a él
+        record.fecha_bloqueo = now
+    return claimed
+
+
+def _run(record, operation):
+    event = threading.Event()
+    with _inflight_lock:
+        _inflight[record.clave] = event
+
+    try:
+        try:
+            response = operation()
+        except Exception:
+            _release(record)
+            raise
+
+        if response.status_code >= 500:
+            # Los errores del servidor no se almacenan: el reintento debe ejecutarse
+            _release(record)
+            return response
+
+        stored = _owned(record).update(
+            estado=IdempotencyKey.KeyStatus.COMPLETADA,
+            codigo_respuesta=response.status_code,
+            tipo_contenido=response.content_type,
+            cuerpo_respuesta=response.body,
+            huella_respuesta=fingerprint(response.body),
+        )
+        if not stored:
+            raise IdempotencyOwnershipLost(
+                f"La clave '{record.clave}' fue tomada por otra solicitud antes de guardar la respuesta"
+            )
+        return response
+    finally:
+        with _inflight_lock:
+            _inflight.pop(record.clave, None)
+        event.set()
+
+
+def _owned(record):
+    """La clave, solo mientras siga en proceso con el bloqueo que tomó este dueño"""
+    return IdempotencyKey.objects.filter(
+        pk=record.pk,
+        estado=IdempotencyKey.KeyStatus.EN_PROCESO,
+        fecha_bloqueo=record.fecha_bloqueo,
+    )
+
+
+def _release(record):
+    _owned(record).delete()
+
+
+def _wait_for(clave, delay, remaining):
+    with _inflight_lock:
+        event = _inflight.get(clave)
+    if event is not None:
+        # La solicitud original corre en este proceso: esperar su señal
+        event.wait(timeout=remaining)
+    else:
+        time.sleep(delay)
+
+
+def _to_stored_response(record):
+    return StoredResponse(
+        status_code=record.codigo_respuesta,
+        body=record.cuerpo_respuesta,
+        content_type=record.tipo_contenido,
+    )
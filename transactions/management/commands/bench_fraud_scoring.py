@@ -0,0 +1,52 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from transactions.fraud import FraudScorer, TransactionEvent
+
+
+class Command(BaseCommand):
+    help = 'Mide el throughput del scoring de fraude en memoria (eventos por segundo)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200000)
+        parser.add_argument('--accounts', type=int, default=20000)
+        parser.add_argument('--card-ratio', type=float, default=0.5, help='Fracción de eventos con tarjeta')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        departments = settings.PARAGUAY_DEPARTMENTS
+        accounts = options['accounts']
+
+        # Los eventos se generan antes de medir para aislar el costo del scoring
+        events = []
+        timestamp = 1_700_000_000.0
+        for _ in range(options['events']):
+            timestamp += rng.expovariate(50)
+            account = rng.randrange(accounts)
+            events.append(TransactionEvent(
+                cuenta_id=account,
+                monto=rng.lognormvariate(12, 1.2),
+                timestamp=timestamp,
+                tarjeta_id=account if rng.random() < options['card_ratio'] else None,
+                dispositivo=f"dev-{account}-{rng.randrange(3)}",
+                departamento=departments[account % len(departments)] if rng.random() < 0.98
+                else rng.choice(departments),
+            ))
+
+        scorer = FraudScorer()
+        flagged = 0
+        start = time.perf_counter()
+        for event in events:
+            if scorer.score(event).puntaje >= settings.FRAUD_MEDIUM_RISK_SCORE:
+                flagged += 1
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"Eventos: {len(events)} en {elapsed:.2f} s")
+        self.stdout.write(f"  throughput: {len(events) / elapsed:,.0f} eventos/s")
+        self.stdout.write(f"  latencia media: {elapsed / len(events) * 1e6:.1f} µs")
+        self.stdout.write(f"  entidades en memoria: {len(scorer)}")
+        self.stdout.write(f"  eventos con riesgo medio o alto: {flagged}")
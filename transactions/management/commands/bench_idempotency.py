@@ -0,0 +1,64 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from transactions.idempotency import StoredResponse, execute_once, fingerprint
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el costo de los reintentos deduplicados: cada reintento debe '
+        'resolverse con una sola consulta indexada'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keys', type=int, default=1000, help='Claves distintas a registrar')
+        parser.add_argument('--retries', type=int, default=3, help='Reintentos por clave')
+
+    def handle(self, *args, **options):
+        keys = options['keys']
+        retries = options['retries']
+        run_id = uuid.uuid4().hex[:8]
+        executions = 0
+
+        def operation():
+            nonlocal executions
+            executions += 1
+            return StoredResponse(status_code=201, body='{"estado": "aprobada"}')
+
+        # Todo corre en una transacción que se revierte al final para no ensuciar la base
+        with transaction.atomic():
+            claves = [f"bench:{run_id}:{i}" for i in range(keys)]
+            huellas = [fingerprint({'monto': i, 'destino': 'bench'}) for i in range(keys)]
+
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as first_queries:
+                for clave, huella in zip(claves, huellas):
+                    execute_once(clave, huella, operation)
+            first_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as retry_queries:
+                for _ in range(retries):
+                    for clave, huella in zip(claves, huellas):
+                        execute_once(clave, huella, operation)
+            retry_elapsed = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        total_retries = keys * retries
+        self.stdout.write(f"Primeras solicitudes: {keys}")
+        self.stdout.write(f"  consultas por solicitud: {len(first_queries) / keys:.2f}")
+        self.stdout.write(f"  latencia media: {first_elapsed / keys * 1000:.3f} ms")
+        self.stdout.write(f"Reintentos deduplicados: {total_retries}")
+        self.stdout.write(f"  consultas por reintento: {len(retry_queries) / total_retries:.2f}")
+        self.stdout.write(f"  latencia media: {retry_elapsed / total_retries * 1000:.3f} ms")
+        self.stdout.write(f"Operaciones ejecutadas: {executions} (esperado {keys})")
+
+        if executions != keys:
+            self.stderr.write(self.style.ERROR("✗ Un reintento volvió a ejecutar la operación"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✓ Ningún reintento volvió a ejecutar la operación"))
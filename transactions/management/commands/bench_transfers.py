@@ -0,0 +1,110 @@
+import random
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Sum
+
+from accounts.models import Account
+from clients.models import Client
+from transactions.models import Transaction
+from transactions.transfers import TransferConflict, TransferRequest, execute_batch, uses_row_locks
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el ejecutor de transferencias bajo contención: escenario de cuenta '
+        'caliente (todas las transferencias tocan la misma cuenta) o uniforme'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--accounts', type=int, default=50, help='Cuentas de prueba')
+        parser.add_argument('--transfers', type=int, default=200, help='Transferencias por hilo')
+        parser.add_argument('--threads', type=int, default=4, help='Hilos concurrentes')
+        parser.add_argument('--scenario', choices=['hot', 'uniform'], default='hot')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1,
+            help='Transferencias enviadas por llamada a execute_batch'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        cliente = Client.objects.create(nombres='Benchmark', apellidos=run_id)
+        accounts = Account.objects.bulk_create([
+            Account(
+                numero_cuenta=f"B{run_id}{i:06d}",
+                cliente=cliente,
+                saldo=Decimal('1000000000.00'),
+            )
+            for i in range(options['accounts'])
+        ])
+        account_ids = [account.pk for account in accounts]
+        initial_total = Account.objects.filter(cliente=cliente).aggregate(total=Sum('saldo'))['total']
+
+        stats = {'ok': 0, 'conflicts': 0, 'rejected': 0, 'attempts': 0}
+        stats_lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            requests = []
+            for _ in range(options['transfers']):
+                if options['scenario'] == 'hot':
+                    # La mitad de las transferencias salen de la cuenta caliente y la otra mitad llegan
+                    other = rng.choice(account_ids[1:])
+                    pair = (account_ids[0], other) if rng.random() < 0.5 else (other, account_ids[0])
+                else:
+                    pair = tuple(rng.sample(account_ids, 2))
+                requests.append(TransferRequest(pair[0], pair[1], Decimal(rng.randint(1, 1000))))
+
+            batch_size = options['batch_size']
+            try:
+                for start in range(0, len(requests), batch_size):
+                    results = execute_batch(requests[start:start + batch_size])
+                    with stats_lock:
+                        for result in results:
+                            stats['attempts'] += result.attempts
+                            if result.ok:
+                                stats['ok'] += 1
+                            elif isinstance(result.error, TransferConflict):
+                                stats['conflicts'] += 1
+                            else:
+                                stats['rejected'] += 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(options['seed'] + i,))
+            for i in range(options['threads'])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        final_total = Account.objects.filter(cliente=cliente).aggregate(total=Sum('saldo'))['total']
+        submitted = options['transfers'] * options['threads']
+
+        self.stdout.write(f"Motor: {connection.vendor} ({'bloqueo de filas' if uses_row_locks() else 'optimista'})")
+        self.stdout.write(f"Escenario: {options['scenario']}, hilos: {options['threads']}, lote: {options['batch_size']}")
+        self.stdout.write(f"Transferencias: {submitted} en {elapsed:.2f} s ({submitted / elapsed:.0f}/s)")
+        self.stdout.write(f"  aplicadas: {stats['ok']}")
+        self.stdout.write(f"  rechazadas: {stats['rejected']}")
+        self.stdout.write(f"  conflictos tras reintentos: {stats['conflicts']}")
+        self.stdout.write(f"  intentos promedio: {stats['attempts'] / submitted:.2f}")
+
+        if final_total != initial_total:
+            self.stderr.write(self.style.ERROR(f"✗ El saldo total cambió: {initial_total} → {final_total}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✓ El saldo total se conservó"))
+
+        Transaction.objects.filter(cuenta_origen__cliente=cliente).delete()
+        Account.objects.filter(cliente=cliente).delete()
+        cliente.delete()
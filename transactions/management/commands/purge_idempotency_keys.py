@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from transactions.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Elimina en lotes las claves de idempotencia vencidas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Cantidad de claves eliminadas por sentencia DELETE'
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"✓ {deleted} claves de idempotencia eliminadas"))
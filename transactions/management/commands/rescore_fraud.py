@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from transactions.fraud import rescore
+from transactions.models import Transaction
+
+
+class Command(BaseCommand):
+    help = 'Recalcula por lotes los puntajes de fraude reconstruyendo las ventanas desde el historial'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=None,
+            help='Solo transacciones de los últimos N días (por defecto todo el historial)'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        queryset = Transaction.objects.all()
+        if options['days'] is not None:
+            queryset = queryset.filter(fecha__gte=timezone.now() - timedelta(days=options['days']))
+
+        total = rescore(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"✓ {total} transacciones puntuadas"))
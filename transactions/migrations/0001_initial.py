@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:20
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('clave', models.CharField(max_length=255, unique=True, verbose_name='Clave de Idempotencia')),
+                ('huella_solicitud', models.CharField(help_text='SHA-256 del cuerpo de la solicitud original', max_length=64, verbose_name='Huella de la Solicitud')),
+                ('estado', models.CharField(choices=[('en_proceso', 'En Proceso'), ('completada', 'Completada')], default='en_proceso', max_length=20, verbose_name='Estado')),
+                ('codigo_respuesta', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Código de Respuesta')),
+                ('tipo_contenido', models.CharField(blank=True, max_length=100, verbose_name='Tipo de Contenido')),
+                ('cuerpo_respuesta', models.TextField(blank=True, verbose_name='Cuerpo de la Respuesta')),
+                ('huella_respuesta', models.CharField(blank=True, max_length=64, verbose_name='Huella de la Respuesta')),
+                ('fecha_creacion', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Creación')),
+                ('fecha_bloqueo', models.DateTimeField(default=django.utils.timezone.now, help_text='Momento en que una solicitud tomó la clave para ejecutarla', verbose_name='Fecha de Bloqueo')),
+                ('fecha_expiracion', models.DateTimeField(db_index=True, verbose_name='Fecha de Expiración')),
+            ],
+            options={
+                'verbose_name': 'Clave de Idempotencia',
+                'verbose_name_plural': 'Claves de Idempotencia',
+                'db_table': 'claves_idempotencia',
+            },
+        ),
+    ]
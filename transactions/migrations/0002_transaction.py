@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:22
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Transaction',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('tipo', models.CharField(choices=[('transferencia', 'Transferencia'), ('deposito', 'Depósito'), ('retiro', 'Retiro'), ('pago_servicio', 'Pago de Servicio')], max_length=20, verbose_name='Tipo de Transacción')),
+                ('monto', models.DecimalField(decimal_places=2, max_digits=18, verbose_name='Monto')),
+                ('moneda', models.CharField(default='PYG', max_length=3, verbose_name='Moneda')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('completada', 'Completada'), ('revertida', 'Revertida')], default='completada', max_length=20, verbose_name='Estado')),
+                ('referencia', models.CharField(blank=True, max_length=64, verbose_name='Referencia')),
+                ('descripcion', models.CharField(blank=True, max_length=255, verbose_name='Descripción')),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha')),
+                ('cuenta_destino', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='creditos', to='accounts.account', verbose_name='Cuenta Destino')),
+                ('cuenta_origen', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='debitos', to='accounts.account', verbose_name='Cuenta Origen')),
+            ],
+            options={
+                'verbose_name': 'Transacción',
+                'verbose_name_plural': 'Transacciones',
+                'db_table': 'transacciones',
+                'ordering': ['-fecha'],
+                'indexes': [models.Index(fields=['cuenta_origen', 'fecha'], name='trx_origen_fecha_idx'), models.Index(fields=['cuenta_destino', 'fecha'], name='trx_destino_fecha_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0001_initial'),
+        ('transactions', '0002_transaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='departamento',
+            field=models.CharField(blank=True, choices=[('Concepción', 'Concepción'), ('San Pedro', 'San Pedro'), ('Cordillera', 'Cordillera'), ('Guairá', 'Guairá'), ('Caaguazú', 'Caaguazú'), ('Caazapá', 'Caazapá'), ('Itapúa', 'Itapúa'), ('Misiones', 'Misiones'), ('Paraguarí', 'Paraguarí'), ('Alto Paraná', 'Alto Paraná'), ('Central', 'Central'), ('Ñeembucú', 'Ñeembucú'), ('Amambay', 'Amambay'), ('Canindeyú', 'Canindeyú'), ('Presidente Hayes', 'Presidente Hayes'), ('Alto Paraguay', 'Alto Paraguay'), ('Boquerón', 'Boquerón'), ('Capital', 'Capital')], max_length=30, verbose_name='Departamento'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='dispositivo',
+            field=models.CharField(blank=True, max_length=64, verbose_name='Dispositivo'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='tarjeta',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='transacciones', to='cards.card', verbose_name='Tarjeta'),
+        ),
+        migrations.CreateModel(
+            name='FraudScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('puntaje', models.PositiveSmallIntegerField(verbose_name='Puntaje')),
+                ('nivel', models.CharField(choices=[('bajo', 'Bajo'), ('medio', 'Medio'), ('alto', 'Alto')], db_index=True, max_length=10, verbose_name='Nivel de Riesgo')),
+                ('motivos', models.JSONField(blank=True, default=list, verbose_name='Motivos')),
+                ('fecha_calculo', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de Cálculo')),
+                ('transaccion', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='puntaje_fraude', to='transactions.transaction', verbose_name='Transacción')),
+            ],
+            options={
+                'verbose_name': 'Puntaje de Fraude',
+                'verbose_name_plural': 'Puntajes de Fraude',
+                'db_table': 'puntajes_fraude',
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_account_numero_cuenta'),
+        ('cards', '0002_alter_card_numero'),
+        ('transactions', '0003_transaction_departamento_transaction_dispositivo_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='terminal',
+            field=models.CharField(blank=True, max_length=20, verbose_name='Terminal'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['terminal', 'fecha', 'referencia'], name='trx_terminal_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0004_transaction_terminal'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='fraudscore',
+            name='transaccion',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='puntaje_fraude', to='transactions.transaction', verbose_name='Transacción'),
+        ),
+    ]
@@ -1,3 +1,219 @@
+import uuid
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from users.models import Role
+from users.scoping import ALL, AssignedTo, OwnedBy, ScopedManager
+
+
+class Transaction(models.Model):
+    """
+    Modelo de Transacciones (movimientos entre cuentas)
+    """
+
+    class TransactionType(models.TextChoices):
+        TRANSFERENCIA = 'transferencia', 'Transferencia'
+        DEPOSITO = 'deposito', 'Depósito'
+        RETIRO = 'retiro', 'Retiro'
+        PAGO_SERVICIO = 'pago_servicio', 'Pago de Servicio'
+
+    class TransactionStatus(models.TextChoices):
+        PENDIENTE = 'pendiente', 'Pendiente'
+        COMPLETADA = 'completada', 'Completada'
+        REVERTIDA = 'revertida', 'Revertida'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tipo = models.CharField(
+        max_length=20,
+        choices=TransactionType.choices,
+        verbose_name='Tipo de Transacción'
+    )
+    cuenta_origen = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='debitos',
+        verbose_name='Cuenta Origen'
+    )
+    cuenta_destino = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='creditos',
+        verbose_name='Cuenta Destino'
+    )
+    monto = models.DecimalField(max_digits=18, decimal_places=2, verbose_name='Monto')
+    moneda = models.CharField(
+        max_length=3,
+        default=settings.DEFAULT_CURRENCY,
+        verbose_name='Moneda'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=TransactionStatus.choices,
+        default=TransactionStatus.COMPLETADA,
+        verbose_name='Estado'
+    )
+    tarjeta = models.ForeignKey(
+        'cards.Card',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='transacciones',
+        verbose_name='Tarjeta'
+    )
+    referencia = models.CharField(max_length=64, blank=True, verbose_name='Referencia')
+    descripcion = models.CharField(max_length=255, blank=True, verbose_name='Descripción')
+    fecha = models.DateTimeField(default=timezone.now, verbose_name='Fecha')
+
+    # Terminal de efectivo (atms.ATM.codigo) de depósitos y retiros; se concilia contra su diario
+    terminal = models.CharField(max_length=20, blank=True, verbose_name='Terminal')
+
+    # Contexto de origen (usado por el scoring de fraude)
+    dispositivo = models.CharField(max_length=64, blank=True, verbose_name='Dispositivo')
+    departamento = models.CharField(
+        max_length=30,
+        blank=True,
+        choices=[(departamento, departamento) for departamento in settings.PARAGUAY_DEPARTMENTS],
+        verbose_name='Departamento'
+    )
+
+    objects = models.Manager()
+    scoped = ScopedManager({
+        Role.RoleType.ADMINISTRADOR: ALL,
+        Role.RoleType.CAJERO: ALL,
+        Role.RoleType.AUDITOR: ALL,
+        Role.RoleType.EJECUTIVO_CUENTAS: AssignedTo('cuenta_origen__cliente__ejecutivo',
+                                                    'cuenta_destino__cliente__ejecutivo'),
+        Role.RoleType.CLIENTE: OwnedBy('cuenta_origen__cliente', 'cuenta_destino__cliente'),
+    })
+
+    class Meta:
+        verbose_name = 'Transacción'
+        verbose_name_plural = 'Transacciones'
+        db_table = 'transacciones'
+        ordering = ['-fecha']
+        indexes = [
+            models.Index(fields=['cuenta_origen', 'fecha'], name='trx_origen_fecha_idx'),
+            models.Index(fields=['cuenta_destino', 'fecha'], name='trx_destino_fecha_idx'),
+            models.Index(fields=['terminal', 'fecha', 'referencia'], name='trx_terminal_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.monto} {self.moneda} ({self.get_estado_display()})"
+
+
+class FraudScore(models.Model):
+    """
+    Puntaje de riesgo de fraude calculado para una transacción
+    """
+
+    class RiskLevel(models.TextChoices):
+        BAJO = 'bajo', 'Bajo'
+        MEDIO = 'medio', 'Medio'
+        ALTO = 'alto', 'Alto'
+
+    # Sin restricción en la base: al archivar un mes (core.archive) las
+    # transacciones se borran sin cascada y sus puntajes quedan en la tabla
+    transaccion = models.OneToOneField(
+        Transaction,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='puntaje_fraude',
+        verbose_name='Transacción'
+    )
+    puntaje = models.PositiveSmallIntegerField(verbose_name='Puntaje')
+    nivel = models.CharField(
+        max_length=10,
+        choices=RiskLevel.choices,
+        db_index=True,
+        verbose_name='Nivel de Riesgo'
+    )
+    motivos = models.JSONField(default=list, blank=True, verbose_name='Motivos')
+    fecha_calculo = models.DateTimeField(default=timezone.now, verbose_name='Fecha de Cálculo')
+
+    class Meta:
+        verbose_name = 'Puntaje de Fraude'
+        verbose_name_plural = 'Puntajes de Fraude'
+        db_table = 'puntajes_fraude'
+
+    def __str__(self):
+        return f"{self.puntaje} ({self.get_nivel_display()})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Claves de idempotencia para solicitudes de transferencias y pagos.
+    Cada reintento de un cliente con la misma clave devuelve la respuesta
+    almacenada en lugar de volver a ejecutar la operación.
+    """
+
+    class KeyStatus(models.TextChoices):
+        EN_PROCESO = 'en_proceso', 'En Proceso'
+        COMPLETADA = 'completada', 'Completada'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    clave = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Clave de Idempotencia'
+    )
+    huella_solicitud = models.CharField(
+        max_length=64,
+        verbose_name='Huella de la Solicitud',
+        help_text='SHA-256 del cuerpo de la solicitud original'
+    )
+    estado = models.CharField(
+        max_length=20,
+        choices=KeyStatus.choices,
+        default=KeyStatus.EN_PROCESO,
+        verbose_name='Estado'
+    )
+
+    # Respuesta almacenada
+    codigo_respuesta = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name='Código de Respuesta'
+    )
+    tipo_contenido = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Tipo de Contenido'
+    )
+    cuerpo_respuesta = models.TextField(blank=True, verbose_name='Cuerpo de la Respuesta')
+    huella_respuesta = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name='Huella de la Respuesta'
+    )
+
+    # Control de vigencia
+    fecha_creacion = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Fecha de Creación'
+    )
+    fecha_bloqueo = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Fecha de Bloqueo',
+        help_text='Momento en que una solicitud tomó la clave para ejecutarla'
+    )
+    fecha_expiracion = models.DateTimeField(
+        db_index=True,
+        verbose_name='Fecha de Expiración'
+    )
+
+    class Meta:
+        verbose_name = 'Clave de Idempotencia'
+        verbose_name_plural = 'Claves de Idempotencia'
+        db_table = 'claves_idempotencia'
+
+    def __str__(self):
+        return f"{self.clave} ({self.get_estado_display()})"
+
+    def is_expired(self):
+        """Verifica si la clave ya venció"""
+        return self.fecha_expiracion <= timezone.now()
@@ -1,3 +1,286 @@
-from django.test import TestCase
+import json
+import logging
+import threading
+import uuid
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Account
+from clients.models import Client
+
+from .idempotency import (
+    REPLAYED_HEADER,
+    IdempotencyKeyReused,
+    IdempotencyOwnershipLost,
+    StoredResponse,
+    execute_once,
+    idempotent,
+)
+from .models import IdempotencyKey, Transaction
+from .transfers import (
+    InsufficientFunds,
+    InvalidTransfer,
+    TransferError,
+    TransferRequest,
+    execute_batch,
+    execute_transfer,
+    plan_waves,
+)
+
+
+def create_accounts(*saldos):
+    """Cuentas activas en PYG de un mismo cliente con los saldos dados"""
+    cliente = Client.objects.create(nombres='Ana', apellidos='Benítez')
+    return [Account.objects.create(cliente=cliente, saldo=Decimal(saldo)) for saldo in saldos]
+
+
+class Operation:
+    """Operación de prueba que cuenta sus ejecuciones"""
+
+    def __init__(self, status_code=201, body='{"ok": true}', before=None):
+        self.calls = 0
+        self.status_code = status_code
+        self.body = body
+        self.before = before
+
+    def __call__(self):
+        self.calls += 1
+        if self.before is not None:
+            self.before()
+        return StoredResponse(self.status_code, self.body)
+
+
+class ExecuteOnceTests(TestCase):
+    def test_replays_stored_response(self):
+        operation = Operation()
+        first, replayed_first = execute_once('clave', 'huella', operation)
+        second, replayed_second = execute_once('clave', 'huella', operation)
+
+        self.assertEqual(operation.calls, 1)
+        self.assertFalse(replayed_first)
+        self.assertTrue(replayed_second)
+        self.assertEqual(second, first)
+        self.assertEqual(IdempotencyKey.objects.get(clave='clave').estado, IdempotencyKey.KeyStatus.COMPLETADA)
+
+    def test_key_reused_with_other_request(self):
+        execute_once('clave', 'huella', Operation())
+        with self.assertRaises(IdempotencyKeyReused):
+            execute_once('clave', 'otra-huella', Operation())
+
+    def test_server_errors_are_not_stored(self):
+        failing = Operation(status_code=503)
+        response, _ = execute_once('clave', 'huella', failing)
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(IdempotencyKey.objects.filter(clave='clave').exists())
+
+        retry = Operation()
+        response, replayed = execute_once('clave', 'huella', retry)
+        self.assertEqual((response.status_code, replayed, retry.calls), (201, False, 1))
+
+    def test_exception_releases_key(self):
+        def boom():
+            raise RuntimeError('falla')
+
+        with self.assertRaises(RuntimeError):
+            execute_once('clave', 'huella', boom)
+        self.assertFalse(IdempotencyKey.objects.filter(clave='clave').exists())
+
+    def test_stale_key_is_taken_over(self):
+        now = timezone.now()
+        IdempotencyKey.objects.create(
+            clave='clave',
+            huella_solicitud='huella',
+            fecha_bloqueo=now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT + 1),
+            fecha_expiracion=now + timedelta(hours=1),
+        )
+        operation = Operation()
+        response, replayed = execute_once('clave', 'huella', operation, wait_timeout=0)
+
+        self.assertEqual((response.status_code, replayed, operation.calls), (201, False, 1))
+        self.assertEqual(IdempotencyKey.objects.get(clave='clave').estado, IdempotencyKey.KeyStatus.COMPLETADA)
+
+    def test_owner_that_lost_the_key_does_not_overwrite_the_response(self):
+        takeover = Operation(body='{"dueño": "segundo"}')
+
+        def hang_and_get_taken_over():
+            # La solicitud original queda colgada más del plazo y otra toma la clave
+            IdempotencyKey.objects.filter(clave='clave').update(
+                fecha_bloqueo=timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT + 1)
+            )
+            execute_once('clave', 'huella', takeover, wait_timeout=0)
+
+        original = Operation(body='{"dueño": "primero"}', before=hang_and_get_taken_over)
+        with self.assertRaises(IdempotencyOwnershipLost):
+            execute_once('clave', 'huella', original)
+
+        self.assertEqual((original.calls, takeover.calls), (1, 1))
+        stored, replayed = execute_once('clave', 'huella', Operation())
+        self.assertTrue(replayed)
+        self.assertEqual(json.loads(stored.body), {'dueño': 'segundo'})
+
+
+class IdempotentViewTests(TestCase):
+    def setUp(self):
+        self.calls = 0
+
+        @idempotent('prueba')
+        def view(request):
+            self.calls += 1
+            return JsonResponse({'llamada': self.calls}, status=201)
+
+        self.view = view
+        self.factory = RequestFactory()
+
+    def post(self, path='/pagos/', key='abc', body='{"monto": 100}'):
+        return self.view(self.factory.post(
+            path, body, content_type='application/json', headers={'Idempotency-Key': key}
+        ))
+
+    def test_retry_is_replayed(self):
+        first = self.post()
+        second = self.post()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.content, first.content)
+        self.assertNotIn(REPLAYED_HEADER, first)
+        self.assertEqual(second[REPLAYED_HEADER], 'true')
+
+    def test_query_string_is_part_of_the_request(self):
+        self.post('/pagos/?cuenta=1')
+        response = self.post('/pagos/?cuenta=2')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        for _ in range(2):
+            self.view(self.factory.post('/pagos/', '{}', content_type='application/json'))
+        self.assertEqual(self.calls, 2)
+
+
+# El scoring inline se cubre aparte; aquí solo interesa el libro mayor
+@override_settings(FRAUD_INLINE_SCORING=False)
+class IdempotentTransferTests(TestCase):
+    def setUp(self):
+        self.origen, self.destino = create_accounts(1000, 0)
+
+    def test_retry_returns_the_same_transaction(self):
+        first = execute_transfer(self.origen.pk, self.destino.pk, 300, idempotency_key='pago-1')
+        second = execute_transfer(self.origen.pk, self.destino.pk, 300, idempotency_key='pago-1')
+
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(Transaction.objects.count(), 1)
+        self.origen.refresh_from_db()
+        self.assertEqual(self.origen.saldo, Decimal(700))
+
+    def test_retry_repeats_the_rejection(self):
+        for _ in range(2):
+            with self.assertRaises(InsufficientFunds):
+                execute_transfer(self.origen.pk, self.destino.pk, 5000, idempotency_key='pago-1')
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_key_reused_with_other_amount(self):
+        execute_transfer(self.origen.pk, self.destino.pk, 300, idempotency_key='pago-1')
+        with self.assertRaises(IdempotencyKeyReused):
+            execute_transfer(self.origen.pk, self.destino.pk, 400, idempotency_key='pago-1')
+
+
+class PlanWavesTests(SimpleTestCase):
+    def test_waves_have_disjoint_accounts_and_keep_order_per_account(self):
+        a, b, c, d = (uuid.uuid4() for _ in range(4))
+        requests = [TransferRequest(origen, destino, 1) for origen, destino in [(a, b), (c, d), (b, c), (a, d)]]
+
+        self.assertEqual(plan_waves(requests, batch_size=10), [[0, 1], [2, 3]])
+        self.assertEqual(plan_waves(requests, batch_size=1), [[0], [1], [2], [3]])
+
+
+@override_settings(FRAUD_INLINE_SCORING=False)
+class ExecuteBatchTests(TestCase):
+    def test_transfers_on_the_same_account_apply_in_order(self):
+        a, b, c = create_accounts(100, 0, 0)
+        # b recibe antes de enviar: en otro orden la segunda no tendría saldo
+        results = execute_batch([
+            TransferRequest(a.pk, b.pk, 60),
+            TransferRequest(b.pk, c.pk, 50),
+            TransferRequest(b.pk, c.pk, 50),
+        ])
+
+        self.assertEqual([result.ok for result in results], [True, True, False])
+        self.assertIsInstance(results[2].error, InsufficientFunds)
+        saldos = dict(Account.objects.values_list('pk', 'saldo'))
+        self.assertEqual((saldos[a.pk], saldos[b.pk], saldos[c.pk]), (40, 10, 50))
+        self.assertEqual(Transaction.objects.count(), 2)
+
+    def test_invalid_requests_are_rejected_without_touching_accounts(self):
+        a, b = create_accounts(100, 0)
+        results = execute_batch([TransferRequest(a.pk, a.pk, 10), TransferRequest(a.pk, b.pk, 0)])
+
+        self.assertTrue(all(isinstance(result.error, InvalidTransfer) for result in results))
+        a.refresh_from_db()
+        self.assertEqual((a.saldo, a.version), (100, 0))
+
+
+class ConcurrentTransferTests(TransactionTestCase):
+    THREADS = 4
+    TRANSFERS_PER_THREAD = 25
+
+    def setUp(self):
+        # La base de pruebas en memoria bloquea por tabla: vencer widgets o guardar
+        # puntajes tras una transferencia puede fallar, y eso solo se registra
+        for name in ('banco.dashboard', 'banco.transfers'):
+            logger = logging.getLogger(name)
+            logger.disabled = True
+            self.addCleanup(setattr, logger, 'disabled', False)
+
+    def test_no_lost_updates(self):
+        accounts = create_accounts(10000, 10000, 10000)
+        ids = [account.pk for account in accounts]
+        posted = []
+        errors = []
+        start = threading.Barrier(self.THREADS)
+
+        def worker(offset):
+            try:
+                start.wait()
+                for step in range(self.TRANSFERS_PER_THREAD):
+                    # Direcciones opuestas entre hilos: A→B compite con B→A
+                    origen = ids[(offset + step) % 3]
+                    destino = ids[(offset + step + 1 + offset % 2) % 3]
+                    monto = Decimal(step % 7 + 1)
+                    try:
+                        execute_transfer(origen, destino, monto)
+                    except TransferError:
+                        continue
+                    posted.append((origen, destino, monto))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertTrue(posted)
+        expected = {pk: Decimal(10000) for pk in ids}
+        touched = dict.fromkeys(ids, 0)
+        for origen, destino, monto in posted:
+            expected[origen] -= monto
+            expected[destino] += monto
+            touched[origen] += 1
+            touched[destino] += 1
+
+        # Cada transferencia registrada se refleja en ambos saldos exactamente una vez
+        for account in Account.objects.filter(pk__in=ids):
+            self.assertEqual(account.saldo, expected[account.pk])
+            self.assertEqual(account.version, touched[account.pk])
+        self.assertEqual(Transaction.objects.count(), len(posted))
@@ -0,0 +1,338 @@
+"""
+Ejecutor de transferencias entre cuentas libre de interbloqueos.
+
+- En motores con SELECT ... FOR UPDATE (PostgreSQL) las filas de las cuentas se
+  bloquean siempre en orden canónico de clave primaria, por lo que dos
+  transferencias opuestas (A→B y B→A) nunca se esperan mutuamente.
+- En SQLite, que no soporta bloqueos de fila, se usa control optimista con la
+  columna `Account.version`: el UPDATE solo aplica si nadie cambió la cuenta
+  desde la lectura, y ante un conflicto se reintenta un número acotado de veces.
+- `execute_batch` agrupa transferencias en olas de cuentas disjuntas y aplica
+  cada ola en una sola transacción de base de datos.
+- `execute_transfer` acepta una clave de idempotencia: los reintentos con la
+  misma clave retornan el resultado de la primera ejecución sin repetirla.
+"""
+import json
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from functools import partial, reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import DatabaseError, OperationalError, connection, transaction
+from django.db.models import Case, DecimalField, F, Q, Value, When
+
+from accounts.models import Account
+from core import metrics
+from core.dashboard import mark_stale
+from notifications.outbox import enqueue, transfer_receipts
+from .fraud import inline_scoring_enabled, score_transactions
+from .idempotency import StoredResponse, execute_once, fingerprint
+from .models import Transaction
+
+logger = logging.getLogger('banco.transfers')
+
+
+class TransferError(Exception):
+    """Error base de las transferencias"""
+
+
+class InvalidTransfer(TransferError):
+    """La solicitud de transferencia no es válida"""
+
+
+class AccountUnavailable(TransferError):
+    """La cuenta no existe o no está activa"""
+
+
+class InsufficientFunds(TransferError):
+    """La cuenta origen no tiene saldo suficiente"""
+
+
+class TransferConflict(TransferError):
+    """Se agotaron los reintentos por contención sobre las cuentas"""
+
+
+TRANSFER_ERRORS = {
+    error.__name__: error for error in (InvalidTransfer, AccountUnavailable, InsufficientFunds, TransferConflict)
+}
+
+
+class _VersionConflict(Exception):
+    """Otra transacción modificó una cuenta entre la lectura y la escritura"""
+
+
+@dataclass
+class TransferRequest:
+    """
+    Solicitud de transferencia entre dos cuentas
+    """
+    cuenta_origen_id: object
+    cuenta_destino_id: object
+    monto: Decimal
+    referencia: str = ''
+    descripcion: str = ''
+    dispositivo: str = ''
+    departamento: str = ''
+
+    def __post_init__(self):
+        to_pk = Account._meta.pk.to_python
+        self.cuenta_origen_id = to_pk(self.cuenta_origen_id)
+        self.cuenta_destino_id = to_pk(self.cuenta_destino_id)
+        self.monto = Decimal(self.monto)
+
+    def account_ids(self):
+        return self.cuenta_origen_id, self.cuenta_destino_id
+
+
+@dataclass
+class TransferResult:
+    """
+    Resultado de una transferencia: la transacción registrada o el error
+    """
+    request: TransferRequest
+    transaction: Transaction = None
+    error: TransferError = None
+    attempts: int = 1
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def execute_transfer(cuenta_origen_id, cuenta_destino_id, monto, idempotency_key=None, **extra):
+    """
+    Ejecuta una transferencia y retorna la transacción registrada.
+    Lanza una subclase de TransferError si la transferencia es rechazada.
+
+    Con `idempotency_key` la transferencia se ejecuta una sola vez por clave y
+    cuenta origen: un reintento retorna la misma transacción o repite el mismo
+    rechazo, y reutilizar la clave con otros datos lanza IdempotencyKeyReused.
+    Los conflictos de contención no se almacenan, así que pueden reintentarse.
+    """
+    request = TransferRequest(cuenta_origen_id, cuenta_destino_id, monto, **extra)
+    if idempotency_key is None:
+        result = execute_batch([request])[0]
+        if result.error is not None:
+            raise result.error
+        return result.transaction
+
+    stored, _ = execute_once(
+        f"transferencia:{request.cuenta_origen_id}:{idempotency_key}",
+        fingerprint(asdict(request)),
+        partial(_stored_transfer, request),
+    )
+    data = json.loads(stored.body)
+    if 'error' in data:
+        raise TRANSFER_ERRORS[data['error']](data['detalle'])
+    return Transaction.objects.get(pk=data['transaccion'])
+
+
+def execute_batch(requests, batch_size=None):
+    """
+    Ejecuta muchas transferencias y retorna un TransferResult por solicitud,
+    en el mismo orden. Las transferencias que tocan una misma cuenta se aplican
+    en el orden recibido.
+    """
+    if batch_size is None:
+        batch_size = settings.TRANSFER_BATCH_SIZE
+
+    results = [None] * len(requests)
+    pending = []
+    for index, request in enumerate(requests):
+        error = _validate_request(request)
+        if error is not None:
+            results[index] = TransferResult(request, error=error)
+        else:
+            pending.append(index)
+
+    for wave in plan_waves([requests[i] for i in pending], batch_size):
+        items = [(pending[i], requests[pending[i]]) for i in wave]
+        for index, result in _execute_wave(items):
+            results[index] = result
+
+    posted = sum(1 for result in results if result.ok)
+    # Asientos por segundo = rate(banco_ledger_postings_total[1m]) en Prometheus
+    if posted:
+        metrics.LEDGER_POSTINGS.inc('registrada', amount=posted)
+    if posted < len(results):
+        metrics.LEDGER_POSTINGS.inc('rechazada', amount=len(results) - posted)
+
+    if posted:
+        if inline_scoring_enabled():
+            _score([result.transaction for result in results if result.ok])
+        # update() y bulk_create() no emiten señales: se invalidan los widgets a mano
+        mark_stale('accounts.Account', 'transactions.Transaction', 'transactions.FraudScore')
+
+    return results
+
+
+def _score(movements):
+    try:
+        score_transactions(movements)
+    except DatabaseError:
+        # Las olas ya se confirmaron: un error aquí no debe hacer creer al llamador
+        # que las transferencias fallaron. rescore_fraud recupera los que falten.
+        logger.warning("No se pudieron guardar los puntajes de %s transferencias", len(movements), exc_info=True)
+
+
+def _stored_transfer(request):
+    result = execute_batch([request])[0]
+    if result.ok:
+        return StoredResponse(201, json.dumps({'transaccion': str(result.transaction.pk)}))
+    # 503: execute_once no guarda errores del servidor, así un conflicto se reintenta
+    status = 503 if isinstance(result.error, TransferConflict) else 422
+    return StoredResponse(status, json.dumps({'error': type(result.error).__name__, 'detalle': str(result.error)}))
+
+
+def plan_waves(requests, batch_size):
+    """
+    Agrupa las solicitudes en olas cuyas cuentas son disjuntas.
+
+    Cada solicitud va a la primera ola posterior a la última que usó alguna de
+    sus cuentas, lo que preserva el orden por cuenta. Retorna listas de índices.
+    """
+    waves = []
+    next_wave = {}
+    for index, request in enumerate(requests):
+        wave = max(next_wave.get(account_id, 0) for account_id in request.account_ids())
+        while wave < len(waves) and len(waves[wave]) >= batch_size:
+            wave += 1
+        if wave == len(waves):
+            waves.append([])
+        waves[wave].append(index)
+        for account_id in request.account_ids():
+            next_wave[account_id] = wave + 1
+    return waves
+
+
+def uses_row_locks():
+    """Indica si el motor actual permite bloquear filas con SELECT ... FOR UPDATE"""
+    return connection.features.has_select_for_update
+
+
+def _validate_request(request):
+    if request.cuenta_origen_id == request.cuenta_destino_id:
+        return InvalidTransfer('La cuenta origen y destino no pueden ser la misma')
+    if request.monto <= 0:
+        return InvalidTransfer('El monto debe ser mayor a cero')
+    return None
+
+
+def _execute_wave(items, attempts=0):
+    while True:
+        attempts += 1
+        try:
+            results = _apply_wave(items)
+        except (_VersionConflict, OperationalError):
+            if len(items) > 1:
+                # Las cuentas de una ola son disjuntas: partirla reduce el dominio
+                # del conflicto. Ambas mitades se vuelven a ejecutar y heredan los
+                # intentos ya consumidos, así el total de intentos queda acotado
+                middle = len(items) // 2
+                return _execute_wave(items[:middle], attempts) + _execute_wave(items[middle:], attempts)
+            if attempts >= settings.TRANSFER_MAX_RETRIES:
+                return [
+                    (index, TransferResult(
+                        request,
+                        error=TransferConflict('Cuentas con demasiada contención, intente nuevamente'),
+                        attempts=attempts
+                    ))
+                    for index, request in items
+                ]
+            # Espera exponencial con jitter para desincronizar a los competidores
+            time.sleep(random.uniform(0, 0.005 * 2 ** attempts))
+            continue
+
+        for _, result in results:
+            result.attempts = attempts
+        return results
+
+
+def _apply_wave(items):
+    account_ids = {account_id for _, request in items for account_id in request.account_ids()}
+    queryset = Account.objects.filter(pk__in=account_ids).order_by('pk')
+
+    if uses_row_locks():
+        with transaction.atomic():
+            accounts = {account.pk: account for account in queryset.select_for_update()}
+            return _write_wave(items, accounts)
+
+    # Lectura fuera de la transacción: en SQLite una transacción que lee y luego
+    # escribe falla de inmediato si otro escritor ganó el bloqueo. La versión de
+    # cada cuenta detecta cualquier cambio ocurrido entre la lectura y el UPDATE.
+    accounts = {account.pk: account for account in queryset}
+    with transaction.atomic():
+        return _write_wave(items, accounts)
+
+
+def _write_wave(items, accounts):
+    balances = {pk: account.saldo for pk, account in accounts.items()}
+    results = []
+    movements = []
+    for index, request in items:
+        origen = accounts.get(request.cuenta_origen_id)
+        destino = accounts.get(request.cuenta_destino_id)
+        error = _check_accounts(request, origen, destino, balances)
+        if error is not None:
+            results.append((index, TransferResult(request, error=error)))
+            continue
+
+        balances[origen.pk] -= request.monto
+        balances[destino.pk] += request.monto
+        movement = Transaction(
+            tipo=Transaction.TransactionType.TRANSFERENCIA,
+            cuenta_origen=origen,
+            cuenta_destino=destino,
+            monto=request.monto,
+            moneda=origen.moneda,
+            referencia=request.referencia,
+            descripcion=request.descripcion,
+            dispositivo=request.dispositivo,
+            departamento=request.departamento,
+        )
+        movements.append(movement)
+        results.append((index, TransferResult(request, transaction=movement)))
+
+    changed = [pk for pk, saldo in balances.items() if saldo != accounts[pk].saldo]
+    if changed:
+        # Un solo UPDATE para toda la ola; el filtro por versión detecta escrituras concurrentes
+        updated = Account.objects.filter(
+            reduce(or_, (Q(pk=pk, version=accounts[pk].version) for pk in changed))
+        ).update(
+            saldo=Case(
+                *[When(pk=pk, then=Value(balances[pk])) for pk in changed],
+                output_field=DecimalField(max_digits=18, decimal_places=2)
+            ),
+            version=F('version') + 1,
+        )
+        if updated != len(changed):
+            raise _VersionConflict()
+        Transaction.objects.bulk_create(movements)
+        # Los comprobantes se arman y se guardan recién confirmada la ola, sin
+        # renderizar plantillas con las cuentas bloqueadas. Si la ola se revierte
+        # no se envían; un error al encolarlos se registra sin afectar la ola ya confirmada.
+        transaction.on_commit(partial(_enqueue_receipts, movements), robust=True)
+
+    return results
+
+
+def _enqueue_receipts(movements):
+    enqueue(transfer_receipts(movements))
+
+
+def _check_accounts(request, origen, destino, balances):
+    if origen is None or destino is None:
+        return AccountUnavailable('La cuenta origen o destino no existe')
+    if not origen.is_activa():
+        return AccountUnavailable(f'La cuenta {origen.numero_cuenta} no está activa')
+    if not destino.is_activa():
+        return AccountUnavailable(f'La cuenta {destino.numero_cuenta} no está activa')
+    if origen.moneda != destino.moneda:
+        return InvalidTransfer('Las cuentas deben tener la misma moneda')
+    if balances[origen.pk] < request.monto:
+        return InsufficientFunds(f'Saldo insuficiente en la cuenta {origen.numero_cuenta}')
+    return None
@@ -1,7 +1,41 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db import transaction
+from django.db.models import Count
+from django.template.response import TemplateResponse
 from django.utils.html import format_html
+from . import bulk
 from .models import SystemUser, Role, Permission, RolePermission
+from .permissions import invalidate_roles
+
+
+def _change_permissions(modeladmin, request, queryset, grant):
+    """
+    Acción con página intermedia: elegir los permisos y aplicarlos a todos los
+    roles seleccionados con una sola sentencia
+    """
+    if request.POST.get('apply'):
+        permissions = Permission.objects.filter(pk__in=request.POST.getlist('permissions'))
+        if not permissions:
+            modeladmin.message_user(request, 'No se seleccionó ningún permiso.', messages.WARNING)
+            return None
+        operation = bulk.grant_permissions if grant else bulk.revoke_permissions
+        result = operation(list(queryset), list(permissions))
+        verb = 'otorgadas' if grant else 'quitadas'
+        modeladmin.message_user(request, f'{result.changed} asignaciones {verb}.', messages.SUCCESS)
+        return None
+
+    return TemplateResponse(request, 'admin/users/role/change_permissions.html', {
+        **modeladmin.admin_site.each_context(request),
+        'title': 'Otorgar permisos' if grant else 'Quitar permisos',
+        'opts': modeladmin.model._meta,
+        'roles': queryset,
+        'permissions': Permission.objects.order_by('nombre'),
+        'action': request.POST['action'],
+        'action_checkbox_name': ACTION_CHECKBOX_NAME,
+        'grant': grant,
+    })
 
 
 @admin.register(Role)
@@ -9,18 +43,34 @@ class RoleAdmin(admin.ModelAdmin):
     list_display = ('nombre', 'descripcion', 'count_users', 'count_permissions')
     search_fields = ('nombre', 'descripcion')
     ordering = ('nombre',)
+    actions = ['grant_permissions', 'revoke_permissions']
 
     def count_users(self, obj):
-        count = obj.users.count()
-        return format_html('<span style="font-weight: bold;">{}</span>', count)
+        return format_html('<span style="font-weight: bold;">{}</span>', obj.users_count)
 
     count_users.short_description = 'Usuarios'
+    count_users.admin_order_field = 'users_count'
 
     def count_permissions(self, obj):
-        count = obj.role_permissions.count()
-        return format_html('<span style="font-weight: bold;">{}</span>', count)
+        return format_html('<span style="font-weight: bold;">{}</span>', obj.permissions_count)
 
     count_permissions.short_description = 'Permisos'
+    count_permissions.admin_order_field = 'permissions_count'
+
+    @admin.action(description='Otorgar permisos a los roles seleccionados')
+    def grant_permissions(self, request, queryset):
+        return _change_permissions(self, request, queryset, grant=True)
+
+    @admin.action(description='Quitar permisos a los roles seleccionados')
+    def revoke_permissions(self, request, queryset):
+        return _change_permissions(self, request, queryset, grant=False)
+
+    def get_queryset(self, request):
+        # Conteos en la misma consulta del listado en lugar de un COUNT por fila
+        return super().get_queryset(request).annotate(
+            users_count=Count('users', distinct=True),
+            permissions_count=Count('role_permissions', distinct=True),
+        )
 
 
 @admin.register(Permission)
@@ -30,10 +80,13 @@ class PermissionAdmin(admin.ModelAdmin):
     ordering = ('nombre',)
 
     def count_roles(self, obj):
-        count = obj.role_permissions.count()
-        return format_html('<span style="font-weight: bold;">{}</span>', count)
+        return format_html('<span style="font-weight: bold;">{}</span>', obj.roles_count)
 
     count_roles.short_description = 'Roles'
+    count_roles.admin_order_field = 'roles_count'
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(roles_count=Count('role_permissions'))
 
 
 @admin.register(RolePermission)
@@ -41,6 +94,24 @@ class RolePermissionAdmin(admin.ModelAdmin):
     list_display = ('role', 'permission')
     list_filter = ('role',)
     search_fields = ('role__nombre', 'permission__nombre')
+    list_select_related = ('role', 'permission')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Si cambió el rol, el anterior también pierde el permiso (post_save solo ve el nuevo)
+        if change and 'role' in form.changed_data:
+            invalidate_roles([form.initial['role']])
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            invalidate_roles([obj.role_id])
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            role_ids = list(queryset.values_list('role_id', flat=True).distinct())
+            super().delete_queryset(request, queryset)
+            invalidate_roles(role_ids)
 
 
 @admin.register(SystemUser)
@@ -50,12 +121,12 @@ class SystemUserAdmin(BaseUserAdmin):
         'intentos_fallidos', 'fecha_ultimo_acceso', 'fecha_creacion'
     )
     list_filter = ('role', 'estado', 'fecha_creacion')
-    search_fields = ('username', 'cliente__nombres', 'cliente__apellidos')
+    search_fields = ('username', 'email', 'cliente__nombres', 'cliente__apellidos')
     ordering = ('-fecha_creacion',)
 
     fieldsets = (
         (None, {
-            'fields': ('username', 'password')
+            'fields': ('username', 'email', 'password')
         }),
         ('Información de Rol', {
             'fields': ('role', 'cliente')
@@ -76,11 +147,12 @@ class SystemUserAdmin(BaseUserAdmin):
     add_fieldsets = (
         (None, {
             'classes': ('wide',),
-            'fields': ('username', 'role', 'password1', 'password2', 'estado'),
+            'fields': ('username', 'email', 'role', 'password1', 'password2', 'estado'),
         }),
     )
 
     readonly_fields = ('fecha_creacion', 'fecha_ultimo_acceso', 'is_staff', 'is_superuser')
+    actions = ['sync_staff_flags']
 
     def role_badge(self, obj):
         color_map = {
@@ -117,4 +189,39 @@ class SystemUserAdmin(BaseUserAdmin):
     estado_badge.short_description = 'Estado'
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('role', 'cliente')
\ No newline at end of file
+        return super().get_queryset(request).select_related('role', 'cliente')
+
+    def get_actions(self, request):
+        # Una acción "Asignar rol" por rol: un UPDATE para toda la selección
+        actions = super().get_actions(request)
+        if not actions or not self.has_change_permission(request):
+            return actions
+        for nombre, label in Role.RoleType.choices:
+            name = f'assign_role_{nombre}'
+            actions[name] = (_assign_role_action(nombre), name, f'Asignar rol {label}')
+        return actions
+
+    @admin.action(description='Corregir acceso al admin según el rol')
+    def sync_staff_flags(self, request, queryset):
+        result = bulk.sync_staff_flags(queryset)
+        self.message_user(request, f'{result.changed} usuarios corregidos.', messages.SUCCESS)
+
+
+def _assign_role_action(nombre):
+    def action(modeladmin, request, queryset):
+        role = Role.objects.filter(nombre=nombre).first()
+        if role is None:
+            modeladmin.message_user(request, f'No existe el rol {nombre}.', messages.ERROR)
+            return
+        try:
+            result = bulk.reassign_role(queryset, role, actor=request.user, request=request)
+        except bulk.RoleChangeRejected as exc:
+            modeladmin.message_user(request, str(exc), messages.ERROR)
+            return
+        modeladmin.message_user(
+            request,
+            f'{result.changed} usuarios pasaron a {role.get_nombre_display()} '
+            f'({result.unchanged} ya lo tenían).',
+            messages.SUCCESS
+        )
+    return action
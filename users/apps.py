@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from .permissions import connect_signals
+
+        # Invalida la caché de permisos por rol ante cambios en las asignaciones
+        connect_signals()
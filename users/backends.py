@@ -1,6 +1,9 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
 
+from audits.models import AuditEvent
+from core import metrics
+
 User = get_user_model()
 
 
@@ -14,20 +17,30 @@ class SystemUserBackend(ModelBackend):
             # Buscar usuario por username
             user = User.objects.select_related('role').get(username=username)
         except User.DoesNotExist:
+            metrics.LOGINS.inc('desconocido')
             return None
 
         # Verificar si está bloqueado
         if user.estado == User.UserStatus.BLOQUEADO:
+            metrics.LOGINS.inc('bloqueado')
             return None
 
         # Verificar contraseña
         if user.check_password(password):
             # Resetear intentos fallidos
             user.reset_failed_attempts()
+            AuditEvent.record(AuditEvent.EventType.LOGIN_EXITOSO, user, request=request)
+            metrics.LOGINS.inc('exitoso')
             return user
         else:
             # Incrementar intentos fallidos
             user.increment_failed_attempts()
+            AuditEvent.record(
+                AuditEvent.EventType.LOGIN_FALLIDO, user, request=request,
+                intentos=user.intentos_fallidos
+            )
+            # 'bloqueo': este intento fallido dejó la cuenta bloqueada
+            metrics.LOGINS.inc('bloqueo' if user.estado == User.UserStatus.BLOQUEADO else 'fallido')
             return None
 
     def get_user(self, user_id):
@@ -0,0 +1,155 @@
+"""
+Administración masiva de roles y permisos.
+
+`SystemUser.save()` deriva `is_staff`/`is_superuser` del rol, pero guardar
+miles de usuarios uno por uno cuesta una o dos consultas por usuario. Estas
+operaciones resuelven el cambio con sentencias por conjunto (UPDATE, DELETE y
+bulk_create) y mantienen la misma invariante: solo el rol administrador tiene
+acceso al admin de Django y es superusuario.
+
+Cada operación corre en una transacción y registra los cambios de rol en la
+bitácora de auditoría.
+"""
+from dataclasses import dataclass
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Q
+
+from audits.models import AuditEvent
+from .models import Permission, Role, RolePermission, SystemUser
+from .permissions import invalidate_roles
+
+
+class RoleChangeRejected(ValueError):
+    """El cambio de rol dejaría al sistema sin administradores o al actor sin su rol"""
+
+
+@dataclass
+class BulkResult:
+    """
+    Filas afectadas por una operación masiva
+    """
+    changed: int = 0
+    unchanged: int = 0
+
+
+def staff_flags(role):
+    """Valores de is_staff/is_superuser que corresponden al rol"""
+    is_admin = role.nombre == Role.RoleType.ADMINISTRADOR
+    return {'is_staff': is_admin, 'is_superuser': is_admin}
+
+
+def reassign_role(users, role, actor=None, request=None, batch_size=2000):
+    """
+    Asigna `role` a los usuarios del queryset `users` con un solo UPDATE por
+    conjunto. Los que ya tenían el rol no se tocan. Lanza RoleChangeRejected
+    si el cambio dejaría el sistema sin administradores o si `actor` se
+    quitaría a sí mismo el rol administrador.
+    """
+    users = users.order_by()
+    changing = users.exclude(role=role)
+    with transaction.atomic():
+        if role.nombre != Role.RoleType.ADMINISTRADOR:
+            _check_admins_remain(changing, actor)
+
+        result = BulkResult(unchanged=users.filter(role=role).count())
+        # La bitácora necesita el rol anterior: se escribe por lotes antes del UPDATE
+        ip = request.META.get('REMOTE_ADDR') if request is not None else None
+        previous = changing.values_list('pk', 'role__nombre').iterator(chunk_size=batch_size)
+        while batch := list(islice(previous, batch_size)):
+            AuditEvent.objects.bulk_create([
+                AuditEvent(
+                    tipo=AuditEvent.EventType.CAMBIO_ROL,
+                    usuario_id=pk,
+                    descripcion=f'Rol {anterior} → {role.nombre}',
+                    detalle={
+                        'rol_anterior': anterior,
+                        'rol_nuevo': role.nombre,
+                        'por': actor.username if actor is not None else None,
+                    },
+                    ip=ip,
+                )
+                for pk, anterior in batch
+            ])
+        result.changed = changing.update(role=role, **staff_flags(role))
+    return result
+
+
+def _check_admins_remain(changing, actor):
+    admins = changing.filter(role__nombre=Role.RoleType.ADMINISTRADOR)
+    if actor is not None and admins.filter(pk=actor.pk).exists():
+        raise RoleChangeRejected('No puede quitarse a sí mismo el rol administrador')
+    others = SystemUser.objects.filter(role__nombre=Role.RoleType.ADMINISTRADOR).exclude(
+        pk__in=admins.values('pk')
+    )
+    if admins.exists() and not others.exists():
+        raise RoleChangeRejected('El sistema debe conservar al menos un administrador')
+
+
+def grant_permissions(roles, permissions):
+    """
+    Otorga todos los `permissions` a todos los `roles` con un solo INSERT.
+    Las asignaciones existentes se mantienen.
+    """
+    role_ids = [role.pk for role in roles]
+    permission_ids = [permission.pk for permission in permissions]
+    with transaction.atomic():
+        existing = set(
+            RolePermission.objects
+            .filter(role_id__in=role_ids, permission_id__in=permission_ids)
+            .values_list('role_id', 'permission_id')
+        )
+        missing = [
+            RolePermission(role_id=role_id, permission_id=permission_id)
+            for role_id in role_ids
+            for permission_id in permission_ids
+            if (role_id, permission_id) not in existing
+        ]
+        # ignore_conflicts cubre una asignación concurrente entre la lectura y el INSERT
+        RolePermission.objects.bulk_create(missing, ignore_conflicts=True)
+        # bulk_create no emite post_save
+        if missing:
+            invalidate_roles(role_ids)
+    return BulkResult(changed=len(missing), unchanged=len(existing))
+
+
+def revoke_permissions(roles, permissions):
+    """Quita los `permissions` de los `roles` con un solo DELETE"""
+    role_ids = [role.pk for role in roles]
+    permission_ids = [permission.pk for permission in permissions]
+    with transaction.atomic():
+        deleted, _ = RolePermission.objects.filter(
+            role_id__in=role_ids, permission_id__in=permission_ids
+        ).delete()
+        if deleted:
+            invalidate_roles(role_ids)
+    return BulkResult(changed=deleted)
+
+
+def sync_staff_flags(users=None):
+    """
+    Corrige los usuarios cuyos is_staff/is_superuser no coinciden con su rol
+    (por ejemplo, tras cambios hechos con UPDATE directos). Dos UPDATE en total.
+    `users` acota la corrección a un queryset; por defecto, todos los usuarios.
+    """
+    if users is None:
+        users = SystemUser.objects.all()
+    admin = Q(role__nombre=Role.RoleType.ADMINISTRADOR)
+    with transaction.atomic():
+        granted = users.filter(admin).filter(
+            Q(is_staff=False) | Q(is_superuser=False)
+        ).update(is_staff=True, is_superuser=True)
+        revoked = users.exclude(admin).filter(
+            Q(is_staff=True) | Q(is_superuser=True)
+        ).update(is_staff=False, is_superuser=False)
+    return BulkResult(changed=granted + revoked)
+
+
+def resolve_permissions(names):
+    """Permisos por nombre; lanza ValueError si alguno no existe"""
+    permissions = list(Permission.objects.filter(nombre__in=names))
+    missing = set(names) - {permission.nombre for permission in permissions}
+    if missing:
+        raise ValueError(f"Permisos inexistentes: {', '.join(sorted(missing))}")
+    return permissions
@@ -0,0 +1,26 @@
+from core.dashboard import ignore_updates, widget
+from .models import SystemUser
+
+# Los datos de acceso que se guardan en cada login no cambian este widget:
+# un usuario bloqueado no puede iniciar sesión
+ignore_updates('users.SystemUser', 'last_login', 'intentos_fallidos', 'fecha_ultimo_acceso')
+
+
+@widget(
+    'usuarios_bloqueados',
+    'Usuarios bloqueados',
+    roles=('administrador', 'auditor'),
+    ttl=120,
+    depends_on=('users.SystemUser',),
+    icon='bi-person-lock',
+)
+def blocked_users(user):
+    bloqueados = SystemUser.objects.filter(estado=SystemUser.UserStatus.BLOQUEADO)
+    recientes = bloqueados.select_related('role').order_by('-fecha_ultimo_acceso')[:5]
+    return {
+        'stats': [{'label': 'Bloqueados', 'value': bloqueados.count()}],
+        'table': {
+            'headers': ['Usuario', 'Rol', 'Intentos'],
+            'rows': [[item.username, item.role.get_nombre_display(), item.intentos_fallidos] for item in recientes],
+        },
+    }
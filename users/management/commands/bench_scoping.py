@@ -0,0 +1,83 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import Role, SystemUser
+from users.scoping import OwnedBy, UserMatch
+
+MODELS = ['clients.Client', 'accounts.Account', 'cards.Card', 'loans.Loan', 'transactions.Transaction']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el alcance por rol compilado en la consulta contra el filtrado '
+        'objeto por objeto en Python (cliente y ejecutivo de cuentas)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--models', nargs='+', default=MODELS, help='Modelos app.Modelo a medir')
+        parser.add_argument('--repeat', type=int, default=3, help='Repeticiones; se informa la mejor')
+
+    def handle(self, *args, **options):
+        users = SystemUser.objects.select_related('role').filter(estado=SystemUser.UserStatus.ACTIVO)
+        cliente = users.filter(role__nombre=Role.RoleType.CLIENTE, cliente__isnull=False).first()
+        ejecutivo = users.filter(role__nombre=Role.RoleType.EJECUTIVO_CUENTAS, cartera__isnull=False).first()
+        if cliente is None or ejecutivo is None:
+            raise CommandError(
+                'Se necesita un cliente con usuario y un ejecutivo con cartera (ver generate_bank_data)'
+            )
+
+        for label in options['models']:
+            model = apps.get_model(label)
+            self.stdout.write(f"{label} ({model.objects.count():,} filas)")
+            for user in (cliente, ejecutivo):
+                rule = model.scoped.rules[user.role.nombre]
+                compiled_ids, compiled = self._best(options['repeat'], lambda: set(
+                    model.scoped.for_user(user).values_list('pk', flat=True)
+                ))
+                loop_ids, loop = self._best(options['repeat'], lambda: self._per_object(model, rule, user))
+                if compiled_ids != loop_ids:
+                    raise CommandError(f"{label}: el alcance compilado difiere del filtrado por objeto")
+                self.stdout.write(
+                    f"  {user.role.nombre:<18} {len(compiled_ids):>7,} visibles | "
+                    f"compilado {compiled * 1000:8.1f} ms | por objeto {loop * 1000:9.1f} ms | "
+                    f"{loop / compiled if compiled else 0:,.0f}x"
+                )
+
+        self.stdout.write(self.style.SUCCESS("✓ Alcance compilado y filtrado por objeto coinciden"))
+
+    def _best(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
+    def _per_object(self, model, rule, user):
+        """Línea base: recorrer todas las filas y verificar la regla en Python"""
+        if not isinstance(rule, UserMatch):
+            return set(model.objects.values_list('pk', flat=True))
+
+        value = user.cliente_id if isinstance(rule, OwnedBy) else user.pk
+        paths = [lookup.split('__') for lookup in rule.lookups]
+        related = {'__'.join(parts[:-1]) for parts in paths if len(parts) > 1}
+        queryset = model.objects.select_related(*related) if related else model.objects.all()
+        return {
+            obj.pk for obj in queryset.iterator(chunk_size=2000)
+            if any(_resolve(obj, parts) == value for parts in paths)
+        }
+
+
+def _resolve(obj, parts):
+    for part in parts[:-1]:
+        obj = getattr(obj, part)
+        if obj is None:
+            return None
+    last = parts[-1]
+    if last == 'pk':
+        return obj.pk
+    field = obj._meta.get_field(last)
+    return getattr(obj, field.attname)
@@ -0,0 +1,97 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from users import bulk
+from users.models import Role, SystemUser
+
+ROLE_NAMES = Role.RoleType.values
+
+
+class Command(BaseCommand):
+    help = (
+        'Cambios masivos de roles y permisos con sentencias por conjunto, '
+        'manteniendo is_staff/is_superuser coherentes con el rol'
+    )
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest='operation', required=True)
+
+        assign = subparsers.add_parser('assign', help='Asignar un rol a un conjunto de usuarios')
+        assign.add_argument('--role', required=True, choices=ROLE_NAMES, help='Rol a asignar')
+        assign.add_argument('--users', nargs='+', default=[], help='Usernames')
+        assign.add_argument('--users-file', help='Archivo con un username por línea')
+        assign.add_argument('--from-role', choices=ROLE_NAMES, help='Todos los usuarios con este rol')
+        assign.add_argument('--prefix', help='Usuarios cuyo username empieza con este prefijo')
+
+        for name, description in (('grant', 'Otorgar permisos a roles'), ('revoke', 'Quitar permisos a roles')):
+            sub = subparsers.add_parser(name, help=description)
+            sub.add_argument('--roles', nargs='+', required=True, choices=ROLE_NAMES)
+            sub.add_argument('--permissions', nargs='+', required=True, help='Nombres de permisos')
+
+        subparsers.add_parser('sync-flags', help='Corregir is_staff/is_superuser según el rol')
+
+    def handle(self, *args, **options):
+        operation = options['operation']
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            if operation == 'assign':
+                result, summary = self._assign(options)
+            elif operation in ('grant', 'revoke'):
+                result, summary = self._permissions(options, grant=operation == 'grant')
+            else:
+                result = bulk.sync_staff_flags()
+                summary = f"{result.changed:,} usuarios corregidos"
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {summary} en {(time.perf_counter() - start) * 1000:.0f} ms "
+            f"({len(queries)} consultas)"
+        ))
+
+    def _assign(self, options):
+        role = Role.objects.filter(nombre=options['role']).first()
+        if role is None:
+            raise CommandError(f"No existe el rol {options['role']}")
+
+        usernames = list(options['users'])
+        if options['users_file']:
+            with open(options['users_file'], encoding='utf-8') as handle:
+                usernames.extend(line.strip() for line in handle if line.strip())
+        if not (usernames or options['from_role'] or options['prefix']):
+            raise CommandError('Indicar --users, --users-file, --from-role o --prefix')
+
+        users = SystemUser.objects.all()
+        if usernames:
+            users = users.filter(username__in=usernames)
+            found = set(users.values_list('username', flat=True))
+            missing = set(usernames) - found
+            if missing:
+                raise CommandError(f"Usuarios inexistentes: {', '.join(sorted(missing)[:10])}")
+        if options['from_role']:
+            users = users.filter(role__nombre=options['from_role'])
+        if options['prefix']:
+            users = users.filter(username__startswith=options['prefix'])
+
+        try:
+            result = bulk.reassign_role(users, role)
+        except bulk.RoleChangeRejected as exc:
+            raise CommandError(str(exc))
+        return result, (
+            f"{result.changed:,} usuarios pasaron a {role.get_nombre_display()} "
+            f"({result.unchanged:,} ya lo tenían)"
+        )
+
+    def _permissions(self, options, grant):
+        roles = list(Role.objects.filter(nombre__in=options['roles']))
+        try:
+            permissions = bulk.resolve_permissions(options['permissions'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if grant:
+            result = bulk.grant_permissions(roles, permissions)
+            return result, f"{result.changed:,} asignaciones otorgadas ({result.unchanged:,} ya existían)"
+        result = bulk.revoke_permissions(roles, permissions)
+        return result, f"{result.changed:,} asignaciones quitadas"
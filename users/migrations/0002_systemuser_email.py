@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='systemuser',
+            name='email',
+            field=models.EmailField(blank=True, max_length=254, verbose_name='Correo Electrónico'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_systemuser_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='role',
+            name='version_permisos',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Versión de Permisos'),
+        ),
+    ]
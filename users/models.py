@@ -1,6 +1,6 @@
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 
@@ -24,6 +24,12 @@ class Role(models.Model):
         verbose_name='Nombre del Rol'
     )
     descripcion = models.TextField(verbose_name='Descripción', blank=True)
+    # Se incrementa con cada cambio de permisos del rol (ver users/permissions.py)
+    version_permisos = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Versión de Permisos'
+    )
 
     class Meta:
         verbose_name = 'Rol'
@@ -143,6 +149,10 @@ class SystemUser(AbstractBaseUser, PermissionsMixin):
         verbose_name='Usuario',
         db_index=True
     )
+    email = models.EmailField(
+        blank=True,
+        verbose_name='Correo Electrónico'
+    )
     # password viene de AbstractBaseUser
 
     # Rol
@@ -186,6 +196,7 @@ class SystemUser(AbstractBaseUser, PermissionsMixin):
     objects = SystemUserManager()
 
     USERNAME_FIELD = 'username'
+    EMAIL_FIELD = 'email'
     REQUIRED_FIELDS = []
 
     class Meta:
@@ -199,12 +210,14 @@ class SystemUser(AbstractBaseUser, PermissionsMixin):
 
     def has_permission(self, permission_name):
         """
-        Verifica si el usuario tiene un permiso específico
+        Verifica si el usuario tiene un permiso específico (permisos del rol en
+        caché, validados con la versión del rol cargada junto al usuario)
         """
-        return RolePermission.objects.filter(
-            role=self.role,
-            permission__nombre=permission_name
-        ).exists()
+        from .permissions import role_permissions
+
+        if self.role_id is None:
+            return False
+        return permission_name in role_permissions(self.role_id, self.role.version_permisos)
 
     def get_permissions(self):
         """
@@ -218,10 +231,20 @@ class SystemUser(AbstractBaseUser, PermissionsMixin):
         """
         Incrementa los intentos fallidos y bloquea si es necesario
         """
+        from audits.models import AuditEvent
+        from notifications.outbox import enqueue, lockout_alert
+
         self.intentos_fallidos += 1
-        if self.intentos_fallidos >= 3:
-            self.estado = self.UserStatus.BLOQUEADO
-        self.save()
+        if self.intentos_fallidos < 3:
+            self.save()
+            return
+
+        # El aviso y el evento de auditoría se confirman junto con el bloqueo
+        self.estado = self.UserStatus.BLOQUEADO
+        with transaction.atomic():
+            self.save()
+            AuditEvent.record(AuditEvent.EventType.BLOQUEO, self, 'Bloqueo por intentos fallidos')
+            enqueue(lockout_alert(self))
 
     def reset_failed_attempts(self):
         """
@@ -229,7 +252,7 @@ class SystemUser(AbstractBaseUser, PermissionsMixin):
         """
         self.intentos_fallidos = 0
         self.fecha_ultimo_acceso = timezone.now()
-        self.save()
+        self.save(update_fields=['intentos_fallidos', 'fecha_ultimo_acceso'])
 
     def is_admin(self):
         """Verifica si es administrador"""
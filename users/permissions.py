@@ -0,0 +1,87 @@
+"""
+Caché de permisos por rol.
+
+`SystemUser.has_permission()` se consulta en cada vista protegida. Los
+permisos de un rol se guardan en la caché de Django como un frozenset de
+nombres junto con la versión del rol (`Role.version_permisos`) con que se
+leyeron, y solo se usan si coinciden con la versión vigente. El usuario de
+cada solicitud se carga con su rol (SystemUserBackend.get_user), así que la
+versión llega con esa misma consulta y un acierto de caché no consulta la
+base. Una revocación hecha en cualquier worker rige desde la siguiente
+solicitud en todos, aunque la caché sea local.
+
+Todo cambio en las asignaciones incrementa la versión de los roles
+afectados en la misma transacción: users.bulk y el admin llaman a
+`invalidate_roles()` y las señales cubren los guardados de un solo objeto.
+Cada consulta se cuenta como hit o miss en las métricas.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from core import metrics
+from .models import Role, RolePermission
+
+
+def cache_key(role_id):
+    return f'permisos:rol:{role_id}'
+
+
+def role_permissions(role_id, version=None):
+    """
+    Nombres de los permisos del rol, desde la caché si su versión sigue
+    vigente. Sin `version` se lee la vigente de la base.
+    """
+    if version is None:
+        version = Role.objects.filter(pk=role_id).values_list('version_permisos', flat=True).first()
+        if version is None:
+            return frozenset()
+    key = cache_key(role_id)
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        metrics.PERMISSION_CACHE.inc('hit')
+        return entry[1]
+    metrics.PERMISSION_CACHE.inc('miss')
+    # Leídos después de la versión: a lo sumo más nuevos que ella, nunca más viejos
+    names = frozenset(
+        RolePermission.objects
+        .filter(role_id=role_id)
+        .values_list('permission__nombre', flat=True)
+    )
+    cache.set(key, (version, names), settings.PERMISSION_CACHE_TTL)
+    return names
+
+
+def invalidate_roles(role_ids):
+    """Incrementa la versión de permisos de los roles con un solo UPDATE"""
+    role_ids = set(role_ids)
+    if role_ids:
+        Role.objects.filter(pk__in=role_ids).update(version_permisos=F('version_permisos') + 1)
+
+
+def invalidate_permission(permission):
+    """Un permiso renombrado o eliminado afecta a todos los roles que lo tienen"""
+    invalidate_roles(
+        RolePermission.objects.filter(permission=permission).values_list('role_id', flat=True)
+    )
+
+
+def _role_permission_saved(sender, instance, **kwargs):
+    invalidate_roles([instance.role_id])
+
+
+def _permission_changed(sender, instance, **kwargs):
+    invalidate_permission(instance)
+
+
+def connect_signals():
+    # Sin receptores de borrado de RolePermission: impedirían el DELETE por conjunto
+    # de users.bulk.revoke_permissions, que invalida los roles por su cuenta
+    from django.db.models.signals import post_save, pre_delete
+
+    from .models import Permission
+
+    post_save.connect(_role_permission_saved, sender=RolePermission, dispatch_uid='permisos_rol_guardado')
+    post_save.connect(_permission_changed, sender=Permission, dispatch_uid='permiso_guardado')
+    # Antes del borrado: después ya no quedan las asignaciones para saber qué roles lo tenían
+    pre_delete.connect(_permission_changed, sender=Permission, dispatch_uid='permiso_eliminado')
@@ -0,0 +1,157 @@
+"""
+Alcance de datos por rol (seguridad a nivel de fila).
+
+Cada modelo declara con un `ScopedManager` qué filas ve cada rol:
+
+    scoped = ScopedManager({
+        Role.RoleType.ADMINISTRADOR: ALL,
+        Role.RoleType.EJECUTIVO_CUENTAS: AssignedTo('cliente__ejecutivo'),
+        Role.RoleType.CLIENTE: OwnedBy('cliente'),
+    })
+
+Las reglas se compilan una sola vez por modelo: se validan los caminos de
+lookup y se exige que terminen en una columna indexada (clave primaria o
+foránea), de modo que `Modelo.scoped.for_user(user)` resuelve el alcance en
+la consulta en lugar de revisar objeto por objeto en Python.
+Los roles sin regla no ven ninguna fila.
+"""
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import models
+from django.db.models import Q
+
+# Filtro que Django resuelve como conjunto vacío sin ejecutar SQL
+NOTHING = Q(pk__in=[])
+
+
+class Rule:
+    """
+    Regla base: se compila a una función `user -> Q` para un modelo
+    """
+
+    def compile(self, model):
+        raise NotImplementedError
+
+
+class _All(Rule):
+    """Sin restricción: el rol ve todas las filas"""
+
+    def compile(self, model):
+        return lambda user: Q()
+
+    def __repr__(self):
+        return 'ALL'
+
+
+ALL = _All()
+
+
+class UserMatch(Rule):
+    """
+    Filas cuyo lookup (alguno de ellos) es igual a un atributo del usuario
+    """
+    user_attr = None
+
+    def __init__(self, *lookups):
+        if not lookups:
+            raise ValueError('La regla necesita al menos un lookup')
+        self.lookups = lookups
+
+    def compile(self, model):
+        for lookup in self.lookups:
+            _check_indexed(model, lookup)
+        if len(self.lookups) == 1:
+            terms = [_equals(self.lookups[0])]
+        else:
+            # Un OR entre caminos con joins impide usar los índices; como
+            # subconsultas por clave foránea cada rama usa su propio índice
+            terms = [_via_subquery(model, lookup) for lookup in self.lookups]
+        user_attr = self.user_attr
+
+        def build(user):
+            value = getattr(user, user_attr)
+            if value is None:
+                return NOTHING
+            return reduce(or_, (term(value) for term in terms))
+
+        return build
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(map(repr, self.lookups))})"
+
+
+class OwnedBy(UserMatch):
+    """Filas del cliente vinculado al usuario (`SystemUser.cliente`)"""
+    user_attr = 'cliente_id'
+
+
+class AssignedTo(UserMatch):
+    """Filas cuyo lookup apunta al propio usuario (p. ej. la cartera de un ejecutivo)"""
+    user_attr = 'pk'
+
+
+class ScopedManager(models.Manager):
+    """
+    Manager que aplica el alcance del rol del usuario a las consultas
+    """
+
+    def __init__(self, rules):
+        super().__init__()
+        self.rules = dict(rules)
+        self._compiled = None
+
+    def compiled_rules(self):
+        """Reglas compiladas rol → función, calculadas en el primer uso"""
+        if self._compiled is None:
+            self._compiled = {role: rule.compile(self.model) for role, rule in self.rules.items()}
+        return self._compiled
+
+    def scope_filter(self, user):
+        """Q con las filas visibles para el usuario"""
+        if not user.is_authenticated or not user.is_active:
+            return NOTHING
+        build = self.compiled_rules().get(user.role.nombre)
+        if build is None:
+            return NOTHING
+        return build(user)
+
+    def for_user(self, user):
+        """QuerySet restringido a las filas visibles para el usuario"""
+        return self.get_queryset().filter(self.scope_filter(user))
+
+
+def _equals(lookup):
+    return lambda value: Q(**{lookup: value})
+
+
+def _via_subquery(model, lookup):
+    first, _, rest = lookup.partition('__')
+    field = model._meta.get_field(first)
+    if not rest or not field.many_to_one:
+        return _equals(lookup)
+    related = field.related_model._base_manager
+    return lambda value: Q(**{f'{first}__in': related.filter(**{rest: value}).values('pk')})
+
+
+def _check_indexed(model, lookup):
+    """
+    Valida el camino de un lookup y que la columna final esté indexada
+    """
+    current = model
+    field = None
+    for part in lookup.split('__'):
+        try:
+            field = current._meta.pk if part == 'pk' else current._meta.get_field(part)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(
+                f"Regla de alcance inválida en {model._meta.label}: '{lookup}' no existe"
+            )
+        if field.is_relation:
+            current = field.related_model
+
+    if not any(getattr(field, attr, False) for attr in ('primary_key', 'unique', 'db_index')):
+        raise ImproperlyConfigured(
+            f"Regla de alcance en {model._meta.label}: '{lookup}' no usa una columna indexada"
+        )
@@ -1,3 +1,128 @@
 from django.test import TestCase
 
-# Create your tests here.
+from audits.models import AuditEvent
+from core.testing import QueryBudgetMixin
+
+from .bulk import RoleChangeRejected, grant_permissions, reassign_role, revoke_permissions
+from .models import Permission, Role, RolePermission, SystemUser
+
+
+class AdminChangelistQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Los listados de roles y permisos anotan sus conteos: la cantidad de
+    consultas no crece con la cantidad de filas
+    """
+    # Sesión y usuario, conteo filtrado y total, listado, y el guardado de la
+    # sesión (savepoint, UPDATE y release)
+    BUDGET = 8
+
+    @classmethod
+    def setUpTestData(cls):
+        admin_role = Role.objects.create(nombre=Role.RoleType.ADMINISTRADOR)
+        cls.admin = SystemUser.objects.create_user('admin', 'clave-segura', role=admin_role)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def create_rows(self, start, count):
+        permissions = Permission.objects.bulk_create(
+            Permission(nombre=f'permiso_{start + i}') for i in range(count)
+        )
+        roles = Role.objects.filter(nombre__in=Role.RoleType.values)
+        RolePermission.objects.bulk_create(
+            RolePermission(role=role, permission=permission) for role in roles for permission in permissions
+        )
+        for role in roles:
+            for i in range(count):
+                SystemUser.objects.create_user(f'{role.nombre}_{start + i}', role=role)
+
+    def assertConstantQueries(self, url):
+        self.create_rows(0, 2)
+        self.assertViewQueryBudget(url, self.BUDGET)
+        self.create_rows(2, 10)
+        response = self.assertViewQueryBudget(url, self.BUDGET)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_role_changelist(self):
+        for nombre in Role.RoleType.values:
+            Role.objects.get_or_create(nombre=nombre)
+        response = self.assertConstantQueries('/admin/users/role/')
+        self.assertEqual(len(response.context['cl'].result_list), len(Role.RoleType.values))
+
+    def test_permission_changelist(self):
+        response = self.assertConstantQueries('/admin/users/permission/')
+        self.assertEqual(response.context['cl'].result_count, 12)
+
+
+class ReassignRoleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_role = Role.objects.create(nombre=Role.RoleType.ADMINISTRADOR)
+        cls.cajero_role = Role.objects.create(nombre=Role.RoleType.CAJERO)
+        cls.admin = SystemUser.objects.create_user('admin', role=cls.admin_role)
+        cls.cajeros = [SystemUser.objects.create_user(f'cajero{i}', role=cls.cajero_role) for i in range(3)]
+
+    def test_promotes_with_one_update_and_audits_each_change(self):
+        users = SystemUser.objects.filter(username__startswith='cajero')
+        # Savepoint, conteo sin cambios, lectura e INSERT de la bitácora, UPDATE y release:
+        # la cantidad no depende de cuántos usuarios cambian
+        with self.assertNumQueries(6):
+            result = reassign_role(users, self.admin_role, actor=self.admin)
+
+        self.assertEqual((result.changed, result.unchanged), (3, 0))
+        self.assertEqual(SystemUser.objects.filter(role=self.admin_role, is_staff=True, is_superuser=True).count(), 4)
+        self.assertEqual(AuditEvent.objects.filter(tipo=AuditEvent.EventType.CAMBIO_ROL).count(), 3)
+
+    def test_users_that_already_have_the_role_are_not_touched(self):
+        users = SystemUser.objects.filter(username__startswith='cajero')
+        result = reassign_role(users, self.cajero_role, actor=self.admin)
+
+        self.assertEqual((result.changed, result.unchanged), (0, 3))
+        self.assertFalse(AuditEvent.objects.exists())
+
+    def test_cannot_remove_the_last_administrator(self):
+        with self.assertRaises(RoleChangeRejected):
+            reassign_role(SystemUser.objects.filter(pk=self.admin.pk), self.cajero_role)
+        self.admin.refresh_from_db()
+        self.assertEqual(self.admin.role_id, self.admin_role.pk)
+
+    def test_actor_cannot_demote_themselves(self):
+        SystemUser.objects.create_user('otro_admin', role=self.admin_role)
+        with self.assertRaises(RoleChangeRejected):
+            reassign_role(SystemUser.objects.filter(pk=self.admin.pk), self.cajero_role, actor=self.admin)
+
+    def test_demotes_an_administrator_when_another_remains(self):
+        otro = SystemUser.objects.create_user('otro_admin', role=self.admin_role)
+        result = reassign_role(SystemUser.objects.filter(pk=otro.pk), self.cajero_role, actor=self.admin)
+
+        self.assertEqual(result.changed, 1)
+        otro.refresh_from_db()
+        self.assertEqual((otro.role_id, otro.is_staff, otro.is_superuser), (self.cajero_role.pk, False, False))
+
+
+class RolePermissionCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(nombre=Role.RoleType.CAJERO)
+        cls.permission = Permission.objects.create(nombre='ver_cuentas')
+        cls.user = SystemUser.objects.create_user('cajero', role=cls.role)
+
+    def fresh_user(self):
+        # Como lo carga get_user en cada solicitud: con el rol en la misma consulta
+        return SystemUser.objects.select_related('role').get(pk=self.user.pk)
+
+    def test_grant_and_revoke_are_visible_immediately(self):
+        self.assertFalse(self.fresh_user().has_permission('ver_cuentas'))
+        grant_permissions([self.role], [self.permission])
+        self.assertTrue(self.fresh_user().has_permission('ver_cuentas'))
+        revoke_permissions([self.role], [self.permission])
+        self.assertFalse(self.fresh_user().has_permission('ver_cuentas'))
+
+    def test_cached_check_runs_no_queries(self):
+        RolePermission.objects.create(role=self.role, permission=self.permission)
+        user = self.fresh_user()
+        user.has_permission('ver_cuentas')
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_permission('ver_cuentas'))
+            self.assertFalse(user.has_permission('otro'))